@@ -0,0 +1,61 @@
+import threading
+
+class AutoSaver:
+    # Writes data snapshots on a background thread. Only the newest pending snapshot is kept, so
+    # a burst of edits costs one write; each write rotates the previous versions first.
+    def __init__(self, snapshots=3):
+        self.snapshots = snapshots
+        self.condition = threading.Condition()
+        self.pending = None
+        self.writing = False
+        self.closed = False
+        self.thread = None
+        self.saved_count = 0
+        self.last_error = None
+
+    def submit(self, file_path, data):
+        # data must already be plain JSON data that the caller will not mutate
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("AutoSaver is closed")
+            self.pending = (file_path, data)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        # Waits until everything submitted so far is on disk; returns False on timeout
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout)
+
+    def close(self, timeout=None):
+        self.flush(timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _run(self):
+        # storage (and json with it) is imported by the first write, not when the window starts
+        import storage
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or self.closed)
+                if self.pending is None:
+                    return
+                (file_path, data), self.pending = self.pending, None
+                self.writing = True
+            try:
+                storage.rotate_snapshots(file_path, self.snapshots)
+                storage.save_file(file_path, data)
+                error = None
+            except OSError as e:
+                error = e
+            with self.condition:
+                self.writing = False
+                self.last_error = error
+                if error is None:
+                    self.saved_count += 1
+                self.condition.notify_all()
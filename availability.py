@@ -0,0 +1,224 @@
+from collections.abc import Mapping
+from functools import lru_cache
+
+# Slot table shared by the engine, the GUI grids and serialization. Slot i starts
+# at 08:00 + 30 * i minutes and is bit i of a day mask; 21:30 is the last slot.
+FIRST_SLOT_MINUTES = 8 * 60
+SLOT_MINUTES = 30
+SLOT_COUNT = 28
+SLOTS_PER_HOUR = 60 // SLOT_MINUTES
+# A class needs its start slot and the slot one hour later
+CLASS_SLOTS = SLOTS_PER_HOUR
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+SLOT_TIMES = [format_minutes(FIRST_SLOT_MINUTES + i * SLOT_MINUTES) for i in range(SLOT_COUNT)]
+SLOT_INDEX = {t: i for i, t in enumerate(SLOT_TIMES)}
+SLOT_BITS = {t: 1 << i for i, t in enumerate(SLOT_TIMES)}
+# End time shown for a class starting at each slot, which can run past the grid
+END_TIMES = {t: format_minutes(FIRST_SLOT_MINUTES + (i + CLASS_SLOTS) * SLOT_MINUTES) for i, t in enumerate(SLOT_TIMES)}
+CLASS_WINDOWS = [(1 << i) | (1 << (i + CLASS_SLOTS)) if i + CLASS_SLOTS < SLOT_COUNT else 0 for i in range(SLOT_COUNT)]
+# Students pick their availability from 12:00 onwards
+STUDENT_SLOT_TIMES = SLOT_TIMES[SLOT_INDEX["12:00"]:]
+DAY_MASK = (1 << SLOT_COUNT) - 1
+
+def slot_index(time_str):
+    try:
+        return SLOT_INDEX[time_str]
+    except KeyError:
+        raise ValueError(f"Unknown time slot: {time_str!r}") from None
+
+def time_bit(time_str):
+    return 1 << slot_index(time_str)
+
+@lru_cache(maxsize=None)
+def class_start_slots(mask):
+    # Slots whose whole class window is inside the mask
+    starts = mask & (mask >> CLASS_SLOTS)
+    return tuple(i for i in range(SLOT_COUNT) if starts >> i & 1)
+
+def times_to_mask(times):
+    mask = 0
+    for t in times:
+        mask |= time_bit(t)
+    return mask
+
+def mask_to_times(mask):
+    return [t for i, t in enumerate(SLOT_TIMES) if mask >> i & 1]
+
+def class_window(time_str):
+    return CLASS_WINDOWS[slot_index(time_str)]
+
+def to_mask(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, DayAvailability):
+        return value.mask
+    return times_to_mask(value)
+
+class DayAvailability:
+    __slots__ = ('availability', 'day')
+
+    def __init__(self, availability, day):
+        self.availability = availability
+        self.day = day
+
+    @property
+    def mask(self):
+        return self.availability.mask(self.day)
+
+    def _set(self, mask):
+        self.availability.set_mask(self.day, mask)
+
+    def add(self, time_str):
+        self._set(self.mask | time_bit(time_str))
+
+    def remove(self, time_str):
+        bit = time_bit(time_str)
+        if not self.mask & bit:
+            raise KeyError(time_str)
+        self._set(self.mask & ~bit)
+
+    def discard(self, time_str):
+        self._set(self.mask & ~SLOT_BITS.get(time_str, 0))
+
+    def update(self, times):
+        self._set(self.mask | to_mask(times))
+
+    def clear(self):
+        self._set(0)
+
+    def copy(self):
+        return set(self)
+
+    def __contains__(self, time_str):
+        return bool(self.mask & SLOT_BITS.get(time_str, 0))
+
+    def __iter__(self):
+        return iter(mask_to_times(self.mask))
+
+    def __len__(self):
+        return bin(self.mask).count('1')
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __eq__(self, other):
+        if isinstance(other, DayAvailability):
+            return self.mask == other.mask
+        if isinstance(other, (set, frozenset, list, tuple)):
+            return set(self) == set(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DayAvailability({set(self)!r})"
+
+class DayLayout:
+    # Which days an Availability holds and where each one's mask sits in the packed int.
+    # One layout is shared by every Availability with the same days.
+    __slots__ = ('days', 'offsets')
+
+    def __init__(self, days):
+        self.days = days
+        self.offsets = {day: i * SLOT_COUNT for i, day in enumerate(days)}
+
+    def with_day(self, day):
+        return day_layout(self.days + (day,))
+
+@lru_cache(maxsize=None)
+def day_layout(days):
+    return DayLayout(days)
+
+EMPTY_LAYOUT = day_layout(())
+
+class Availability:
+    # All day masks packed into one int, SLOT_COUNT bits per day in layout order
+    __slots__ = ('layout', 'bits')
+
+    def __init__(self, data=None):
+        self.layout = EMPTY_LAYOUT
+        self.bits = 0
+        if data:
+            self.layout = day_layout(tuple(data))
+            for day, value in data.items():
+                self.bits |= (to_mask(value) & DAY_MASK) << self.layout.offsets[day]
+
+    def mask(self, day):
+        offset = self.layout.offsets.get(day)
+        return 0 if offset is None else self.bits >> offset & DAY_MASK
+
+    def set_mask(self, day, mask):
+        if day not in self.layout.offsets:
+            self.layout = self.layout.with_day(day)
+        offset = self.layout.offsets[day]
+        self.bits = self.bits & ~(DAY_MASK << offset) | (mask & DAY_MASK) << offset
+
+    def day_masks(self):
+        bits = self.bits
+        return [(day, bits >> offset & DAY_MASK) for day, offset in self.layout.offsets.items()]
+
+    @property
+    def masks(self):
+        return dict(self.day_masks())
+
+    def has_window(self, day, window):
+        return window != 0 and self.mask(day) & window == window
+
+    def to_data(self):
+        return self.masks
+
+    def copy(self):
+        availability = Availability()
+        availability.layout = self.layout
+        availability.bits = self.bits
+        return availability
+
+    def __getitem__(self, day):
+        return DayAvailability(self, day)
+
+    def __setitem__(self, day, value):
+        self.set_mask(day, to_mask(value))
+
+    def __contains__(self, day):
+        return day in self.layout.offsets
+
+    def __iter__(self):
+        return iter(self.layout.days)
+
+    def __len__(self):
+        return len(self.layout.days)
+
+    def keys(self):
+        return self.layout.offsets.keys()
+
+    def values(self):
+        return [self[day] for day in self.layout.days]
+
+    def items(self):
+        return [(day, self[day]) for day in self.layout.days]
+
+    def get(self, day, default=None):
+        return self[day] if day in self.layout.offsets else default
+
+    def __eq__(self, other):
+        if isinstance(other, Availability):
+            return self.masks == other.masks
+        if isinstance(other, Mapping):
+            return self.keys() == other.keys() and all(self[day] == other[day] for day in self.layout.days)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (Availability, (self.masks,))
+
+    def __repr__(self):
+        return f"Availability({ {day: set(self[day]) for day in self.layout.days}!r})"
+
+def as_availability(value):
+    if isinstance(value, Availability):
+        return value
+    return Availability(value)
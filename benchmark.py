@@ -0,0 +1,224 @@
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from database import SQLiteStore
+from engine import ENGINES, create_engine
+from profiling import format_rows
+from storage import build_data, load_file, save_file, schedule_to_data
+from synthetic import generate_roster
+
+DEFAULT_SIZES = (50, 500, 5000, 50000)
+# The exact and local engines run until their time limit, so timing them says little
+DEFAULT_ENGINES = ('greedy', 'vectorized')
+BASELINE_VERSION = 1
+
+def measure(func, repeat):
+    # Best and mean wall time over repeat runs, then one more run under tracemalloc for the
+    # peak of Python allocations (tracing slows the run down, so it is not timed)
+    times = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), sum(times) / len(times), peak, result
+
+def record(task, size, best, mean, peak, **extra):
+    entry = {
+        'task': task,
+        'size': size,
+        'seconds': best,
+        'mean_seconds': mean,
+        'students_per_second': size / best if size and best > 0 else None,
+        'peak_kb': peak // 1024 if peak is not None else None,
+    }
+    entry.update(extra)
+    return entry
+
+def engine_available(name):
+    try:
+        create_engine({}, [], name=name)
+    except (RuntimeError, ImportError):
+        return False
+    return True
+
+def benchmark_size(size, engines, repeat, seed, gui, work_dir):
+    teacher_availability, students, _ = generate_roster(size, seed)
+    results = []
+    schedule = None
+    for name in engines:
+        def run_engine():
+            return create_engine(teacher_availability, students, name=name).create_optimal_schedule()
+        best, mean, peak, schedule = measure(run_engine, repeat)
+        results.append(record(f"schedule:{name}", size, best, mean, peak,
+                              classes=sum(len(classes) for classes in schedule.values()),
+                              placed=sum(len(c['students']) for classes in schedule.values() for c in classes)))
+    if schedule is None:
+        schedule = create_engine(teacher_availability, students).create_optimal_schedule()
+
+    engine = create_engine(teacher_availability, students)
+    results.append(record('diagnostics', size, *measure(lambda: engine.get_scheduling_report(schedule), repeat)[:3]))
+
+    json_path = os.path.join(work_dir, f"roster-{size}.json")
+    data_schedule = schedule_to_data(schedule)
+    results.append(record('save:json', size, *measure(
+        lambda: save_file(json_path, build_data(teacher_availability, students, data_schedule)), repeat)[:3]))
+    results.append(record('load:json', size, *measure(lambda: load_file(json_path), repeat)[:3]))
+
+    db_path = os.path.join(work_dir, f"roster-{size}.db")
+    store = SQLiteStore(db_path)
+    try:
+        results.append(record('save:sqlite', size, *measure(
+            lambda: store.save_all(teacher_availability, students, schedule), repeat)[:3]))
+        def load_database():
+            loaded = store.load_students()
+            return store.load_schedule(loaded)
+        results.append(record('load:sqlite', size, *measure(load_database, repeat)[:3]))
+    finally:
+        store.close()
+
+    if gui is not None:
+        results.append(record('gui:populate', size, *measure(lambda: gui(teacher_availability, students, schedule),
+                                                             repeat)[:3]))
+    return results
+
+def measure_startup(repeat):
+    # Wall time of a fresh process opening the main window, interpreter and imports included;
+    # memory is not tracked across the process boundary
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scheduling.py"),
+               '--startup-time']
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return record('gui:startup', 0, min(times), sum(times) / len(times), None)
+
+def gui_populator():
+    # Fills a main window the way loading a file does; None when PyQt6 is not installed
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        return None
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from scheduling import AcademySchedulerGUI
+    from roster import Roster
+    app = QApplication.instance() or QApplication([])
+    window = AcademySchedulerGUI()
+
+    def populate(teacher_availability, students, schedule):
+        window.teacher_availability = teacher_availability
+        window.students = Roster(students)
+        window.schedule = schedule
+        window.update_gui_from_data()
+        window.display_schedule(schedule)
+        app.processEvents()
+
+    populate.window = window
+    return populate
+
+def run(sizes=DEFAULT_SIZES, engines=DEFAULT_ENGINES, repeat=3, seed=0, gui=True, progress=None):
+    engines = [name for name in engines if engine_available(name)]
+    populate = gui_populator() if gui else None
+    work_dir = tempfile.mkdtemp(prefix="academy-bench-")
+    results = []
+    try:
+        if populate is not None:
+            results.append(measure_startup(repeat))
+            if progress is not None:
+                progress(results[-1:])
+        for size in sizes:
+            size_results = benchmark_size(size, engines, repeat, seed, populate, work_dir)
+            results.extend(size_results)
+            if progress is not None:
+                progress(size_results)
+    finally:
+        shutil.rmtree(work_dir)
+        if populate is not None:
+            populate.window.close()
+    return {
+        'version': BASELINE_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+def compare(baseline, current):
+    # (task, size, baseline seconds, current seconds, current / baseline) for entries in both
+    before = {(r['task'], r['size']): r for r in baseline['results']}
+    rows = []
+    for r in current['results']:
+        old = before.get((r['task'], r['size']))
+        if old is not None:
+            ratio = r['seconds'] / old['seconds'] if old['seconds'] > 0 else None
+            rows.append((r['task'], r['size'], old['seconds'], r['seconds'], ratio))
+    return rows
+
+def format_results(results):
+    header = ('Task', 'Students', 'Seconds', 'Students/s', 'Peak KB')
+    rows = [(r['task'], str(r['size']), f"{r['seconds']:.4f}",
+             f"{r['students_per_second']:.0f}" if r['students_per_second'] else '-',
+             str(r['peak_kb']) if r['peak_kb'] is not None else '-')
+            for r in results]
+    return format_table(header, rows)
+
+def format_comparison(rows):
+    header = ('Task', 'Students', 'Baseline s', 'Current s', 'Ratio')
+    return format_table(header, [(task, str(size), f"{old:.4f}", f"{new:.4f}", f"{ratio:.2f}x" if ratio else '-')
+                                 for task, size, old, new, ratio in rows])
+
+def format_table(header, rows):
+    return '\n'.join(format_rows(header, rows))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Time scheduling, diagnostics, saving, loading, GUI startup and population "
+                                                 "on synthetic rosters and record a JSON baseline.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="roster sizes to run")
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=list(DEFAULT_ENGINES),
+                        help="engines to time (ones whose dependencies are missing are skipped)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per measurement; the best is kept")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the synthetic rosters")
+    parser.add_argument('--no-gui', action='store_true', help="skip the GUI startup and population benchmarks")
+    parser.add_argument('-o', '--output', default='benchmark.json', help="JSON file to write the results to")
+    parser.add_argument('--compare', metavar='BASELINE', help="earlier results to compare against")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    current = run(args.sizes, args.engines, max(1, args.repeat), args.seed, not args.no_gui,
+                  progress=lambda results: print(format_results(results), end='\n\n', flush=True))
+    save_file(args.output, current)
+    print(f"results written to {args.output}")
+    if baseline is not None:
+        print()
+        print(format_comparison(compare(baseline, current)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
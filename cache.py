@@ -0,0 +1,137 @@
+import os
+import hashlib
+from availability import as_availability, day_layout
+from engine import MAX_CLASS_SIZE, MIN_CLASS_SIZE
+from profiling import is_disabled, profiler
+
+# Set to a directory to keep generated schedules there, or to 0 or another false-like value
+# (see profiling.DISABLED_VALUES) to turn the cache off
+CACHE_ENV = 'ACADEMY_CACHE'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Bump when an engine changes what it produces for the same input, so older entries stop matching
+CACHE_VERSION = 1
+
+def packed_bits(availability, layout):
+    # The availability packed in the key's day order, which it almost always is already
+    if availability.layout is layout:
+        return availability.bits
+    bits = 0
+    for day, offset in layout.offsets.items():
+        bits |= availability.mask(day) << offset
+    return bits
+
+def schedule_key(teacher_availability, students, days, engine_name, options=None, teachers=()):
+    # Hash of everything a schedule depends on. Student order is kept, since engines break ties
+    # by roster order; reprs of tuples of str/int/bool are canonical, so equal inputs always hash
+    # the same and any edit (a renamed student, a single availability bit) changes the key
+    layout = day_layout(tuple(days))
+    header = (CACHE_VERSION, engine_name, sorted((options or {}).items()), layout.days, MIN_CLASS_SIZE,
+              MAX_CLASS_SIZE, packed_bits(as_availability(teacher_availability), layout))
+    teacher_rows = [(teacher.name, packed_bits(teacher.availability, layout),
+                     sorted(teacher.levels) if teacher.levels is not None else None) for teacher in teachers]
+    student_rows = [(student.name, student.level, bool(student.twice_weekly), packed_bits(student.availability, layout))
+                    for student in students]
+    digest = hashlib.sha256()
+    for part in (header, teacher_rows, student_rows):
+        digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+def default_cache_dir():
+    setting = os.environ.get(CACHE_ENV)
+    if is_disabled(setting):
+        return None
+    if setting:
+        return setting
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'academy-scheduler', 'schedules')
+
+def default_cache():
+    directory = default_cache_dir()
+    return ScheduleCache(directory) if directory else None
+
+class ScheduleCache:
+    # Generated schedules on disk, one JSON file per input key, in the same name-based form as
+    # saved files. Reads touch the file, so modification times order entries by last use and
+    # the least recently used ones are removed once the directory grows past max_bytes. The
+    # cache is best effort: I/O errors and damaged entries read as misses.
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        import json
+        path = self.path(key)
+        with profiler.span('cache.get'):
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError):
+                self.discard(key)
+                return None
+        if not isinstance(entry, dict) or entry.get('key') != key:
+            return None
+        return entry['schedule']
+
+    def put(self, key, schedule_data, engine_name=None):
+        from storage import write_file
+        with profiler.span('cache.put'):
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                write_file(self.path(key), {'key': key, 'engine': engine_name, 'schedule': schedule_data})
+                self.evict()
+            except OSError:
+                return False
+        return True
+
+    def discard(self, key):
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def entries(self):
+        # (last used, size, path) for every stored schedule, oldest first
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # evicted by another writer meanwhile
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,180 @@
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from cache import ScheduleCache, default_cache_dir, schedule_key
+from engine import DAYS, ENGINES, create_engine
+from profiling import format_rows, profiler
+from storage import load_file, save_file, build_data, schedule_from_data, schedule_to_data
+
+# Files this tool writes next to its inputs, which must not be picked up as inputs in turn
+OUTPUT_SUFFIXES = ('.scheduled.json', '.report.json')
+
+def is_output_path(file_path):
+    return file_path.endswith(OUTPUT_SUFFIXES)
+
+def output_path_for(file_path, in_place=False):
+    if in_place:
+        return file_path
+    root, ext = os.path.splitext(file_path)
+    return f"{root}.scheduled{ext or '.json'}"
+
+def report_path_for(file_path):
+    root, _ = os.path.splitext(file_path)
+    return f"{root}.report.json"
+
+def schedule_file(file_path, in_place=False, engine_name='greedy', report=False, cache_dir=None, **options):
+    teacher_availability, students, _, teachers = load_file(file_path)
+    engine = create_engine(teacher_availability, students, name=engine_name, teachers=teachers, **options)
+    cache = ScheduleCache(cache_dir) if cache_dir else None
+    cached = None
+    if cache is not None:
+        key = schedule_key(teacher_availability, students, DAYS, engine_name, options, teachers)
+        cached = cache.get(key)
+    if cached is not None:
+        schedule = schedule_from_data(cached, students)
+    else:
+        with profiler.span('engine'):
+            schedule = engine.create_optimal_schedule()
+        if cache is not None:
+            cache.put(key, schedule_to_data(schedule), engine_name)
+    unscheduled = engine.get_unscheduled_students(schedule)
+
+    output_path = output_path_for(file_path, in_place)
+    save_file(output_path, build_data(teacher_availability, students, schedule_to_data(schedule), teachers))
+
+    result = {
+        'file': file_path,
+        'output': output_path,
+        'classes': sum(len(classes) for classes in schedule.values()),
+        'placed': sum(len(class_info['students']) for classes in schedule.values() for class_info in classes),
+        'students': len(students),
+        'unscheduled': sum(len(entries) for entries in unscheduled.values()),
+        'cached': cached is not None
+    }
+    if hasattr(engine, 'history'):
+        result['history'] = engine.history
+    if report:
+        result['report'] = report_path_for(file_path)
+        save_file(result['report'], {'students': engine.get_scheduling_report(schedule)})
+    return result
+
+def collect_files(paths):
+    # Directories and glob patterns expand to the saved files they match, skipping the
+    # outputs of earlier runs; files named explicitly are always kept
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            path = os.path.join(path, '*.json')
+        if glob.has_magic(path):
+            matches = [f for f in sorted(glob.glob(path)) if not is_output_path(f)]
+        else:
+            matches = [path]
+        files.extend(f for f in matches if f not in files)
+    return files
+
+def run_file(file_path, in_place=False, engine_name='greedy', report=False, options=None, cache_dir=None):
+    # Runs in a worker process, so failures come back as part of the result; any error is
+    # reported for its own file rather than stopping the batch
+    start = time.perf_counter()
+    try:
+        result = schedule_file(file_path, in_place, engine_name, report, cache_dir, **(options or {}))
+    except Exception as e:
+        result = {'file': file_path, 'error': str(e)}
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def schedule_files(files, in_place=False, engine_name='greedy', jobs=None, report=False, cache_dir=None, **options):
+    if jobs == 1 or len(files) <= 1:
+        return [run_file(f, in_place, engine_name, report, options, cache_dir) for f in files]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_file, f, in_place, engine_name, report, options, cache_dir) for f in files]
+        return [future.result() for future in futures]
+
+def format_summary(results):
+    header = ('File', 'Classes', 'Placed', 'Unscheduled', 'Students', 'Seconds')
+    rows = []
+    for r in results:
+        if 'error' in r:
+            rows.append((r['file'], '-', '-', '-', '-', f"{r['seconds']:.2f}"))
+        else:
+            rows.append((r['file'], str(r['classes']), str(r['placed']), str(r['unscheduled']),
+                         str(r['students']), f"{r['seconds']:.2f}"))
+    done = [r for r in results if 'error' not in r]
+    rows.append((f"Total ({len(done)}/{len(results)} files)",
+                 str(sum(r['classes'] for r in done)),
+                 str(sum(r['placed'] for r in done)),
+                 str(sum(r['unscheduled'] for r in done)),
+                 str(sum(r['students'] for r in done)),
+                 f"{sum(r['seconds'] for r in results):.2f}"))
+
+    # The totals row gets the header's separator repeated above it
+    lines = format_rows(header, rows)
+    return '\n'.join(lines[:-1] + [lines[1], lines[-1]])
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate schedules for saved Academy Scheduler files without a display.")
+    parser.add_argument('files', nargs='+', help="saved JSON files, directories of them, or glob patterns")
+    parser.add_argument('--in-place', action='store_true', help="write the generated schedule back into each input file")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='greedy', help="scheduling engine to use")
+    parser.add_argument('--time-limit', type=float, default=10.0,
+                        help="seconds the exact and local engines may search per file")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the local engine")
+    parser.add_argument('--restarts', type=int, default=4, help="parallel restarts for the local engine")
+    parser.add_argument('--iterations', type=int, default=None,
+                        help="moves per restart for the local engine; with a cap, runs with the same seed give "
+                             "the same schedule as long as --time-limit is not reached first")
+    parser.add_argument('--report', action='store_true',
+                        help="also write a per-student scheduling report to <file>.report.json")
+    parser.add_argument('--cache', nargs='?', const=True, metavar='DIR',
+                        help="reuse schedules generated earlier for identical data, kept in DIR "
+                             "(default: the GUI's schedule cache)")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes to use (default: all cores)")
+    parser.add_argument('--profile', nargs='?', const=True, metavar='FILE',
+                        help="print a per-phase timing report; with FILE, also write cProfile data there. "
+                             "Files are then scheduled one at a time in this process")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = collect_files(args.files)
+    if not files:
+        print("no files to schedule", file=sys.stderr)
+        return 1
+    profiler.configure(args.profile)
+    if profiler.enabled:
+        # Spans and counters are only collected in this process
+        args.jobs = 1
+    options = {}
+    if args.engine in ('exact', 'local'):
+        options['time_limit'] = args.time_limit
+    if args.engine == 'local':
+        options.update(seed=args.seed, restarts=args.restarts)
+        if args.iterations is not None:
+            options['iterations'] = args.iterations
+        if len(files) > 1 and args.jobs != 1:
+            # The files already keep every core busy
+            options['jobs'] = 1
+
+    cache_dir = default_cache_dir() if args.cache is True else args.cache
+
+    with profiler.profile_thread():
+        results = schedule_files(files, args.in_place, args.engine, args.jobs, args.report, cache_dir, **options)
+    for result in results:
+        if 'error' in result:
+            print(f"{result['file']}: error: {result['error']}", file=sys.stderr)
+    print(format_summary(results))
+    reused = sum(1 for result in results if result.get('cached'))
+    if reused:
+        print(f"{reused} of {len(results)} schedules reused from the cache")
+    for result in results:
+        if result.get('history'):
+            progress = ', '.join(f"{value} at {elapsed:.2f}s" for elapsed, value in result['history'])
+            print(f"{result['file']}: placed {progress}")
+    profiler.dump()
+    return 1 if any('error' in result for result in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+from availability import SLOT_INDEX, SLOT_TIMES, Availability, as_availability
+from engine import DAYS, Student, Teacher
+from profiling import profiler
+
+DATABASE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+# teacher_slots row owner 0 is the academy-wide teacher_availability; named teachers use their id
+ACADEMY_TEACHER = 0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    level TEXT NOT NULL,
+    twice_weekly INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS students_level ON students (level);
+CREATE INDEX IF NOT EXISTS students_name ON students (name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS student_availability (
+    student_id INTEGER NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    mask INTEGER NOT NULL,
+    PRIMARY KEY (student_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS teachers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    levels TEXT
+);
+
+CREATE TABLE IF NOT EXISTS teacher_slots (
+    teacher_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    mask INTEGER NOT NULL,
+    PRIMARY KEY (teacher_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    teacher TEXT
+);
+CREATE INDEX IF NOT EXISTS classes_day ON classes (day, slot);
+
+CREATE TABLE IF NOT EXISTS class_students (
+    class_id INTEGER NOT NULL REFERENCES classes (id) ON DELETE CASCADE,
+    student_id INTEGER NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (class_id, student_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS class_students_student ON class_students (student_id);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def is_database_path(file_path):
+    return os.path.splitext(file_path)[1].lower() in DATABASE_EXTENSIONS
+
+class SQLiteStore:
+    # Students, availability masks, teacher slots and generated classes in one SQLite file.
+    # Every write method commits only the rows it touches.
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.connection = sqlite3.connect(file_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        # Row ids of the Student objects this store has loaded or written
+        self.student_ids = {}
+
+    def close(self):
+        self.connection.close()
+
+    def save_all(self, teacher_availability, students, schedule=None, teachers=()):
+        with profiler.span('database.save'), self.connection:
+            for table in ('class_students', 'classes', 'student_availability', 'students',
+                          'teacher_slots', 'teachers', 'settings'):
+                self.connection.execute(f"DELETE FROM {table}")
+            self.student_ids = {}
+            for student in students:
+                self._insert_student(student)
+            self._write_teacher_slots(ACADEMY_TEACHER, as_availability(teacher_availability))
+            for teacher in teachers:
+                cursor = self.connection.execute(
+                    "INSERT INTO teachers (name, levels) VALUES (?, ?)",
+                    (teacher.name, json.dumps(sorted(teacher.levels)) if teacher.levels is not None else None))
+                self._write_teacher_slots(cursor.lastrowid, teacher.availability)
+            if schedule is not None:
+                self._write_classes(schedule, schedule.keys())
+
+    def save_student(self, student):
+        with self.connection:
+            student_id = self.student_ids.get(student)
+            if student_id is None:
+                self._insert_student(student)
+                return
+            self.connection.execute("UPDATE students SET name = ?, level = ?, twice_weekly = ? WHERE id = ?",
+                                    (student.name, student.level, int(student.twice_weekly), student_id))
+            self.connection.execute("DELETE FROM student_availability WHERE student_id = ?", (student_id,))
+            self._write_student_availability(student_id, student)
+
+    def delete_student(self, student):
+        student_id = self.student_ids.pop(student, None)
+        if student_id is not None:
+            with self.connection:
+                self.connection.execute("DELETE FROM students WHERE id = ?", (student_id,))
+
+    def save_teacher_day(self, day, mask):
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO teacher_slots (teacher_id, day, mask) VALUES (?, ?, ?)",
+                                    (ACADEMY_TEACHER, day, mask))
+
+    def save_schedule(self, schedule, days=None):
+        # Replaces the classes of the given days (all of them by default); None clears the schedule
+        with self.connection:
+            if schedule is None:
+                self.connection.execute("DELETE FROM classes")
+                self.connection.execute("DELETE FROM settings WHERE key = 'schedule'")
+                return
+            self._write_classes(schedule, schedule.keys() if days is None else days)
+
+    def _insert_student(self, student):
+        cursor = self.connection.execute("INSERT INTO students (name, level, twice_weekly) VALUES (?, ?, ?)",
+                                         (student.name, student.level, int(student.twice_weekly)))
+        self.student_ids[student] = cursor.lastrowid
+        self._write_student_availability(cursor.lastrowid, student)
+
+    def _write_student_availability(self, student_id, student):
+        self.connection.executemany(
+            "INSERT INTO student_availability (student_id, day, mask) VALUES (?, ?, ?)",
+            [(student_id, day, mask) for day, mask in student.availability.day_masks()])
+
+    def _write_teacher_slots(self, teacher_id, availability):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO teacher_slots (teacher_id, day, mask) VALUES (?, ?, ?)",
+            [(teacher_id, day, mask) for day, mask in availability.day_masks()])
+
+    def _write_classes(self, schedule, days):
+        for day in days:
+            self.connection.execute("DELETE FROM classes WHERE day = ?", (day,))
+            for class_info in schedule.get(day, []):
+                cursor = self.connection.execute(
+                    "INSERT INTO classes (day, slot, level, teacher) VALUES (?, ?, ?, ?)",
+                    (day, SLOT_INDEX[class_info['time']], class_info['level'], class_info.get('teacher')))
+                # Students that were never written to this store have no row to refer to
+                self.connection.executemany(
+                    "INSERT INTO class_students (class_id, student_id, position) VALUES (?, ?, ?)",
+                    [(cursor.lastrowid, self.student_ids[s], position)
+                     for position, s in enumerate(class_info['students']) if s in self.student_ids])
+        self.connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('schedule', '1')")
+
+    def load_teachers(self, days=DAYS):
+        masks = dict(self.connection.execute("SELECT day, mask FROM teacher_slots WHERE teacher_id = ?",
+                                             (ACADEMY_TEACHER,)))
+        teacher_availability = Availability({day: masks.get(day, 0) for day in days})
+        teachers = []
+        for teacher_id, name, levels in self.connection.execute("SELECT id, name, levels FROM teachers ORDER BY id"):
+            availability = dict(self.connection.execute(
+                "SELECT day, mask FROM teacher_slots WHERE teacher_id = ?", (teacher_id,)))
+            teachers.append(Teacher(name, Availability(availability), json.loads(levels) if levels else None))
+        return teacher_availability, teachers
+
+    def count_students(self):
+        return self.connection.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def iter_student_pages(self, page_size=500):
+        # Keyset pagination in roster (insertion) order, so each page is one index range scan.
+        # Paging stops at the last row present when it started: students saved while pages are
+        # still being read are already in memory and must not come back in a later page.
+        last_id = 0
+        max_id = self.connection.execute("SELECT MAX(id) FROM students").fetchone()[0] or 0
+        while True:
+            rows = self.connection.execute(
+                "SELECT id, name, level, twice_weekly FROM students WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+                (last_id, max_id, page_size)).fetchall()
+            if not rows:
+                return
+            masks = {}
+            for student_id, day, mask in self.connection.execute(
+                    "SELECT student_id, day, mask FROM student_availability WHERE student_id BETWEEN ? AND ?",
+                    (rows[0][0], rows[-1][0])):
+                masks.setdefault(student_id, {})[day] = mask
+            page = []
+            for student_id, name, level, twice_weekly in rows:
+                student = Student(name, level, Availability(masks.get(student_id, {})), bool(twice_weekly))
+                self.student_ids[student] = student_id
+                page.append(student)
+            yield page
+            last_id = rows[-1][0]
+
+    def load_students(self):
+        with profiler.span('database.load'):
+            return [student for page in self.iter_student_pages() for student in page]
+
+    def load_schedule(self, students, days=DAYS):
+        # The saved schedule as the engine's model, or None if no schedule was saved
+        if self.connection.execute("SELECT 1 FROM settings WHERE key = 'schedule'").fetchone() is None:
+            return None
+        by_id = {self.student_ids[s]: s for s in students if s in self.student_ids}
+        for student in students:
+            student.scheduled_days = 0
+        schedule = {day: [] for day in days}
+        classes = {}
+        rows = self.connection.execute(
+            "SELECT c.id, c.day, c.slot, c.level, c.teacher, cs.student_id FROM classes c "
+            "LEFT JOIN class_students cs ON cs.class_id = c.id ORDER BY c.day, c.slot, c.id, cs.position")
+        for class_id, day, slot, level, teacher, student_id in rows:
+            if day not in schedule:
+                continue
+            class_info = classes.get(class_id)
+            if class_info is None:
+                class_info = classes[class_id] = {'time': SLOT_TIMES[slot], 'level': level, 'students': []}
+                if teacher is not None:
+                    class_info['teacher'] = teacher
+                schedule[day].append(class_info)
+            student = by_id.get(student_id)
+            if student is not None:
+                class_info['students'].append(student)
+                student.scheduled_days += 1
+        return schedule
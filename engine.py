@@ -0,0 +1,369 @@
+import sys
+import importlib
+from datetime import datetime, timedelta
+from collections import defaultdict
+from availability import (CLASS_WINDOWS, END_TIMES, SLOT_INDEX, SLOT_TIMES, as_availability, class_start_slots,
+                          time_bit)
+from profiling import profiler
+from roster import EligibilityIndex, NameIndex, Roster
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+LEVELS = ['Kids I', 'Kids II', 'Kids III', 'Pre-Teens I', 'Pre-Teens II', 'Pre-Teens III',
+          'Teens I', 'Teens II', 'Teens III', 'B1+', 'First']
+
+MIN_CLASS_SIZE = 3
+MAX_CLASS_SIZE = 7
+
+# Why a student is missing some or all of their sessions, by reason code
+SCHEDULING_REASONS = {
+    'no-availability': "No available time slots",
+    'class-full': "Class was full",
+    'no-matching-time': "No matching class times",
+    'insufficient-availability': "Insufficient availability for twice-weekly classes",
+    'second-class-full': "Second class was full",
+    'no-second-time': "No matching time for second class",
+}
+
+# Engines are imported on demand so optional dependencies are only needed when selected
+ENGINES = {
+    'greedy': ('engine', 'ScheduleEngine'),
+    'vectorized': ('vectorized', 'VectorizedScheduleEngine'),
+    'exact': ('exact', 'ExactScheduleEngine'),
+    'local': ('search', 'LocalSearchScheduleEngine'),
+}
+
+class Student:
+    # Slots and shared level strings keep large archives of students small; availability is
+    # one packed int per student (see Availability)
+    __slots__ = ('name', '_level', '_availability', 'twice_weekly', 'scheduled_days')
+
+    def __init__(self, name, level, availability, twice_weekly):
+        self.name = name
+        self.level = level
+        self.availability = availability
+        self.twice_weekly = twice_weekly
+        self.scheduled_days = 0
+
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, level):
+        self._level = sys.intern(level)
+
+    @property
+    def availability(self):
+        return self._availability
+
+    @availability.setter
+    def availability(self, availability):
+        self._availability = as_availability(availability)
+
+    @property
+    def max_sessions(self):
+        return 2 if self.twice_weekly else 1
+
+    def copy(self):
+        return Student(self.name, self.level, self.availability.copy(), self.twice_weekly)
+
+class Teacher:
+    # A teacher or room with its own availability; levels=None means any level
+    def __init__(self, name, availability, levels=None):
+        self.name = name
+        self.availability = as_availability(availability)
+        self.levels = set(levels) if levels else None
+
+    def teaches(self, level):
+        return self.levels is None or level in self.levels
+
+    def copy(self):
+        return Teacher(self.name, self.availability.copy(), self.levels)
+
+class ScheduleCancelled(Exception):
+    pass
+
+def add_hour_to_time(time_str):
+    if time_str in END_TIMES:
+        return END_TIMES[time_str]
+    t = datetime.strptime(time_str, "%H:%M")
+    t += timedelta(hours=1)
+    return t.strftime("%H:%M")
+
+def get_available_days(student):
+    return [day for day in student.availability if student.availability.mask(day)]
+
+class ScheduleEngine:
+    def __init__(self, teacher_availability, students, days=DAYS, teachers=None):
+        self.teacher_availability = as_availability(teacher_availability)
+        self.students = students
+        self.days = days
+        self.teachers = list(teachers) if teachers else []
+        self._eligibility = None
+        self._names = None
+        # Optional progress(done, total) callback and threading.Event that cancels the run
+        self.progress = None
+        self.cancel_event = None
+
+    @property
+    def eligibility(self):
+        # A Roster keeps its index up to date; plain lists get one built on first use
+        if self._eligibility is None:
+            if isinstance(self.students, Roster):
+                self._eligibility = self.students.eligibility
+            else:
+                self._eligibility = EligibilityIndex(self.students)
+        return self._eligibility
+
+    @property
+    def names(self):
+        # Shared with the GUI's Roster the same way as the eligibility index
+        if self._names is None:
+            if isinstance(self.students, Roster):
+                self._names = self.students.names
+            else:
+                self._names = NameIndex(self.students)
+        return self._names
+
+    def find_students(self, name):
+        return self.names.find(name)
+
+    def checkpoint(self, done, total):
+        # Engines call this between units of work; raises ScheduleCancelled once cancel_event is set
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ScheduleCancelled()
+        if self.progress is not None:
+            self.progress(done, total)
+
+    def create_optimal_schedule(self):
+        schedule = {day: [] for day in self.days}
+        with profiler.span('engine.group_students'):
+            students_by_level = self.group_students_by_level()
+
+        if self.teachers:
+            with profiler.span('engine.slots'):
+                slots = self.get_teacher_slots()
+                for i, (day, start_time, teachers) in enumerate(slots):
+                    self.checkpoint(i, len(slots))
+                    self.schedule_parallel_classes(schedule, day, start_time, teachers, students_by_level)
+                profiler.count('slots evaluated', len(slots))
+            return schedule
+
+        with profiler.span('engine.slots'):
+            slots = self.get_class_slots()
+            for i, (day, start_time, window) in enumerate(slots):
+                self.checkpoint(i, len(slots))
+                self.schedule_classes_for_time_slot(schedule, day, start_time, window, students_by_level)
+            profiler.count('slots evaluated', len(slots))
+
+        return schedule
+
+    def get_class_slots(self):
+        slots = []
+        for day in self.days:
+            for i in class_start_slots(self.teacher_availability.mask(day)):
+                slots.append((day, SLOT_TIMES[i], CLASS_WINDOWS[i]))
+        return slots
+
+    def get_teacher_slots(self):
+        # (day, start time, teachers free for the whole class window) in time order
+        slots = []
+        for day in self.days:
+            free = defaultdict(list)
+            for teacher in self.teachers:
+                for i in class_start_slots(teacher.availability.mask(day)):
+                    free[i].append(teacher)
+            for i in sorted(free):
+                slots.append((day, SLOT_TIMES[i], free[i]))
+        return slots
+
+    def group_students_by_level(self):
+        students_by_level = defaultdict(list)
+        for student in self.students:
+            students_by_level[student.level].append(student)
+            student.scheduled_days = 0
+        return students_by_level
+
+    def schedule_classes_for_time_slot(self, schedule, day, start_time, window, students_by_level):
+        slot = SLOT_INDEX[start_time]
+        for level in students_by_level:
+            available_students = [s for s in self.eligibility.students_for(level, day, slot)
+                                  if s.scheduled_days < s.max_sessions]
+            if profiler.enabled:
+                profiler.count('candidates scanned', len(available_students))
+
+            if MIN_CLASS_SIZE <= len(available_students) <= MAX_CLASS_SIZE:
+                self.add_class_to_schedule(schedule, day, start_time, level, available_students)
+                break  # Move to the next time slot
+            elif len(available_students) > MAX_CLASS_SIZE:
+                class_students = available_students[:MAX_CLASS_SIZE]
+                self.add_class_to_schedule(schedule, day, start_time, level, class_students)
+                break  # Move to the next time slot
+
+    def schedule_parallel_classes(self, schedule, day, start_time, teachers, students_by_level):
+        slot = SLOT_INDEX[start_time]
+        candidates = {}
+        for level in students_by_level:
+            available_students = [s for s in self.eligibility.students_for(level, day, slot)
+                                  if s.scheduled_days < s.max_sessions]
+            if profiler.enabled:
+                profiler.count('candidates scanned', len(available_students))
+            if len(available_students) >= MIN_CLASS_SIZE:
+                candidates[level] = available_students
+
+        assigned = self.match_levels_to_teachers(list(candidates), teachers)
+        for level in candidates:
+            if level in assigned:
+                self.add_class_to_schedule(schedule, day, start_time, level,
+                                           candidates[level][:MAX_CLASS_SIZE], assigned[level])
+
+    def match_levels_to_teachers(self, levels, teachers):
+        # Augmenting-path bipartite matching. A matched level stays matched as later levels are
+        # added, so earlier levels win ties and one teacher picks the same level as the single loop
+        teacher_of = {}
+        level_of = {}
+
+        def augment(level, visited):
+            for teacher in teachers:
+                if teacher in visited or not teacher.teaches(level):
+                    continue
+                visited.add(teacher)
+                if teacher not in level_of or augment(level_of[teacher], visited):
+                    teacher_of[level] = teacher
+                    level_of[teacher] = level
+                    return True
+            return False
+
+        for level in levels:
+            augment(level, set())
+        return teacher_of
+
+    def add_class_to_schedule(self, schedule, day, start_time, level, students, teacher=None):
+        profiler.count('classes placed')
+        class_info = {
+            'time': start_time,
+            'level': level,
+            'students': students
+        }
+        if teacher is not None:
+            class_info['teacher'] = teacher.name
+        schedule[day].append(class_info)
+        for student in students:
+            student.scheduled_days += 1
+
+    def get_available_students(self, students, day, start_time, end_time):
+        return self.get_students_for_window(students, day, time_bit(start_time) | time_bit(end_time))
+
+    def get_students_for_window(self, students, day, window):
+        return [s for s in students if
+                s.availability.mask(day) & window == window and
+                s.scheduled_days < s.max_sessions]
+
+    def get_unscheduled_students(self, schedule):
+        with profiler.span('engine.diagnostics'):
+            index = ScheduleIndex(schedule)
+            unscheduled = defaultdict(list)
+            for student in self.students:
+                reason = self.get_student_scheduling_status(student, schedule, index)
+                if reason:
+                    unscheduled[student.level].append((student, reason))
+        return unscheduled
+
+    def get_scheduling_report(self, schedule):
+        # One machine-readable record per student, in roster order
+        with profiler.span('engine.report'):
+            index = ScheduleIndex(schedule)
+            report = []
+            for student in self.students:
+                code = self.get_status_code(student, index)
+                if student.scheduled_days == 0:
+                    status = 'unscheduled'
+                elif code:
+                    status = 'partial'
+                else:
+                    status = 'scheduled'
+                report.append({
+                    'name': student.name,
+                    'level': student.level,
+                    'status': status,
+                    'sessions': student.scheduled_days,
+                    'required': student.max_sessions,
+                    'days': index.student_days.get(student, []),
+                    'reason': code,
+                    'message': SCHEDULING_REASONS.get(code)
+                })
+        return report
+
+    def get_student_scheduling_status(self, student, schedule, index=None):
+        code = self.get_status_code(student, index or ScheduleIndex(schedule))
+        return SCHEDULING_REASONS[code] if code else None
+
+    def get_status_code(self, student, index):
+        if student.scheduled_days == 0:
+            return self.get_unscheduled_code(student, index)
+        elif student.twice_weekly and student.scheduled_days < 2:
+            return self.get_partially_scheduled_code(student, index)
+        return None
+
+    def get_unscheduled_code(self, student, index):
+        if not student.availability.bits:
+            return 'no-availability'
+        if index.has_level_class(student, index.days):
+            return 'class-full'
+        return 'no-matching-time'
+
+    def get_partially_scheduled_code(self, student, index):
+        available_days = get_available_days(student)
+        if len(available_days) < 2:
+            return 'insufficient-availability'
+        scheduled_day = index.scheduled_day(student)
+        if index.has_level_class(student, [day for day in available_days if day != scheduled_day]):
+            return 'second-class-full'
+        return 'no-second-time'
+
+    def get_unscheduled_reason(self, student, schedule):
+        return SCHEDULING_REASONS[self.get_unscheduled_code(student, ScheduleIndex(schedule))]
+
+    def is_class_full(self, student, schedule):
+        index = ScheduleIndex(schedule)
+        return index.has_level_class(student, index.days)
+
+    def get_partially_scheduled_reason(self, student, schedule):
+        return SCHEDULING_REASONS[self.get_partially_scheduled_code(student, ScheduleIndex(schedule))]
+
+    def get_scheduled_day(self, student, schedule):
+        return ScheduleIndex(schedule).scheduled_day(student)
+
+    def is_second_class_full(self, student, schedule, remaining_days):
+        return ScheduleIndex(schedule).has_level_class(student, remaining_days)
+
+class ScheduleIndex:
+    # Lookup tables built in one pass over a schedule: the start bits of each level's classes per
+    # day and the days each student attends, so diagnosing a student never rescans the schedule
+    def __init__(self, schedule):
+        self.days = list(schedule)
+        self.level_masks = defaultdict(int)
+        self.student_days = {}
+        for day, classes in schedule.items():
+            for class_info in classes:
+                self.add_class(day, class_info)
+
+    def add_class(self, day, class_info):
+        self.level_masks[(class_info['level'], day)] |= time_bit(class_info['time'])
+        for student in class_info['students']:
+            self.student_days.setdefault(student, []).append(day)
+
+    def has_level_class(self, student, days):
+        # Whether a class of the student's level starts at a time the student is available
+        return any(self.level_masks.get((student.level, day), 0) & student.availability.mask(day) for day in days)
+
+    def scheduled_day(self, student):
+        days = self.student_days.get(student)
+        return days[0] if days else None
+
+def create_engine(teacher_availability, students, days=DAYS, name='greedy', **options):
+    if name not in ENGINES:
+        raise ValueError(f"Unknown scheduling engine: {name!r}")
+    module_name, class_name = ENGINES[name]
+    engine_class = getattr(importlib.import_module(module_name), class_name)
+    return engine_class(teacher_availability, students, days, **options)
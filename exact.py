@@ -0,0 +1,315 @@
+import time
+from collections import deque
+from engine import DAYS, MIN_CLASS_SIZE, MAX_CLASS_SIZE, ScheduleEngine
+from profiling import profiler
+
+try:
+    import numpy as np
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import coo_matrix
+except ImportError:  # scipy is optional, the branch-and-bound backend is pure Python
+    milp = None
+
+BACKENDS = ('auto', 'milp', 'branch-and-bound')
+
+class SearchTimeout(Exception):
+    pass
+
+# Search nodes between progress reports and cancellation checks
+PROGRESS_NODES = 256
+
+class FlowNetwork:
+    def __init__(self, size):
+        self.graph = [[] for _ in range(size)]
+        self.to = []
+        self.capacity = []
+        self.initial = []
+
+    def add_edge(self, u, v, capacity):
+        index = len(self.to)
+        self.to += [v, u]
+        self.capacity += [capacity, 0]
+        self.initial += [capacity, 0]
+        self.graph[u].append(index)
+        self.graph[v].append(index + 1)
+        return index
+
+    def flow(self, edge):
+        return self.initial[edge] - self.capacity[edge]
+
+    def max_flow(self, source, sink):
+        # Dinic's algorithm; the networks here are only a few edges deep
+        total = 0
+        while True:
+            depth = [-1] * len(self.graph)
+            depth[source] = 0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                for e in self.graph[u]:
+                    if self.capacity[e] > 0 and depth[self.to[e]] < 0:
+                        depth[self.to[e]] = depth[u] + 1
+                        queue.append(self.to[e])
+            if depth[sink] < 0:
+                return total
+            position = [0] * len(self.graph)
+            while True:
+                pushed = self._push(source, sink, float('inf'), depth, position)
+                if not pushed:
+                    break
+                total += pushed
+
+    def _push(self, u, sink, limit, depth, position):
+        if u == sink:
+            return limit
+        edges = self.graph[u]
+        while position[u] < len(edges):
+            e = edges[position[u]]
+            v = self.to[e]
+            if self.capacity[e] > 0 and depth[v] == depth[u] + 1:
+                pushed = self._push(v, sink, min(limit, self.capacity[e]), depth, position)
+                if pushed:
+                    self.capacity[e] -= pushed
+                    self.capacity[e ^ 1] += pushed
+                    return pushed
+            position[u] += 1
+        return 0
+
+class LevelProblem:
+    # The per-level seating model shared by the exact and local search engines; it holds only
+    # plain data, so it can be sent to worker processes
+    def __init__(self, level_students, slots):
+        # eligible[k][t] lists the students of level k (by position) who can attend slot t
+        self.eligible = [
+            [[i for i, s in enumerate(students) if s.availability.mask(day) & window == window]
+             for day, _, window in slots]
+            for students in level_students
+        ]
+        self.sessions = [[s.max_sessions for s in students] for students in level_students]
+        self.level_capacity = [sum(sessions) for sessions in self.sessions]
+        self.gain = [[min(MAX_CLASS_SIZE, len(eligible[t])) if len(eligible[t]) >= MIN_CLASS_SIZE else 0
+                      for t in range(len(slots))] for eligible in self.eligible]
+        self.candidates = [
+            sorted((k for k in range(len(level_students)) if self.gain[k][t]), key=lambda k: -self.gain[k][t])
+            for t in range(len(slots))
+        ]
+        self.flow_cache = {}
+
+    def upper_bound(self):
+        return min(sum(self.level_capacity), sum(max((self.gain[k][t] for k in levels), default=0)
+                                                 for t, levels in enumerate(self.candidates)))
+
+    def build_network(self, k, class_slots):
+        sessions = self.sessions[k]
+        n, m = len(sessions), len(class_slots)
+        # source, sink, students, classes, then the super source/sink used for the lower bounds
+        source, sink, super_source, super_sink = 0, 1, 2 + n + m, 3 + n + m
+        network = FlowNetwork(4 + n + m)
+        for i, max_sessions in enumerate(sessions):
+            network.add_edge(source, 2 + i, max_sessions)
+        assignment_edges = []
+        for c, t in enumerate(class_slots):
+            for i in self.eligible[k][t]:
+                assignment_edges.append((i, t, network.add_edge(2 + i, 2 + n + c, 1)))
+            network.add_edge(2 + n + c, sink, MAX_CLASS_SIZE - MIN_CLASS_SIZE)
+            network.add_edge(2 + n + c, super_sink, MIN_CLASS_SIZE)
+        network.add_edge(super_source, sink, MIN_CLASS_SIZE * m)
+        return network, (source, sink, super_source, super_sink), assignment_edges
+
+    def max_level_flow(self, k, class_slots):
+        # Max flow with every class between MIN_CLASS_SIZE and MAX_CLASS_SIZE, or None if infeasible
+        network, (source, sink, super_source, super_sink), assignment_edges = self.build_network(k, class_slots)
+        circulation = network.add_edge(sink, source, MAX_CLASS_SIZE * len(class_slots))
+        if network.max_flow(super_source, super_sink) < MIN_CLASS_SIZE * len(class_slots):
+            return None, network, assignment_edges
+        base = network.flow(circulation)
+        network.capacity[circulation] = network.capacity[circulation ^ 1] = 0
+        return base + network.max_flow(source, sink), network, assignment_edges
+
+    def solve_level(self, k, class_slots):
+        key = (k, tuple(sorted(class_slots)))
+        if key not in self.flow_cache:
+            self.flow_cache[key] = self.max_level_flow(k, key[1])[0] if class_slots else 0
+        return self.flow_cache[key]
+
+class ExactScheduleEngine(ScheduleEngine):
+    def __init__(self, teacher_availability, students, days=DAYS, time_limit=10.0, backend='auto', teachers=None):
+        if teachers:
+            raise ValueError("The exact engine schedules a single teacher")
+        super().__init__(teacher_availability, students, days)
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown exact solver backend: {backend!r}")
+        if backend == 'milp' and milp is None:
+            raise RuntimeError("The milp backend requires scipy")
+        self.time_limit = time_limit
+        self.backend = backend
+        self.optimal = False
+        self.placed_sessions = 0
+
+    def create_optimal_schedule(self):
+        # The time limit counts from here, so setup and the incumbent's flows come out of the same
+        # budget as the search; only building the returned schedule runs past it
+        deadline = time.monotonic() + self.time_limit
+        slots = self.get_class_slots()
+        # The greedy schedule is the first incumbent, so the result is never worse than greedy
+        greedy_schedule = ScheduleEngine(self.teacher_availability, self.students, self.days).create_optimal_schedule()
+        students_by_level = self.group_students_by_level()
+        self.prepare_problem(students_by_level, slots)
+
+        self.best_assignment = self.assignment_from_schedule(greedy_schedule, slots)
+        self.best_value = sum(self.problem.solve_level(k, class_slots)
+                              for k, class_slots in enumerate(self.best_assignment))
+
+        with profiler.span('engine.search'):
+            if self.backend == 'branch-and-bound' or (self.backend == 'auto' and milp is None):
+                self.optimal = self.branch_and_bound(deadline)
+            else:
+                self.optimal = self.solve_milp(deadline)
+
+        self.placed_sessions = self.best_value
+        return self.build_schedule(slots)
+
+    def prepare_problem(self, students_by_level, slots):
+        self.levels = list(students_by_level)
+        self.level_students = [students_by_level[level] for level in self.levels]
+        self.problem = LevelProblem(self.level_students, slots)
+
+    def assignment_from_schedule(self, schedule, slots):
+        # Class slots per level, as positions in slots
+        slot_index = {(day, start_time): t for t, (day, start_time, _) in enumerate(slots)}
+        level_index = {level: k for k, level in enumerate(self.levels)}
+        assignment = [[] for _ in self.levels]
+        for day, classes in schedule.items():
+            for class_info in classes:
+                assignment[level_index[class_info['level']]].append(slot_index[(day, class_info['time'])])
+        return assignment
+
+    def branch_and_bound(self, deadline):
+        problem = self.problem
+        slot_count = len(problem.candidates)
+        # Upper bounds on what the remaining slots can still add, overall and per level
+        future_best = [0] * (slot_count + 1)
+        future_level = [[0] * (slot_count + 1) for _ in self.levels]
+        for t in range(slot_count - 1, -1, -1):
+            future_best[t] = future_best[t + 1] + max((problem.gain[k][t] for k in problem.candidates[t]), default=0)
+            for k in range(len(self.levels)):
+                future_level[k][t] = future_level[k][t + 1] + problem.gain[k][t]
+
+        assignment = [[] for _ in self.levels]
+        values = [0] * len(self.levels)
+        nodes = 0
+        limit = self.time_limit * 1000
+
+        def search(t):
+            nonlocal nodes
+            now = time.monotonic()
+            if now > deadline:
+                raise SearchTimeout()
+            nodes += 1
+            if nodes % PROGRESS_NODES == 0:
+                # Progress is the share of the time limit used, as the tree size is unknown
+                self.checkpoint(int(limit - (deadline - now) * 1000), int(limit))
+            total = sum(values)
+            if total > self.best_value:
+                self.best_value = total
+                self.best_assignment = [list(slots) for slots in assignment]
+            if t == slot_count:
+                return
+            bound = min(total + future_best[t],
+                        sum(min(problem.level_capacity[k], values[k] + future_level[k][t]) for k in range(len(self.levels))))
+            if bound <= self.best_value:
+                return
+            for k in problem.candidates[t]:
+                assignment[k].append(t)
+                value = problem.solve_level(k, assignment[k])
+                if value is not None:
+                    previous, values[k] = values[k], value
+                    search(t + 1)
+                    values[k] = previous
+                assignment[k].pop()
+            search(t + 1)
+
+        try:
+            search(0)
+        except SearchTimeout:
+            return False
+        finally:
+            profiler.count('search nodes', nodes)
+        return True
+
+    def solve_milp(self, deadline):
+        # Variables: one y per (slot, level) class and one x per (student, class) seat
+        problem = self.problem
+        classes = [(t, k) for t, levels in enumerate(problem.candidates) for k in levels]
+        seats = [(c, k, i) for c, (t, k) in enumerate(classes) for i in problem.eligible[k][t]]
+        if not classes:
+            return True
+        n_classes = len(classes)
+        rows, cols, data, lower, upper = [], [], [], [], []
+
+        def add_row(entries, lo, hi):
+            row = len(lower)
+            for col, value in entries:
+                rows.append(row)
+                cols.append(col)
+                data.append(value)
+            lower.append(lo)
+            upper.append(hi)
+
+        by_slot = {}
+        for c, (t, k) in enumerate(classes):
+            by_slot.setdefault(t, []).append(c)
+        for cs in by_slot.values():
+            add_row([(c, 1) for c in cs], 0, 1)
+
+        by_class = {}
+        by_student = {}
+        for j, (c, k, i) in enumerate(seats):
+            by_class.setdefault(c, []).append(n_classes + j)
+            by_student.setdefault((k, i), []).append(n_classes + j)
+        for c in range(n_classes):
+            entries = [(col, 1) for col in by_class.get(c, [])]
+            add_row(entries + [(c, -MAX_CLASS_SIZE)], -float('inf'), 0)
+            add_row(entries + [(c, -MIN_CLASS_SIZE)], 0, float('inf'))
+        for (k, i), cols_ in by_student.items():
+            add_row([(col, 1) for col in cols_], 0, problem.sessions[k][i])
+
+        # The solver cannot be interrupted, so cancellation is only checked before it starts
+        self.checkpoint(0, 1)
+        size = n_classes + len(seats)
+        matrix = coo_matrix((data, (rows, cols)), shape=(len(lower), size)).tocsr()
+        objective = np.concatenate([np.zeros(n_classes), -np.ones(len(seats))])
+        result = milp(objective, integrality=np.ones(size), bounds=Bounds(0, 1),
+                      constraints=LinearConstraint(matrix, lower, upper),
+                      options={'time_limit': max(deadline - time.monotonic(), 0.1)})
+        if result.x is None:
+            return False
+
+        assignment = [[] for _ in self.levels]
+        for c, (t, k) in enumerate(classes):
+            if result.x[c] > 0.5:
+                assignment[k].append(t)
+        value = sum(problem.solve_level(k, assignment[k]) or 0 for k in range(len(self.levels)))
+        if value > self.best_value:
+            self.best_value = value
+            self.best_assignment = assignment
+        return result.status == 0
+
+    def build_schedule(self, slots):
+        schedule = {day: [] for day in self.days}
+        classes = []
+        for k, class_slots in enumerate(self.best_assignment):
+            if not class_slots:
+                continue
+            _, network, assignment_edges = self.problem.max_level_flow(k, sorted(class_slots))
+            members = {t: [] for t in class_slots}
+            for i, t, edge in assignment_edges:
+                if network.flow(edge):
+                    members[t].append(i)
+            for t in class_slots:
+                classes.append((t, k, [self.level_students[k][i] for i in sorted(members[t])]))
+
+        for t, k, students in sorted(classes, key=lambda entry: entry[0]):
+            day, start_time, _ = slots[t]
+            self.add_class_to_schedule(schedule, day, start_time, self.levels[k], students)
+        return schedule
@@ -0,0 +1,251 @@
+import csv
+from collections import defaultdict
+from PyQt6.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt6.QtGui import QColor
+from availability import END_TIMES, SLOT_INDEX
+from engine import DAYS, LEVELS
+from roster import name_key
+
+STUDENT_ROLE = Qt.ItemDataRole.UserRole
+NAME_SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+LEVEL_SORT_ROLE = Qt.ItemDataRole.UserRole + 2
+
+CLASSES_ROLE = Qt.ItemDataRole.UserRole + 3
+
+LEVEL_ORDER = {level: i for i, level in enumerate(LEVELS)}
+CLASS_CELL_COLOR = QColor("#D5F5E3")
+
+def student_label(student):
+    return f"{student.name} - {student.level} {'(Twice Weekly)' if student.twice_weekly else ''}"
+
+class StudentListModel(QAbstractListModel):
+    # One row per roster entry, in roster order. Roster changes made through this model
+    # notify views of just the affected rows; labels are formatted only for rows on screen.
+    def __init__(self, students, parent=None):
+        super().__init__(parent)
+        self.students = students
+        # Rows the views know about; differs from len(students) only if the roster was changed
+        # without going through this model
+        self.count = len(students)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= min(self.count, len(self.students)):
+            return None
+        student = self.students[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return student_label(student)
+        if role == STUDENT_ROLE:
+            return student
+        if role == NAME_SORT_ROLE:
+            return student.name.casefold()
+        if role == LEVEL_SORT_ROLE:
+            return LEVEL_ORDER.get(student.level, len(LEVEL_ORDER)), student.name.casefold()
+        return None
+
+    def set_students(self, students):
+        self.beginResetModel()
+        self.students = students
+        self.count = len(students)
+        self.endResetModel()
+
+    def in_sync(self):
+        return self.count == len(self.students)
+
+    def append_students(self, students):
+        if not students:
+            return
+        if not self.in_sync():
+            self.students.extend(students)
+            self.set_students(self.students)
+            return
+        first = self.count
+        self.beginInsertRows(QModelIndex(), first, first + len(students) - 1)
+        self.students.extend(students)
+        self.count = len(self.students)
+        self.endInsertRows()
+
+    def remove_student(self, student):
+        if not self.in_sync():
+            self.students.remove(student)
+            self.set_students(self.students)
+            return
+        row = self.students.index(student)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.students.remove(student)
+        self.count = len(self.students)
+        self.endRemoveRows()
+
+    def student_changed(self, student):
+        if not self.in_sync():
+            self.set_students(self.students)
+            return
+        index = self.index(self.students.index(student))
+        self.dataChanged.emit(index, index)
+
+class StudentFilterModel(QSortFilterProxyModel):
+    # Case-insensitive search on student names through the roster's name index, sorted by
+    # roster order, name or level
+    SORT_ROLES = {'roster': None, 'name': NAME_SORT_ROLE, 'level': LEVEL_SORT_ROLE}
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.search_key = ''
+        # Students matching search_key, only while the whole list is being refiltered
+        self.matches = None
+
+    def set_search(self, text):
+        self.search_key = name_key(text)
+        self.matches = self.sourceModel().students.names.search(text) if self.search_key else None
+        try:
+            self.invalidateFilter()
+        finally:
+            self.matches = None
+
+    def filterAcceptsRow(self, row, parent):
+        if not self.search_key:
+            return True
+        students = self.sourceModel().students
+        student = students[row]
+        if self.matches is not None:
+            return student in self.matches
+        # Rows inserted or changed later are checked one at a time against their indexed name
+        return self.search_key in students.names.keys.get(student, name_key(student.name))
+
+    def sort_by(self, key):
+        role = self.SORT_ROLES[key]
+        if role is None:
+            self.sort(-1)
+            return
+        self.setSortRole(role)
+        self.sort(0)
+
+    def lessThan(self, left, right):
+        role = self.sortRole()
+        return left.data(role) < right.data(role)
+
+    def student_at(self, row):
+        return self.index(row, 0).data(STUDENT_ROLE)
+
+def class_label(class_info):
+    teacher = f" ({class_info['teacher']})" if 'teacher' in class_info else ""
+    return f"{class_info['level']}{teacher}: {len(class_info['students'])} students"
+
+class ScheduleTableModel(QAbstractTableModel):
+    # Day columns by class start time rows over the engine's schedule dict. A cell holds every
+    # class starting then (several with teachers); rosters are only formatted when asked for.
+    EXPORT_HEADER = ('Day', 'Start', 'End', 'Level', 'Teacher', 'Students')
+
+    def __init__(self, days=DAYS, parent=None):
+        super().__init__(parent)
+        self.days = list(days)
+        self.schedule = {}
+        self.level = None
+        self.times = []
+        self.cells = {}
+        self.by_day = {}
+        self.student_days = {}
+
+    def set_schedule(self, schedule, days=None):
+        self.beginResetModel()
+        self.schedule = schedule or {}
+        if days is not None:
+            self.days = list(days)
+        self._index()
+        self._fill()
+        self.endResetModel()
+
+    def _index(self):
+        # Built once per schedule, so the calendar answers a date with a dict lookup: each day's
+        # classes in start time order, and the days each student has a class on
+        self.by_day = {}
+        student_days = defaultdict(set)
+        for day in self.days:
+            classes = sorted(self.schedule.get(day, ()), key=lambda class_info: SLOT_INDEX[class_info['time']])
+            self.by_day[day] = classes
+            for class_info in classes:
+                for student in class_info['students']:
+                    student_days[student].add(day)
+        self.student_days = dict(student_days)
+
+    def day_classes(self, day):
+        # One day's classes at the current level filter
+        classes = self.by_day.get(day, [])
+        if self.level is None:
+            return classes
+        return [class_info for class_info in classes if class_info['level'] == self.level]
+
+    def days_for(self, students):
+        days = set()
+        for student in students:
+            days |= self.student_days.get(student, set())
+        return days
+
+    def set_level(self, level):
+        # None shows every level
+        self.beginResetModel()
+        self.level = level
+        self._fill()
+        self.endResetModel()
+
+    def _fill(self):
+        cells = {}
+        for col, day in enumerate(self.days):
+            for class_info in self.schedule.get(day, ()):
+                if self.level is None or class_info['level'] == self.level:
+                    cells.setdefault((class_info['time'], col), []).append(class_info)
+        self.times = sorted({time for time, _ in cells}, key=SLOT_INDEX.get)
+        rows = {time: row for row, time in enumerate(self.times)}
+        self.cells = {(rows[time], col): classes for (time, col), classes in cells.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.times)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.days)
+
+    def classes_at(self, row, col):
+        return self.cells.get((row, col), [])
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        classes = self.cells.get((index.row(), index.column()))
+        if not classes:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return "\n".join(class_label(class_info) for class_info in classes)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return "\n".join(f"{class_label(c)}\n  {', '.join(s.name for s in c['students'])}" for c in classes)
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return CLASS_CELL_COLOR
+        if role == CLASSES_ROLE:
+            return classes
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.days[section]
+        time = self.times[section]
+        return f"{time} - {END_TIMES[time]}"
+
+    def export_rows(self):
+        # One row per class shown, day by day in time order
+        rows = []
+        for col, day in enumerate(self.days):
+            for row, time in enumerate(self.times):
+                for class_info in self.cells.get((row, col), ()):
+                    rows.append((day, time, END_TIMES[time], class_info['level'], class_info.get('teacher', ''),
+                                 ', '.join(s.name for s in class_info['students'])))
+        return rows
+
+    def export_csv(self, file_path):
+        with open(file_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.EXPORT_HEADER)
+            writer.writerows(self.export_rows())
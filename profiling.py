@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# Set to 1 to collect spans and counters, or to a file name to also write cProfile data there;
+# empty, 0 and the other false-like values leave profiling off
+PROFILE_ENV = 'ACADEMY_PROFILE'
+ENABLED_VALUES = ('1', 'true', 'yes', 'on')
+DISABLED_VALUES = ('', '0', 'false', 'no', 'off')
+
+def is_disabled(setting):
+    # True for the false-like values of a setting such as ACADEMY_PROFILE or ACADEMY_CACHE;
+    # None (not set at all) is left to the caller's default
+    return isinstance(setting, str) and setting.strip().lower() in DISABLED_VALUES
+
+class Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+
+class Profiler:
+    # Named timing spans around coarse phases and counters inside the hot loops. Spans always
+    # keep their latest duration in `last` (a couple of clock reads per phase); totals, call counts
+    # and counters are only kept while enabled, so disabled counters are a single attribute test.
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.last = {}
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.cprofile_path = None
+        self.cprofiles = []
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        return Span(self, name)
+
+    def add_time(self, name, seconds):
+        self.last[name] = seconds
+        if self.enabled:
+            with self.lock:
+                self.totals[name] += seconds
+                self.calls[name] += 1
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] += amount
+
+    def reset(self):
+        with self.lock:
+            self.last.clear()
+            self.totals.clear()
+            self.calls.clear()
+            self.counters.clear()
+
+    def configure(self, setting):
+        # setting is True/"1" to enable, or a file name to enable and write cProfile data on dump()
+        if not setting:
+            return
+        if setting is not True:
+            if is_disabled(setting):
+                return
+            if setting.strip().lower() not in ENABLED_VALUES:
+                self.cprofile_path = setting
+        self.enabled = True
+
+    def configure_from_environment(self):
+        self.configure(os.environ.get(PROFILE_ENV))
+
+    def profile_thread(self):
+        # cProfile only follows the thread that enables it, so each profiled thread gets its own
+        # Profile and dump() merges them
+        if self.cprofile_path is None:
+            return nullcontext()
+        return self._profile_thread()
+
+    @contextmanager
+    def _profile_thread(self):
+        # cProfile and pstats are only imported when asked for, they cost more than the rest of startup
+        import cProfile
+        profile = cProfile.Profile()
+        with self.lock:
+            self.cprofiles.append(profile)
+        profile.enable()
+        try:
+            yield profile
+        finally:
+            profile.disable()
+
+    def phase_seconds(self, names):
+        return [(name, self.last[name]) for name in names if name in self.last]
+
+    def report(self):
+        rows = [(name, str(self.calls[name]), f"{self.totals[name]:.4f}",
+                 f"{self.totals[name] / self.calls[name] * 1000:.2f}")
+                for name in sorted(self.totals, key=self.totals.get, reverse=True)]
+        lines = format_rows(('Span', 'Calls', 'Total s', 'Mean ms'), rows)
+        if self.counters:
+            lines += [''] + format_rows(('Counter', 'Value'),
+                                        [(name, str(value)) for name, value in sorted(self.counters.items())])
+        return '\n'.join(lines)
+
+    def dump(self, stream=None):
+        # Prints the report and writes the merged cProfile data, if any was collected
+        if not self.enabled:
+            return
+        print(self.report(), file=stream or sys.stderr)
+        if self.cprofile_path and self.cprofiles:
+            import pstats
+            stats = pstats.Stats(self.cprofiles[0])
+            for profile in self.cprofiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(self.cprofile_path)
+            print(f"cProfile data written to {self.cprofile_path}", file=stream or sys.stderr)
+
+def format_rows(header, rows):
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    def line(row):
+        return '  '.join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(row))
+    return [line(header), '  '.join('-' * width for width in widths)] + [line(row) for row in rows]
+
+# Shared by the engines, storage and the GUI
+profiler = Profiler()
+profiler.configure_from_environment()
@@ -0,0 +1,164 @@
+from engine import MIN_CLASS_SIZE, MAX_CLASS_SIZE
+from availability import CLASS_WINDOWS, SLOT_INDEX, class_window
+
+class ScheduleRepair:
+    def __init__(self, engine, schedule):
+        self.engine = engine
+        self.schedule = schedule
+        # Changes by class; several classes can share a day and time when there are teachers.
+        # classes keeps every recorded class alive, so its id is not reused by a new class.
+        self.changes = {}
+        self.classes = {}
+        self.removed = set()
+
+    def add_student(self, student):
+        student.scheduled_days = 0
+        self.place_students([student])
+        return self.report()
+
+    def remove_student(self, student):
+        self.removed.add(student)
+        for day, class_info in self.classes_of(student):
+            self.leave_class(day, class_info, student)
+        student.scheduled_days = 0
+        return self.report()
+
+    def update_student(self, student):
+        # Keep every class the student still fits, drop the rest, then fill any free sessions
+        for day, class_info in self.classes_of(student):
+            if not self.fits(student, day, class_info) or student.scheduled_days > student.max_sessions:
+                self.leave_class(day, class_info, student)
+        self.place_students([student])
+        return self.report()
+
+    def classes_of(self, student):
+        return [(day, class_info) for day, classes in self.schedule.items()
+                for class_info in classes if student in class_info['students']]
+
+    def fits(self, student, day, class_info):
+        return (student.level == class_info['level'] and
+                student.availability.has_window(day, class_window(class_info['time'])))
+
+    def has_capacity(self, student):
+        return student not in self.removed and student.scheduled_days < student.max_sessions
+
+    def students_at(self, day, time):
+        # Everyone already in a class at this day and time; with teachers there can be several
+        return {student for class_info in self.schedule[day] if class_info['time'] == time
+                for student in class_info['students']}
+
+    def leave_class(self, day, class_info, student):
+        class_info['students'].remove(student)
+        student.scheduled_days -= 1
+        self.record(day, class_info, left=[student])
+        if len(class_info['students']) >= MIN_CLASS_SIZE:
+            return
+
+        slot = SLOT_INDEX[class_info['time']]
+        busy = self.students_at(day, class_info['time'])
+        for candidate in self.engine.eligibility.students_for(class_info['level'], day, slot):
+            if len(class_info['students']) >= MIN_CLASS_SIZE:
+                return
+            if self.has_capacity(candidate) and candidate not in busy:
+                self.join_class(day, class_info, candidate)
+        if len(class_info['students']) < MIN_CLASS_SIZE:
+            self.dissolve_class(day, class_info)
+
+    def join_class(self, day, class_info, student):
+        class_info['students'].append(student)
+        student.scheduled_days += 1
+        self.record(day, class_info, joined=[student])
+
+    def dissolve_class(self, day, class_info):
+        self.schedule[day].remove(class_info)
+        freed = class_info['students']
+        for student in freed:
+            student.scheduled_days -= 1
+        self.record(day, class_info, action='removed', left=freed)
+        self.place_students(freed)
+
+    def place_students(self, students):
+        for student in students:
+            for day, classes in self.schedule.items():
+                for class_info in classes:
+                    if not self.has_capacity(student):
+                        break
+                    if (len(class_info['students']) < MAX_CLASS_SIZE and self.fits(student, day, class_info) and
+                            student not in self.students_at(day, class_info['time'])):
+                        self.join_class(day, class_info, student)
+            while self.has_capacity(student) and self.open_class(student):
+                pass
+
+    def free_slots(self, level):
+        # (day, start time, teacher) where a new class of this level could go; teacher is None
+        # when the engine schedules the single teacher_availability
+        occupied = {(day, class_info['time'], class_info.get('teacher'))
+                    for day, classes in self.schedule.items() for class_info in classes}
+        if not self.engine.teachers:
+            return [(day, start_time, None) for day, start_time, _ in self.engine.get_class_slots()
+                    if (day, start_time, None) not in occupied]
+        slots = []
+        for day, start_time, teachers in self.engine.get_teacher_slots():
+            free = [t for t in teachers if t.teaches(level) and (day, start_time, t.name) not in occupied]
+            if free:
+                slots.append((day, start_time, free[0]))
+        return slots
+
+    def open_class(self, student):
+        best = None
+        for day, start_time, teacher in self.free_slots(student.level):
+            slot = SLOT_INDEX[start_time]
+            if not student.availability.has_window(day, CLASS_WINDOWS[slot]):
+                continue
+            busy = self.students_at(day, start_time)
+            if student in busy:
+                continue
+            pool = [s for s in self.engine.eligibility.students_for(student.level, day, slot)
+                    if s is not student and self.has_capacity(s) and s not in busy]
+            if len(pool) + 1 >= MIN_CLASS_SIZE and (best is None or len(pool) > len(best[3])):
+                best = (day, start_time, teacher, pool)
+        if best is None:
+            return False
+
+        day, start_time, teacher, pool = best
+        self.engine.add_class_to_schedule(self.schedule, day, start_time, student.level,
+                                          [student] + pool[:MAX_CLASS_SIZE - 1], teacher)
+        class_info = self.schedule[day][-1]
+        self.schedule[day].sort(key=lambda class_info: class_info['time'])
+        self.record(day, class_info, action='added', joined=class_info['students'])
+        return True
+
+    def record(self, day, class_info, action='updated', joined=(), left=()):
+        key = id(class_info)
+        self.classes[key] = class_info
+        change = self.changes.get(key)
+        if change is None:
+            change = self.changes[key] = {
+                'action': 'updated', 'day': day, 'time': class_info['time'],
+                'level': class_info['level'], 'joined': [], 'left': []
+            }
+            if 'teacher' in class_info:
+                change['teacher'] = class_info['teacher']
+        if action == 'removed' and change['action'] == 'added':
+            del self.changes[key]
+            return
+        if action != 'updated':
+            change['action'] = action
+        for student in joined:
+            if student in change['left']:
+                change['left'].remove(student)
+            else:
+                change['joined'].append(student)
+        for student in left:
+            if student in change['joined']:
+                change['joined'].remove(student)
+            else:
+                change['left'].append(student)
+
+    def report(self):
+        day_order = {day: i for i, day in enumerate(self.engine.days)}
+        changes = [change for change in self.changes.values()
+                   if change['action'] != 'updated' or change['joined'] or change['left']]
+        self.changes = {}
+        self.classes = {}
+        return sorted(changes, key=lambda change: (day_order.get(change['day'], 0), change['time']))
@@ -0,0 +1,206 @@
+from collections import defaultdict
+from itertools import count
+from availability import class_start_slots
+
+class EligibilityIndex:
+    # (level, day, class start slot) -> students who can attend the whole class window
+    def __init__(self, students=()):
+        self.slots = defaultdict(dict)
+        self.entries = {}
+        self.sequence = count()
+        for student in students:
+            self.add(student)
+
+    def add(self, student, order=None):
+        if student in self.entries:
+            self.discard(student)
+        # Candidates come back in the order students were first added, i.e. roster order
+        order = next(self.sequence) if order is None else order
+        keys = [(student.level, day, slot)
+                for day, mask in student.availability.day_masks()
+                for slot in class_start_slots(mask)]
+        for key in keys:
+            self.slots[key][student] = order
+        self.entries[student] = (order, keys)
+
+    def discard(self, student):
+        entry = self.entries.pop(student, None)
+        if entry is None:
+            return
+        for key in entry[1]:
+            bucket = self.slots[key]
+            del bucket[student]
+            if not bucket:
+                del self.slots[key]
+
+    def update(self, student):
+        entry = self.entries.get(student)
+        self.add(student, entry[0] if entry else None)
+
+    def clear(self):
+        self.slots.clear()
+        self.entries.clear()
+
+    def students_for(self, level, day, slot):
+        bucket = self.slots.get((level, day, slot))
+        if not bucket:
+            return []
+        return sorted(bucket, key=bucket.get)
+
+def name_key(name):
+    return name.casefold()
+
+class NameIndex:
+    # Case-folded name -> students with that name, plus trigram postings for substring search
+    GRAM = 3
+
+    def __init__(self, students=()):
+        self.by_key = {}
+        self.keys = {}
+        self.grams = defaultdict(set)
+        for student in students:
+            self.add(student)
+
+    def add(self, student):
+        if student in self.keys:
+            self.discard(student)
+        key = name_key(student.name)
+        self.by_key.setdefault(key, {})[student] = None
+        self.keys[student] = key
+        for gram in self._grams(key):
+            self.grams[gram].add(student)
+
+    def discard(self, student):
+        key = self.keys.pop(student, None)
+        if key is None:
+            return
+        bucket = self.by_key[key]
+        del bucket[student]
+        if not bucket:
+            del self.by_key[key]
+        for gram in self._grams(key):
+            postings = self.grams[gram]
+            postings.discard(student)
+            if not postings:
+                del self.grams[gram]
+
+    def update(self, student):
+        # Re-keys a renamed student; cheap when the name did not change
+        if self.keys.get(student) != name_key(student.name):
+            self.add(student)
+
+    def clear(self):
+        self.by_key.clear()
+        self.keys.clear()
+        self.grams.clear()
+
+    def find(self, name):
+        return list(self.by_key.get(name_key(name), ()))
+
+    def contains(self, name, exclude=None):
+        bucket = self.by_key.get(name_key(name), ())
+        return any(student is not exclude for student in bucket)
+
+    def search(self, text):
+        # Students whose name contains text, ignoring case; queries shorter than a trigram scan
+        # the keys, everything else only verifies the students sharing all of its trigrams
+        key = name_key(text)
+        if not key:
+            return set(self.keys)
+        if len(key) < self.GRAM:
+            return {student for student, name in self.keys.items() if key in name}
+        postings = sorted((self.grams.get(gram, ()) for gram in self._grams(key)), key=len)
+        if not postings[0]:
+            return set()
+        return {student for student in postings[0] if key in self.keys[student]}
+
+    def _grams(self, key):
+        return {key[i:i + self.GRAM] for i in range(len(key) - self.GRAM + 1)}
+
+class Roster(list):
+    # A list of students with eligibility and name indexes. Each index is built from the list the
+    # first time it is asked for and then kept in sync with every mutation, so rosters that are
+    # only loaded, saved or archived never pay for them. Call update() after changing a student's
+    # name, level or availability in place.
+    def __init__(self, students=()):
+        super().__init__(students)
+        self._eligibility = None
+        self._names = None
+
+    @property
+    def eligibility(self):
+        if self._eligibility is None:
+            self._eligibility = EligibilityIndex(self)
+        return self._eligibility
+
+    @property
+    def names(self):
+        if self._names is None:
+            self._names = NameIndex(self)
+        return self._names
+
+    def _indexes(self):
+        return [index for index in (self._eligibility, self._names) if index is not None]
+
+    def append(self, student):
+        super().append(student)
+        for index in self._indexes():
+            index.add(student)
+
+    def extend(self, students):
+        for student in students:
+            self.append(student)
+
+    def __iadd__(self, students):
+        self.extend(students)
+        return self
+
+    def insert(self, position, student):
+        super().insert(position, student)
+        for index in self._indexes():
+            index.add(student)
+
+    def remove(self, student):
+        super().remove(student)
+        for index in self._indexes():
+            index.discard(student)
+
+    def pop(self, position=-1):
+        student = super().pop(position)
+        for index in self._indexes():
+            index.discard(student)
+        return student
+
+    def clear(self):
+        super().clear()
+        for index in self._indexes():
+            index.clear()
+
+    def __setitem__(self, position, value):
+        super().__setitem__(position, value)
+        self.rebuild()
+
+    def __delitem__(self, position):
+        super().__delitem__(position)
+        self.rebuild()
+
+    def copy(self):
+        return list(self)
+
+    def __reduce__(self):
+        return (Roster, (list(self),))
+
+    def update(self, student):
+        for index in self._indexes():
+            index.update(student)
+
+    def rebuild(self):
+        # Dropped indexes are rebuilt from the list when next used
+        self._eligibility = None
+        self._names = None
+
+    def has_name(self, name, exclude=None):
+        return self.names.contains(name, exclude)
+
+    def find(self, name):
+        return self.names.find(name)
@@ -1,59 +1,37 @@
 import sys
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QLineEdit, QComboBox, QListWidget, 
-                             QTextEdit, QGridLayout, QScrollArea, QTabWidget, QMessageBox,
-                             QFileDialog, QCheckBox, QStatusBar, QCalendarWidget, QSplitter)
-from PyQt6.QtCore import Qt, QSize, QDate, QPoint, pyqtSignal, QObject, QEvent, QPointF
-from PyQt6.QtGui import QColor, QPalette, QShortcut, QKeySequence, QIcon, QMouseEvent, QCursor, QFont
-from datetime import time, datetime, timedelta
-import json
-from collections import defaultdict
-
-class Student:
-    def __init__(self, name, level, availability, twice_weekly):
-        self.name = name
-        self.level = level
-        self.availability = availability
-        self.twice_weekly = twice_weekly
-        self.scheduled_days = 0
-
-class AvailabilityButton(QPushButton):
-    def __init__(self, day, time, parent, is_teacher=True):
-        super().__init__(parent)
-        self.day = day
-        self.time = time
-        self.is_teacher = is_teacher
-        self.parent_window = parent
-        self.setCheckable(True)
-        self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        self.setStyleSheet("""
-            QPushButton {
-                border: 1px solid #BDC3C7;
-                border-radius: 2px;
-                background-color: #ECF0F1;
-            }
-            QPushButton:checked {
-                background-color: #2ECC71;
-            }
-            QPushButton:hover {
-                background-color: #3498DB;
-            }
-        """)
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.parent_window.start_drag(self)
-        super().mousePressEvent(event)
-
-    def mouseMoveEvent(self, event):
-        if event.buttons() & Qt.MouseButton.LeftButton:
-            self.parent_window.continue_drag(self, event.pos())
-        super().mouseMoveEvent(event)
-
-    def mouseReleaseEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.parent_window.end_drag()
-        super().mouseReleaseEvent(event)
+import time
+import argparse
+# Taken before the Qt and application imports, so --startup-time can report what they cost
+IMPORT_STARTED = time.perf_counter()
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QPushButton, QLabel, QLineEdit, QComboBox, QListView,
+                             QTextEdit, QScrollArea, QTabWidget, QMessageBox,
+                             QFileDialog, QCheckBox, QStatusBar, QCalendarWidget, QSplitter,
+                             QTableView, QHeaderView, QProgressBar)
+from PyQt6.QtCore import Qt, QDate, QTimer
+from PyQt6.QtGui import QColor, QPalette, QShortcut, QKeySequence, QFont, QTextDocument, QTextCharFormat
+from availability import SLOT_TIMES, STUDENT_SLOT_TIMES, Availability, as_availability
+from engine import DAYS, LEVELS, Student, create_engine, add_hour_to_time, get_available_days
+from autosave import AutoSaver
+from cache import default_cache, schedule_key
+from profiling import profiler
+from models import CLASSES_ROLE, STUDENT_ROLE, ScheduleTableModel, StudentFilterModel, StudentListModel, class_label
+from repair import ScheduleRepair
+from roster import Roster
+from widgets import AvailabilityGrid, load_icon
+from workers import ScheduleWorker
+
+DATA_FILE_FILTER = "JSON Files (*.json);;Academy Database (*.db *.sqlite *.sqlite3)"
+# Students read from a database per event-loop turn, so the list fills in while the window stays responsive
+STUDENT_PAGE_SIZE = 500
+# Autosave waits this long after the last edit, so drag-painting and bursts of edits coalesce
+AUTOSAVE_DELAY_MS = 2000
+AUTOSAVE_SNAPSHOTS = 3
+# Spans shown in the status bar after a generation, as (label, span name)
+GENERATION_PHASES = (('engine', 'engine'), ('grouping', 'engine.group_students'), ('slots', 'engine.slots'),
+                     ('search', 'engine.search'), ('diagnostics', 'engine.diagnostics'), ('display', 'gui.display'))
+TEACHER_TAB, STUDENT_TAB, SCHEDULE_TAB = range(3)
+SEARCH_HIGHLIGHT_COLOR = QColor("#F9E79F")
 
 class AcademySchedulerGUI(QMainWindow):
     def __init__(self):
@@ -63,23 +41,43 @@ class AcademySchedulerGUI(QMainWindow):
 
         self.set_style()
 
-        self.days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        self.levels = ['Kids I', 'Kids II', 'Kids III', 'Pre-Teens I', 'Pre-Teens II', 'Pre-Teens III', 
-                       'Teens I', 'Teens II', 'Teens III', 'B1+', 'First']
-        self.teacher_availability = {day: set() for day in self.days}
-        self.students = []
+        self.days = list(DAYS)
+        self.levels = list(LEVELS)
+        self.teacher_availability = Availability({day: 0 for day in self.days})
+        self.students = Roster()
+        self.student_availability = Availability({day: 0 for day in self.days})
         self.selected_student = None
-
-        self.is_dragging = False
-        self.drag_start_state = None
-        self.last_dragged_button = None
+        # Models outlive the tabs: data is loaded into them whether or not their views exist yet
+        self.student_model = StudentListModel(self.students, self)
+        self.student_proxy = StudentFilterModel(self.student_model, self)
+        self.schedule_model = ScheduleTableModel(self.days, self)
+        self.schedule_document = QTextDocument(self)
+        # Weekdays on which a student matching the search box has a class, marked on the calendar
+        self.highlighted_days = set()
+        self.engine_name = 'greedy'
+        self.teachers = []
+        self.schedule = None
+        # Open database that edits are written through to, and the pages still being loaded from it
+        self.store = None
+        self.student_pages = None
+        # JSON file the session was loaded from or saved to, which autosave keeps up to date
+        self.file_path = None
+        self.dirty = False
+        # Bumped on every edit, so a generated schedule can tell whether the data changed under it
+        self.edit_count = 0
+        self.generation_worker = None
+        # Generated schedules by input hash, so regenerating or reopening unchanged data is instant
+        self.schedule_cache = default_cache()
+        self.autosaver = AutoSaver(AUTOSAVE_SNAPSHOTS)
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
 
         self.create_widgets()
         self.create_shortcuts()
         self.statusBar().showMessage("Welcome to Academy Scheduler")
 
-        self.student_availability = {day: set() for day in self.days}
-
     def set_style(self):
         palette = QPalette()
         palette.setColor(QPalette.ColorRole.Window, QColor(240, 248, 255))
@@ -132,7 +130,7 @@ class AcademySchedulerGUI(QMainWindow):
                 background-color: #3498DB;
                 color: white;
             }
-            QListWidget, QScrollArea {
+            QListView, QScrollArea {
                 background-color: white;
                 border: 1px solid #BDC3C7;
                 border-radius: 3px;
@@ -154,24 +152,30 @@ class AcademySchedulerGUI(QMainWindow):
         self.setCentralWidget(central_widget)
         main_layout = QVBoxLayout(central_widget)
 
-        tab_widget = QTabWidget()
-        main_layout.addWidget(tab_widget)
+        self.tabs = QTabWidget()
+        main_layout.addWidget(self.tabs)
 
         self.teacher_widget = QWidget()
         self.student_widget = QWidget()
         self.schedule_widget = QWidget()
 
-        tab_widget.addTab(self.teacher_widget, QIcon("icons/teacher.png"), "Teacher Availability")
-        tab_widget.addTab(self.student_widget, QIcon("icons/student.png"), "Student Information")
-        tab_widget.addTab(self.schedule_widget, QIcon("icons/schedule.png"), "Schedule")
+        self.tabs.addTab(self.teacher_widget, load_icon("teacher.png"), "Teacher Availability")
+        self.tabs.addTab(self.student_widget, load_icon("student.png"), "Student Information")
+        self.tabs.addTab(self.schedule_widget, load_icon("schedule.png"), "Schedule")
 
-        self.create_teacher_availability_widget()
-        self.create_student_info_widget()
-        self.create_schedule_widget()
+        # Only the tab on screen is built at startup; the others are filled in on first activation
+        self.tab_builders = {
+            TEACHER_TAB: self.create_teacher_availability_widget,
+            STUDENT_TAB: self.create_student_info_widget,
+            SCHEDULE_TAB: self.create_schedule_widget,
+        }
+        self.built_tabs = set()
+        self.tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tabs.currentIndex())
 
         button_layout = QHBoxLayout()
-        save_button = QPushButton(QIcon("icons/save.png"), "Save Data")
-        load_button = QPushButton(QIcon("icons/load.png"), "Load Data")
+        save_button = QPushButton(load_icon("save.png"), "Save Data")
+        load_button = QPushButton(load_icon("load.png"), "Load Data")
         save_button.clicked.connect(self.save_data)
         load_button.clicked.connect(self.load_data)
         button_layout.addWidget(save_button)
@@ -179,35 +183,28 @@ class AcademySchedulerGUI(QMainWindow):
         main_layout.addLayout(button_layout)
 
         self.setStatusBar(QStatusBar())
+        self.generation_progress = QProgressBar()
+        self.generation_progress.setMaximumWidth(200)
+        self.generation_progress.hide()
+        self.statusBar().addPermanentWidget(self.generation_progress)
+
+    def ensure_tab(self, index):
+        if index in self.built_tabs or index not in self.tab_builders:
+            return
+        self.built_tabs.add(index)
+        with profiler.span('gui.build_tab'):
+            self.tab_builders[index]()
+
+    def show_tab(self, index):
+        self.tabs.setCurrentIndex(index)
 
     def create_teacher_availability_widget(self):
         layout = QVBoxLayout(self.teacher_widget)
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
-        scroll_widget = QWidget()
-        scroll_layout = QGridLayout(scroll_widget)
-        scroll_layout.setHorizontalSpacing(1)
-        scroll_layout.setVerticalSpacing(1)
-
-        times = [time(hour=h, minute=m).strftime("%H:%M") for h in range(8, 22) for m in (0, 30)]
-
-        for col, day in enumerate(self.days):
-            label = QLabel(day)
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            scroll_layout.addWidget(label, 0, col + 1)
-
-        for row, t in enumerate(times):
-            time_label = QLabel(t)
-            time_label.setFixedWidth(40)
-            time_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            scroll_layout.addWidget(time_label, row + 1, 0)
-            for col, day in enumerate(self.days):
-                btn = AvailabilityButton(day, t, self, is_teacher=True)
-                btn.setFixedSize(QSize(25, 25))
-                btn.setToolTip(f"Click to toggle availability for {day} at {t}")
-                scroll_layout.addWidget(btn, row + 1, col + 1)
-
-        scroll_area.setWidget(scroll_widget)
+        self.teacher_grid = AvailabilityGrid(self.days, SLOT_TIMES, self.teacher_availability)
+        self.teacher_grid.availability_changed.connect(self.teacher_availability_changed)
+        scroll_area.setWidget(self.teacher_grid)
         layout.addWidget(scroll_area)
         scroll_area.setObjectName("TeacherScrollArea")
 
@@ -228,47 +225,24 @@ class AcademySchedulerGUI(QMainWindow):
 
         availability_scroll = QScrollArea()
         availability_scroll.setWidgetResizable(True)
-        availability_widget = QWidget()
-        availability_layout = QGridLayout(availability_widget)
-        availability_layout.setHorizontalSpacing(1)
-        availability_layout.setVerticalSpacing(1)
-        self.student_availability = {day: set() for day in self.days}
-
-        times = [time(hour=h, minute=m).strftime("%H:%M") for h in range(12, 22) for m in (0, 30)]
-
-        for col, day in enumerate(self.days):
-            label = QLabel(day)
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            availability_layout.addWidget(label, 0, col + 1)
-
-        for row, t in enumerate(times):
-            time_label = QLabel(t)
-            time_label.setFixedWidth(40)
-            time_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            availability_layout.addWidget(time_label, row + 1, 0)
-            for col, day in enumerate(self.days):
-                btn = AvailabilityButton(day, t, self, is_teacher=False)
-                btn.setFixedSize(QSize(25, 25))
-                btn.setToolTip(f"Click to toggle availability for {day} at {t}")
-                availability_layout.addWidget(btn, row + 1, col + 1)
-
-        availability_scroll.setWidget(availability_widget)
+        self.student_grid = AvailabilityGrid(self.days, STUDENT_SLOT_TIMES, self.student_availability)
+        availability_scroll.setWidget(self.student_grid)
         layout.addWidget(availability_scroll)
         availability_scroll.setObjectName("StudentScrollArea")
 
         button_layout = QHBoxLayout()
-        self.add_button = QPushButton(QIcon("icons/add.png"), "Add Student")
+        self.add_button = QPushButton(load_icon("add.png"), "Add Student")
         self.add_button.setToolTip("Add a new student")
         self.add_button.clicked.connect(self.add_student)
         button_layout.addWidget(self.add_button)
         
-        self.modify_button = QPushButton(QIcon("icons/modify.png"), "Modify Student")
+        self.modify_button = QPushButton(load_icon("modify.png"), "Modify Student")
         self.modify_button.setToolTip("Modify selected student")
         self.modify_button.clicked.connect(self.modify_student)
         self.modify_button.setEnabled(False)
         button_layout.addWidget(self.modify_button)
         
-        self.delete_button = QPushButton(QIcon("icons/delete.png"), "Delete Student")
+        self.delete_button = QPushButton(load_icon("delete.png"), "Delete Student")
         self.delete_button.setToolTip("Delete selected student")
         self.delete_button.clicked.connect(self.delete_student)
         self.delete_button.setEnabled(False)
@@ -276,8 +250,12 @@ class AcademySchedulerGUI(QMainWindow):
         
         layout.addLayout(button_layout)
 
-        self.student_listbox = QListWidget()
-        self.student_listbox.itemClicked.connect(self.select_student)
+        # Model/view list: only the rows on screen are formatted and painted
+        self.student_listbox = QListView()
+        self.student_listbox.setModel(self.student_proxy)
+        self.student_listbox.setUniformItemSizes(True)
+        self.student_listbox.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.student_listbox.clicked.connect(self.select_student)
         layout.addWidget(self.student_listbox)
 
         search_layout = QHBoxLayout()
@@ -285,24 +263,67 @@ class AcademySchedulerGUI(QMainWindow):
         self.search_entry = QLineEdit()
         self.search_entry.textChanged.connect(self.search_students)
         search_layout.addWidget(self.search_entry)
+        search_layout.addWidget(QLabel("Sort by:"))
+        self.sort_dropdown = QComboBox()
+        for label, key in (("Roster order", 'roster'), ("Name", 'name'), ("Level", 'level')):
+            self.sort_dropdown.addItem(label, key)
+        self.sort_dropdown.currentIndexChanged.connect(self.sort_students)
+        search_layout.addWidget(self.sort_dropdown)
         layout.addLayout(search_layout)
 
     def create_schedule_widget(self):
         layout = QVBoxLayout(self.schedule_widget)
-        generate_button = QPushButton(QIcon("icons/generate.png"), "Generate Schedule")
-        generate_button.setToolTip("Generate a new schedule")
-        generate_button.clicked.connect(self.generate_schedule)
-        layout.addWidget(generate_button)
+        generate_layout = QHBoxLayout()
+        self.generate_button = QPushButton(load_icon("generate.png"), "Generate Schedule")
+        self.generate_button.setToolTip("Generate a new schedule")
+        self.generate_button.clicked.connect(self.generate_schedule)
+        generate_layout.addWidget(self.generate_button)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setToolTip("Stop generating the schedule")
+        self.cancel_button.clicked.connect(self.cancel_generation)
+        generate_layout.addWidget(self.cancel_button)
+        self.update_generation_buttons()
+        layout.addLayout(generate_layout)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Level:"))
+        self.schedule_level_dropdown = QComboBox()
+        self.schedule_level_dropdown.addItem("All levels", None)
+        for level in self.levels:
+            self.schedule_level_dropdown.addItem(level, level)
+        self.schedule_level_dropdown.currentIndexChanged.connect(self.filter_schedule_by_level)
+        filter_layout.addWidget(self.schedule_level_dropdown)
+        filter_layout.addStretch()
+        export_button = QPushButton(load_icon("save.png"), "Export CSV")
+        export_button.setToolTip("Export the classes shown to a CSV file")
+        export_button.clicked.connect(self.export_schedule)
+        filter_layout.addWidget(export_button)
+        layout.addLayout(filter_layout)
 
         splitter = QSplitter(Qt.Orientation.Horizontal)
         layout.addWidget(splitter)
 
+        # Day x start time grid filled from the schedule model in one reset; a cell's roster is
+        # only written out when the cell is clicked
+        self.schedule_table = QTableView()
+        self.schedule_table.setModel(self.schedule_model)
+        self.schedule_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.schedule_table.setWordWrap(True)
+        self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.schedule_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.schedule_table.clicked.connect(self.show_class_roster)
+        splitter.addWidget(self.schedule_table)
+
+        side_splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(side_splitter)
         self.schedule_text = QTextEdit()
+        self.schedule_text.setDocument(self.schedule_document)
         self.schedule_text.setReadOnly(True)
-        splitter.addWidget(self.schedule_text)
 
         calendar_widget = QCalendarWidget()
         calendar_widget.selectionChanged.connect(self.update_schedule_for_date)
+        calendar_widget.currentPageChanged.connect(lambda year, month: self.paint_calendar_highlights())
+        self.schedule_calendar = calendar_widget
         
         calendar_widget.setStyleSheet("""
             QCalendarWidget QAbstractItemView {
@@ -319,74 +340,88 @@ class AcademySchedulerGUI(QMainWindow):
             }
         """)
         
-        splitter.addWidget(calendar_widget)
+        side_splitter.addWidget(calendar_widget)
+        side_splitter.addWidget(self.schedule_text)
+        self.paint_calendar_highlights()
 
     def create_shortcuts(self):
         QShortcut(QKeySequence("Ctrl+S"), self, self.save_data)
         QShortcut(QKeySequence("Ctrl+O"), self, self.load_data)
-        QShortcut(QKeySequence("Ctrl+A"), self, self.add_student)
-        QShortcut(QKeySequence("Ctrl+M"), self, self.modify_student)
-        QShortcut(QKeySequence("Ctrl+D"), self, self.delete_student)
+        QShortcut(QKeySequence("Ctrl+A"), self, lambda: self.student_shortcut(self.add_student))
+        QShortcut(QKeySequence("Ctrl+M"), self, lambda: self.student_shortcut(self.modify_student))
+        QShortcut(QKeySequence("Ctrl+D"), self, lambda: self.student_shortcut(self.delete_student))
         QShortcut(QKeySequence("Ctrl+G"), self, self.generate_schedule)
-        QShortcut(QKeySequence("Ctrl+F"), self, self.search_entry.setFocus)
-
-    def start_drag(self, button):
-        self.is_dragging = True
-        self.drag_start_state = button.isChecked()
-        self.toggle_availability(button)
-
-    def continue_drag(self, button, pos):
-        if self.is_dragging:
-            parent = button.parent()
-            global_pos = button.mapToGlobal(pos)
-            # Convert QPointF to QPoint
-            global_point = QPoint(int(global_pos.x()), int(global_pos.y()))
-            target_button = parent.childAt(parent.mapFromGlobal(global_point))
-            if isinstance(target_button, AvailabilityButton) and target_button != self.last_dragged_button:
-                target_button.setChecked(self.drag_start_state)
-                self.toggle_availability(target_button)
-                self.last_dragged_button = target_button
-
-    def end_drag(self):
-        self.is_dragging = False
-        self.drag_start_state = None
-        self.last_dragged_button = None
-
-    def toggle_availability(self, button):
-        day, time = button.day, button.time
-        if button.is_teacher:  # Teacher availability
-            if time in self.teacher_availability[day]:
-                self.teacher_availability[day].remove(time)
-            else:
-                self.teacher_availability[day].add(time)
-        else:  # Student availability
-            if time in self.student_availability[day]:
-                self.student_availability[day].remove(time)
-            else:
-                self.student_availability[day].add(time)
-        
-        button.setChecked(time in (self.teacher_availability[day] if button.is_teacher else self.student_availability[day]))
+        QShortcut(QKeySequence("Ctrl+F"), self, lambda: self.student_shortcut(self.search_entry.setFocus))
+
+    def student_shortcut(self, action):
+        # The student form's shortcuts work from any tab, so they bring it up first
+        self.show_tab(STUDENT_TAB)
+        action()
+
+    def teacher_availability_changed(self, days):
+        if self.store:
+            for day in days:
+                self.store.save_teacher_day(day, self.teacher_availability.mask(day))
+        self.mark_dirty()
 
     def search_students(self):
-        search_text = self.search_entry.text().lower()
-        for i in range(self.student_listbox.count()):
-            item = self.student_listbox.item(i)
-            if search_text in item.text().lower():
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+        self.student_proxy.set_search(self.search_entry.text())
+        self.highlight_searched_classes()
+
+    def highlight_searched_classes(self):
+        search_key = self.student_proxy.search_key
+        matches = self.students.names.search(search_key) if search_key else ()
+        self.highlighted_days = self.schedule_model.days_for(matches)
+        self.paint_calendar_highlights()
+
+    def paint_calendar_highlights(self):
+        # Only the month on show is painted, each date checked against the highlighted weekdays
+        if SCHEDULE_TAB not in self.built_tabs:
+            return
+        calendar = self.schedule_calendar
+        calendar.setDateTextFormat(QDate(), QTextCharFormat())
+        if not self.highlighted_days:
+            return
+        highlight = QTextCharFormat()
+        highlight.setBackground(SEARCH_HIGHLIGHT_COLOR)
+        highlight.setFontWeight(QFont.Weight.Bold)
+        first = QDate(calendar.yearShown(), calendar.monthShown(), 1)
+        for offset in range(first.daysInMonth()):
+            date = first.addDays(offset)
+            if self.day_for_date(date) in self.highlighted_days:
+                calendar.setDateTextFormat(date, highlight)
+
+    def day_for_date(self, date):
+        # Monday to Friday map onto the schedule's days; weekends have no classes
+        day_of_week = date.dayOfWeek()
+        if 1 <= day_of_week <= 5:
+            return self.days[day_of_week - 1]
+        return None
+
+    def sort_students(self):
+        self.student_proxy.sort_by(self.sort_dropdown.currentData())
 
     def update_schedule_for_date(self):
-        selected_date = self.sender().selectedDate()
-        day_of_week = selected_date.dayOfWeek()
-        if 1 <= day_of_week <= 5:
-            day_name = self.days[day_of_week - 1]
+        day_name = self.day_for_date(self.sender().selectedDate())
+        if day_name is not None:
             self.display_schedule_for_day(day_name)
         else:
-            self.schedule_text.setText("No classes scheduled for weekends.")
+            self.schedule_document.setPlainText("No classes scheduled for weekends.")
 
     def display_schedule_for_day(self, day):
-        pass
+        if self.schedule is None:
+            self.schedule_document.setPlainText("No schedule generated yet.")
+            return
+        classes = self.schedule_model.day_classes(day)
+        if not classes:
+            self.schedule_document.setPlainText(f"No classes scheduled on {day}.")
+            return
+        lines = [f"{day}: {len(classes)} {'class' if len(classes) == 1 else 'classes'}"]
+        for class_info in classes:
+            time = class_info['time']
+            lines.append(f"  {time} - {self.add_hour_to_time(time)}  {class_label(class_info)}")
+            lines.extend(f"    {student.name}" for student in class_info['students'])
+        self.schedule_document.setPlainText("\n".join(lines))
 
     def add_student(self):
         name = self.name_entry.text()
@@ -396,17 +431,16 @@ class AcademySchedulerGUI(QMainWindow):
             if self.is_duplicate_name(name):
                 QMessageBox.warning(self, "Error", "A student with this name already exists. Please use a different name.")
                 return
-            student = Student(name, level, {day: set(times) for day, times in self.student_availability.items()}, twice_weekly)
-            self.students.append(student)
-            self.student_listbox.addItem(f"{name} - {level} {'(Twice Weekly)' if twice_weekly else ''}")
+            student = Student(name, level, self.student_availability.copy(), twice_weekly)
+            self.student_model.append_students([student])
             self.clear_student_form()
-            self.statusBar().showMessage(f"Student {name} added successfully", 2000)
+            changes = self.repair_schedule('add_student', student)
+            self.statusBar().showMessage(f"Student {name} added successfully{changes}", 2000)
         else:
             QMessageBox.warning(self, "Error", "Please enter both name and level")
 
-    def select_student(self, item):
-        index = self.student_listbox.row(item)
-        self.selected_student = self.students[index]
+    def select_student(self, index):
+        self.selected_student = index.data(STUDENT_ROLE)
         self.name_entry.setText(self.selected_student.name)
         self.level_dropdown.setCurrentText(self.selected_student.level)
         self.twice_weekly_checkbox.setChecked(self.selected_student.twice_weekly)
@@ -427,10 +461,10 @@ class AcademySchedulerGUI(QMainWindow):
                 QMessageBox.warning(self, "Error", "A student with this name already exists. Please use a different name.")
                 return
             student = Student(name, level, self.student_availability.copy(), twice_weekly)
-            self.students.append(student)
-            self.student_listbox.addItem(f"{name} - {level} {'(Twice Weekly)' if twice_weekly else ''}")
+            self.student_model.append_students([student])
             self.clear_student_form()
-            self.statusBar().showMessage(f"New student {name} saved successfully", 2000)
+            changes = self.repair_schedule('add_student', student)
+            self.statusBar().showMessage(f"New student {name} saved successfully{changes}", 2000)
         else:
             QMessageBox.warning(self, "Error", "Please enter both name and level")
 
@@ -447,20 +481,16 @@ class AcademySchedulerGUI(QMainWindow):
         self.add_button.clicked.connect(self.add_student)
 
     def update_availability_ui(self):
-        availability_layout = self.student_widget.layout().itemAt(1).widget().widget().layout()
-        for col, day in enumerate(self.days, start=1):
-            for row, time in enumerate(self.get_time_slots(), start=1):
-                btn = availability_layout.itemAtPosition(row, col).widget()
-                if btn:
-                    btn.setChecked(time in self.student_availability[day])
+        if STUDENT_TAB in self.built_tabs:
+            self.student_grid.set_availability(self.student_availability)
 
     def reset_student_availability(self):
-        self.student_availability = {day: set() for day in self.days}
+        self.student_availability = Availability({day: 0 for day in self.days})
         self.update_availability_ui()
 
     @staticmethod
     def get_time_slots():
-        return [time(hour=h, minute=m).strftime("%H:%M") for h in range(12, 22) for m in (0, 30)]
+        return STUDENT_SLOT_TIMES
 
     def modify_student(self):
         if self.selected_student:
@@ -472,272 +502,422 @@ class AcademySchedulerGUI(QMainWindow):
             self.selected_student.level = self.level_dropdown.currentText()
             self.selected_student.twice_weekly = self.twice_weekly_checkbox.isChecked()
             self.selected_student.availability = self.student_availability.copy()
-            self.update_student_listbox()
+            student = self.selected_student
+            self.students.update(student)
+            self.student_model.student_changed(student)
             self.clear_student_form()
-            self.statusBar().showMessage(f"Student {new_name} information updated", 2000)
+            changes = self.repair_schedule('update_student', student)
+            self.statusBar().showMessage(f"Student {new_name} information updated{changes}", 2000)
 
     def delete_student(self):
         if self.selected_student:
-            student_name = self.selected_student.name  # Store the name before deletion
-            self.students.remove(self.selected_student)
-            self.update_student_listbox()
+            student = self.selected_student
+            student_name = student.name  # Store the name before deletion
+            self.student_model.remove_student(student)
             self.clear_student_form()
-            self.statusBar().showMessage(f"Student {student_name} deleted", 2000)
+            changes = self.repair_schedule('remove_student', student)
+            self.statusBar().showMessage(f"Student {student_name} deleted{changes}", 2000)
         else:
             self.statusBar().showMessage("No student selected for deletion", 2000)
 
     def update_student_listbox(self):
-        self.student_listbox.clear()
-        for student in self.students:
-            self.student_listbox.addItem(f"{student.name} - {student.level} {'(Twice Weekly)' if student.twice_weekly else ''}")
+        # Full reset, for when self.students was replaced; single edits go through the model
+        self.student_model.set_students(self.students)
 
     def generate_schedule(self):
-        self.schedule_text.clear()
-        schedule = self.create_optimal_schedule()
-        self.display_schedule(schedule)
-
-    def create_optimal_schedule(self):
-        schedule = {day: [] for day in self.days}
-        students_by_level = self.group_students_by_level()
-
-        for day in self.days:
-            available_times = sorted(self.teacher_availability[day])
-            for start_time in available_times:
-                end_time = self.add_hour_to_time(start_time)
-                if end_time not in self.teacher_availability[day]:
-                    continue
+        if self.student_pages is not None:
+            self.statusBar().showMessage("Students are still loading", 2000)
+            return
+        if self.generation_worker is not None:
+            self.statusBar().showMessage("A schedule is already being generated", 2000)
+            return
+        key = self.generation_key()
+        schedule = self.cached_schedule(key)
+        if schedule is not None:
+            self.set_generated_schedule(schedule)
+            self.statusBar().showMessage("Schedule loaded from cache, nothing changed since it was generated", 5000)
+            return
+        # The engine runs on copies, so students and availability can be edited while it works
+        originals = {student.copy(): student for student in self.students}
+        engine = create_engine(as_availability(self.teacher_availability).copy(), Roster(originals), self.days,
+                               self.engine_name, teachers=[teacher.copy() for teacher in self.teachers])
+        worker = ScheduleWorker(engine, self, self.schedule_cache, key, self.engine_name)
+        edit_count = self.edit_count
+        for _, name in GENERATION_PHASES:
+            profiler.last.pop(name, None)
+        worker.progress.connect(self.show_generation_progress)
+        worker.generated.connect(lambda schedule: self.apply_generated_schedule(worker, schedule, originals, edit_count))
+        worker.cancelled.connect(lambda: self.show_generation_message(worker, "Schedule generation cancelled", 2000))
+        worker.failed.connect(lambda error: self.show_generation_message(worker, f"Error generating schedule: {error}", 5000))
+        worker.finished.connect(lambda: self.generation_finished(worker))
+        self.generation_worker = worker
+        self.update_generation_buttons()
+        self.generation_progress.setRange(0, 0)
+        self.generation_progress.show()
+        self.statusBar().showMessage("Generating schedule...")
+        worker.start()
+
+    def show_generation_progress(self, done, total):
+        self.generation_progress.setRange(0, total)
+        self.generation_progress.setValue(done)
+
+    def apply_generated_schedule(self, worker, schedule, originals, edit_count):
+        # Swap the engine's copies back for the roster's students in one step on the GUI thread;
+        # students deleted meanwhile are dropped
+        if worker is not self.generation_worker:
+            return
+        live = set(self.students)
+        for student in self.students:
+            student.scheduled_days = 0
+        for classes in schedule.values():
+            for class_info in classes:
+                class_info['students'] = [originals[s] for s in class_info['students'] if originals[s] in live]
+                for student in class_info['students']:
+                    student.scheduled_days += 1
+        stale = self.edit_count != edit_count
+        self.set_generated_schedule(schedule)
+        if stale:
+            self.statusBar().showMessage("Schedule generated; data changed meanwhile, generate again to include it", 5000)
+        else:
+            self.statusBar().showMessage(f"Schedule generated: {self.generation_breakdown()}", 10000)
+
+    def set_generated_schedule(self, schedule):
+        self.schedule = schedule
+        if self.store:
+            self.store.save_schedule(self.schedule)
+        self.mark_dirty()
+        self.display_schedule(self.schedule)
+
+    def generation_key(self):
+        return schedule_key(self.teacher_availability, self.students, self.days, self.engine_name,
+                            teachers=self.teachers)
+
+    def cached_schedule(self, key=None):
+        # A schedule generated earlier from exactly the current data, mapped onto the roster, or None
+        if self.schedule_cache is None:
+            return None
+        data = self.schedule_cache.get(key or self.generation_key())
+        if data is None:
+            return None
+        from storage import schedule_from_data
+        return schedule_from_data(data, self.students, self.days)
+
+    def generation_breakdown(self):
+        seconds = dict(profiler.phase_seconds([name for _, name in GENERATION_PHASES]))
+        return ', '.join(f"{label} {seconds[name] * 1000:.0f} ms" for label, name in GENERATION_PHASES if name in seconds)
+
+    def show_generation_message(self, worker, message, timeout):
+        if worker is self.generation_worker:
+            self.statusBar().showMessage(message, timeout)
+
+    def cancel_generation(self):
+        if self.generation_worker is not None:
+            self.generation_worker.cancel()
+            self.update_generation_buttons()
+            self.statusBar().showMessage("Cancelling schedule generation...")
+
+    def stop_generation(self):
+        # Cancels and waits, discarding any result still on its way to the GUI thread
+        worker = self.generation_worker
+        if worker is not None:
+            worker.cancel()
+            worker.wait()
+            self.generation_finished(worker)
+
+    def generation_finished(self, worker):
+        if worker is not self.generation_worker:
+            return
+        self.generation_worker = None
+        worker.deleteLater()
+        self.update_generation_buttons()
+        self.generation_progress.hide()
+
+    def update_generation_buttons(self):
+        if SCHEDULE_TAB not in self.built_tabs:
+            return
+        worker = self.generation_worker
+        self.generate_button.setEnabled(worker is None)
+        self.cancel_button.setEnabled(worker is not None and not worker.cancel_event.is_set())
+
+    def repair_schedule(self, action, student):
+        # Patch the current schedule around one edited student instead of regenerating it, and
+        # write the student and the days whose classes changed through to an open database
+        changes = []
+        if self.schedule is not None:
+            changes = getattr(ScheduleRepair(self.schedule_engine(), self.schedule), action)(student)
+            self.display_schedule(self.schedule)
+        if self.store:
+            if action == 'remove_student':
+                self.store.delete_student(student)
+            else:
+                self.store.save_student(student)
+            if changes:
+                self.store.save_schedule(self.schedule, {change['day'] for change in changes})
+        self.mark_dirty()
+        if not changes:
+            return ""
+        return f", {len(changes)} {'class' if len(changes) == 1 else 'classes'} changed"
 
-                self.schedule_classes_for_time_slot(schedule, day, start_time, end_time, students_by_level)
+    def schedule_engine(self):
+        return create_engine(self.teacher_availability, self.students, self.days, self.engine_name, teachers=self.teachers)
 
-        return schedule
+    def create_optimal_schedule(self):
+        return self.schedule_engine().create_optimal_schedule()
 
     def group_students_by_level(self):
-        students_by_level = defaultdict(list)
-        for student in self.students:
-            students_by_level[student.level].append(student)
-            student.scheduled_days = 0
-        return students_by_level
-
-    def schedule_classes_for_time_slot(self, schedule, day, start_time, end_time, students_by_level):
-        for level, students in students_by_level.items():
-            available_students = self.get_available_students(students, day, start_time, end_time)
-            
-            if 3 <= len(available_students) <= 7:
-                self.add_class_to_schedule(schedule, day, start_time, level, available_students)
-                break  # Move to the next time slot
-            elif len(available_students) > 7:
-                class_students = available_students[:7]
-                self.add_class_to_schedule(schedule, day, start_time, level, class_students)
-                break  # Move to the next time slot
+        return self.schedule_engine().group_students_by_level()
 
     def add_class_to_schedule(self, schedule, day, start_time, level, students):
-        schedule[day].append({
-            'time': start_time,
-            'level': level,
-            'students': students
-        })
-        for student in students:
-            student.scheduled_days += 1
+        self.schedule_engine().add_class_to_schedule(schedule, day, start_time, level, students)
 
     def get_available_students(self, students, day, start_time, end_time):
-        return [s for s in students if 
-                start_time in s.availability[day] and
-                end_time in s.availability[day] and
-                (not s.twice_weekly and s.scheduled_days == 0) or
-                (s.twice_weekly and s.scheduled_days < 2)]
+        return self.schedule_engine().get_available_students(students, day, start_time, end_time)
 
     def add_hour_to_time(self, time_str):
-        t = datetime.strptime(time_str, "%H:%M")
-        t += timedelta(hours=1)
-        return t.strftime("%H:%M")
+        return add_hour_to_time(time_str)
 
     def display_schedule(self, schedule):
-        self.schedule_text.clear()
-        self.schedule_text.append("Weekly Schedule:")
-        self._display_scheduled_classes(schedule)
-        self._display_unscheduled_students(schedule)
+        with profiler.span('gui.display'):
+            self._display_scheduled_classes(schedule)
+            self.schedule_document.setPlainText("\n".join(self.schedule_summary(schedule) + self._unscheduled_lines(schedule)))
 
     def _display_scheduled_classes(self, schedule):
-        for day, classes in schedule.items():
-            self.schedule_text.append(f"\n{day}:")
-            if not classes:
-                self.schedule_text.append("  No classes scheduled")
-            for class_info in classes:
-                start_time = class_info['time']
-                end_time = self.add_hour_to_time(start_time)
-                self.schedule_text.append(f"  {start_time} - {end_time}: {class_info['level']} Class")
-                self.schedule_text.append(f"    Students: {', '.join(s.name for s in class_info['students'])}")
+        self.schedule_model.set_schedule(schedule, self.days)
+        self.highlight_searched_classes()
 
     def _display_unscheduled_students(self, schedule):
+        self.schedule_document.setPlainText("\n".join(self._unscheduled_lines(schedule)))
+
+    def schedule_summary(self, schedule):
+        classes = [class_info for day_classes in schedule.values() for class_info in day_classes]
+        return [f"Weekly Schedule: {len(classes)} classes, {sum(len(c['students']) for c in classes)} places filled"]
+
+    def _unscheduled_lines(self, schedule):
         unscheduled_students = self.get_unscheduled_students(schedule)
-        if unscheduled_students:
-            self.schedule_text.append("\nUnscheduled Students:")
-            for level, students in unscheduled_students.items():
-                self.schedule_text.append(f"  {level}:")
-                for student, reason in students:
-                    self.schedule_text.append(f"    {student.name}: {reason}")
+        if not unscheduled_students:
+            return []
+        lines = ["", "Unscheduled Students:"]
+        for level, students in unscheduled_students.items():
+            lines.append(f"  {level}:")
+            lines.extend(f"    {student.name}: {reason}" for student, reason in students)
+        return lines
+
+    def show_class_roster(self, index):
+        classes = index.data(CLASSES_ROLE)
+        if not classes:
+            return
+        day = self.schedule_model.headerData(index.column(), Qt.Orientation.Horizontal)
+        time = self.schedule_model.times[index.row()]
+        lines = [f"{day} {time} - {self.add_hour_to_time(time)}:"]
+        for class_info in classes:
+            lines.append(f"  {class_label(class_info)}")
+            lines.extend(f"    {student.name}" for student in class_info['students'])
+        self.schedule_document.setPlainText("\n".join(lines))
+
+    def filter_schedule_by_level(self):
+        self.schedule_model.set_level(self.schedule_level_dropdown.currentData())
+
+    def export_schedule(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Schedule", "", "CSV Files (*.csv)")
+        if not file_path:
+            return
+        try:
+            self.schedule_model.export_csv(file_path)
+            self.statusBar().showMessage(f"Schedule exported to {file_path}", 2000)
+        except OSError as e:
+            self.statusBar().showMessage(f"Error exporting schedule: {e}", 5000)
 
     def get_unscheduled_students(self, schedule):
-        unscheduled = defaultdict(list)
-        for student in self.students:
-            reason = self.get_student_scheduling_status(student, schedule)
-            if reason:
-                unscheduled[student.level].append((student, reason))
-        return unscheduled
+        return self.schedule_engine().get_unscheduled_students(schedule)
 
     def get_student_scheduling_status(self, student, schedule):
-        if student.scheduled_days == 0:
-            return self.get_unscheduled_reason(student, schedule)
-        elif student.twice_weekly and student.scheduled_days < 2:
-            return self.get_partially_scheduled_reason(student, schedule)
-        return None
-
-    def get_unscheduled_reason(self, student, schedule):
-        if not any(student.availability.values()):
-            return "No available time slots"
-        if self.is_class_full(student, schedule):
-            return "Class was full"
-        return "No matching class times"
+        return self.schedule_engine().get_student_scheduling_status(student, schedule)
 
     def is_class_full(self, student, schedule):
-        return any(
-            student.level == class_info['level'] and class_info['time'] in student.availability[day]
-            for day, classes in schedule.items()
-            for class_info in classes
-        )
-
-    def get_partially_scheduled_reason(self, student, schedule):
-        available_days = self.get_available_days(student)
-        if len(available_days) < 2:
-            return "Insufficient availability for twice-weekly classes"
-        scheduled_day = self.get_scheduled_day(student, schedule)
-        remaining_days = [day for day in available_days if day != scheduled_day]
-        if self.is_second_class_full(student, schedule, remaining_days):
-            return "Second class was full"
-        return "No matching time for second class"
+        return self.schedule_engine().is_class_full(student, schedule)
 
     def get_available_days(self, student):
-        return [day for day, times in student.availability.items() if times]
-
-    def get_scheduled_day(self, student, schedule):
-        return next(
-            day for day, classes in schedule.items() 
-            if any(student in class_info['students'] for class_info in classes)
-        )
-
-    def is_second_class_full(self, student, schedule, remaining_days):
-        return any(
-            student.level == class_info['level'] and class_info['time'] in student.availability[day]
-            for day in remaining_days
-            for class_info in schedule[day]
-        )
+        return get_available_days(student)
 
     def save_data(self):
+        from database import is_database_path
+        from storage import build_data, save_file
+        if self.student_pages is not None:
+            # Only the pages read so far are in memory; saving them over the database would drop the rest
+            self.statusBar().showMessage("Students are still loading", 2000)
+            return
         try:
-            generated_schedule = self.get_current_schedule()
-            data = {
-                'teacher_availability': {day: list(times) for day, times in self.teacher_availability.items()},
-                'students': [{
-                    'name': s.name, 
-                    'level': s.level, 
-                    'availability': {d: list(t) for d, t in s.availability.items()},
-                    'twice_weekly': s.twice_weekly
-                } for s in self.students],
-                'generated_schedule': generated_schedule
-            }
-            file_path, _ = QFileDialog.getSaveFileName(self, "Save Data", "", "JSON Files (*.json)")
+            file_path, _ = QFileDialog.getSaveFileName(self, "Save Data", "", DATA_FILE_FILTER)
             if file_path:
-                with open(file_path, 'w') as f:
-                    json.dump(data, f, indent=2)
+                if is_database_path(file_path):
+                    self.open_store(file_path).save_all(self.teacher_availability, self.students,
+                                                        self.schedule, self.teachers)
+                    self.file_path = None
+                else:
+                    generated_schedule = self.get_current_schedule()
+                    data = build_data(self.teacher_availability, self.students, generated_schedule, self.teachers)
+                    self.autosaver.flush()
+                    save_file(file_path, data)
+                    self.file_path = file_path
+                self.mark_clean()
                 self.statusBar().showMessage(f"Data saved to {file_path}", 2000)
         except Exception as e:
             self.statusBar().showMessage(f"Error saving data: {str(e)}", 5000)
 
+    def mark_dirty(self):
+        self.dirty = True
+        self.edit_count += 1
+        self.autosave_timer.start()
+
+    def mark_clean(self):
+        self.dirty = False
+        self.autosave_timer.stop()
+
+    def autosave(self):
+        # Open databases are written through already; untitled sessions have nowhere to go yet
+        if self.autosaver.last_error is not None:
+            self.statusBar().showMessage(f"Autosave failed: {self.autosaver.last_error}", 5000)
+        if not self.dirty or self.store or self.file_path is None or self.student_pages is not None:
+            return
+        # Snapshot on the GUI thread; the JSON encoding and disk I/O happen on the writer thread
+        from storage import build_data
+        data = build_data(self.teacher_availability, self.students, self.get_current_schedule(), self.teachers)
+        self.autosaver.submit(self.file_path, data)
+        self.mark_clean()
+
+    def closeEvent(self, event):
+        self.stop_generation()
+        self.autosave()
+        self.autosaver.close()
+        self.close_store()
+        super().closeEvent(event)
+
+    def open_store(self, file_path):
+        if self.store and self.store.file_path == file_path:
+            return self.store
+        self.close_store()
+        from database import SQLiteStore
+        self.store = SQLiteStore(file_path)
+        return self.store
+
+    def close_store(self):
+        if self.store:
+            self.store.close()
+        self.store = None
+        self.student_pages = None
+
     def get_current_schedule(self):
-        schedule = {}
-        schedule_text = self.schedule_text.toPlainText()
-        current_day = None
-        class_info = None
-        for line in schedule_text.split('\n'):
-            line = line.strip()
-            if line in self.days:
-                current_day = line
-                schedule[current_day] = []
-            elif current_day and ' - ' in line and ':' in line:
-                time_range, class_details = line.split(': ', 1)
-                start_time = time_range.split(' - ')[0]
-                level = class_details.split(' Class')[0]
-                class_info = {'time': start_time, 'level': level, 'students': []}
-                schedule[current_day].append(class_info)
-            elif line.startswith('Students:'):
-                if class_info is not None:
-                    students = [s.strip() for s in line.split(':', 1)[1].split(',')]
-                    class_info['students'] = students
-            elif line == "Weekly Schedule:":
-                pass
-            elif line == "Unscheduled Students:":
-                break
-
-        return schedule
+        # Serialized straight from the schedule model; the text view is display only
+        if self.schedule is None:
+            return {}
+        from storage import schedule_to_data
+        return schedule_to_data(self.schedule)
 
     def load_data(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Load Data", "", "JSON Files (*.json)")
+        file_path, _ = QFileDialog.getOpenFileName(self, "Load Data", "", DATA_FILE_FILTER)
         if file_path:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            self.teacher_availability = {day: set(data['teacher_availability'].get(day, [])) for day in self.days}
-            self.students = [Student(s['name'], s['level'], {d: set(t) for d, t in s['availability'].items()}, s['twice_weekly']) for s in data['students']]
+            from database import is_database_path
+            from storage import load_file, schedule_from_data
+            # Pending edits and a running generation belong to the file being closed
+            self.stop_generation()
+            self.autosave()
+            self.mark_clean()
+            if is_database_path(file_path):
+                self.file_path = None
+                self.load_database(file_path)
+                return
+            self.close_store()
+            self.teacher_availability, self.students, generated_schedule, self.teachers = load_file(file_path, self.days)
+            self.file_path = file_path
+            self.schedule = None
             self.update_gui_from_data()
-            if 'generated_schedule' in data:
-                self.display_loaded_schedule(data['generated_schedule'])
+            # Files saved without a schedule get back one generated earlier for the same data
+            cached = None if generated_schedule else self.cached_schedule()
+            if cached is not None:
+                self.schedule = cached
+                self.display_loaded_schedule(self.schedule)
+                self.statusBar().showMessage(f"Data loaded from {file_path}, schedule restored from cache", 2000)
+                return
+            if generated_schedule is not None:
+                self.schedule = schedule_from_data(generated_schedule, self.students, self.days)
+                self.display_loaded_schedule(self.schedule)
             self.statusBar().showMessage(f"Data loaded from {file_path}", 2000)
 
+    def load_database(self, file_path):
+        store = self.open_store(file_path)
+        self.teacher_availability, self.teachers = store.load_teachers(self.days)
+        self.students = Roster()
+        self.schedule = None
+        self.update_gui_from_data()
+        self.schedule_document.clear()
+        self.student_pages = store.iter_student_pages(STUDENT_PAGE_SIZE)
+        self.load_student_page(self.student_pages, store.count_students())
+
+    def load_student_page(self, pages, total):
+        if pages is not self.student_pages:
+            return  # another file was opened meanwhile
+        page = next(pages, None)
+        if page:
+            self.student_model.append_students(page)
+            self.statusBar().showMessage(f"Loading students {len(self.students)}/{total}")
+            QTimer.singleShot(0, lambda: self.load_student_page(pages, total))
+            return
+
+        self.student_pages = None
+        self.schedule = self.store.load_schedule(self.students, self.days)
+        if self.schedule is None:
+            self.schedule = self.cached_schedule()
+        if self.schedule is not None:
+            self.display_loaded_schedule(self.schedule)
+        self.statusBar().showMessage(f"Data loaded from {self.store.file_path}", 2000)
+
     def display_loaded_schedule(self, schedule):
-        self.schedule_text.clear()
-        self.schedule_text.append("Weekly Schedule:")
-        for day, classes in schedule.items():
-            self.schedule_text.append(f"\n{day}:")
-            if not classes:
-                self.schedule_text.append("  No classes scheduled")
-            for class_info in classes:
-                start_time = class_info['time']
-                end_time = self.add_hour_to_time(start_time)
-                self.schedule_text.append(f"  {start_time} - {end_time}: {class_info['level']} Class")
-                self.schedule_text.append(f"    Students: {', '.join(class_info['students'])}")
+        self._display_scheduled_classes(schedule)
+        self.schedule_document.setPlainText("\n".join(self.schedule_summary(schedule)))
 
     def update_gui_from_data(self):
-        teacher_layout = self.teacher_widget.layout()
-        scroll_area = teacher_layout.itemAt(0).widget()
-        scroll_widget = scroll_area.widget()
-        grid_layout = scroll_widget.layout()
-
-        for col, day in enumerate(self.days):
-            for row, time_str in enumerate(self.get_time_slots()):
-                btn = grid_layout.itemAtPosition(row + 1, col + 1).widget()
-                if btn:
-                    btn.setChecked(time_str in self.teacher_availability[day])
-
-        self.student_listbox.clear()
-        for student in self.students:
-            self.student_listbox.addItem(f"{student.name} - {student.level} {'(Twice Weekly)' if student.twice_weekly else ''}")
+        with profiler.span('gui.populate'):
+            if TEACHER_TAB in self.built_tabs:
+                self.teacher_grid.set_availability(self.teacher_availability)
+            self._display_scheduled_classes(self.schedule or {})
+            self.update_student_listbox()
 
-        self.reset_student_availability()
-        
-        if self.selected_student:
-            self.student_availability = self.selected_student.availability.copy()
-            self.update_availability_ui()
+            self.reset_student_availability()
+
+            if self.selected_student:
+                self.student_availability = self.selected_student.availability.copy()
+                self.update_availability_ui()
 
     def is_duplicate_name(self, name):
-        return any(student.name.lower() == name.lower() for student in self.students if student != self.selected_student)
+        return self.students.has_name(name, exclude=self.selected_student)
 
     def is_duplicate_name_strict(self, name):
-        return any(student.name.lower() == name.lower() for student in self.students)
-
-def main():
-    app = QApplication(sys.argv)
-    window = AcademySchedulerGUI()
-    window.show()
-    sys.exit(app.exec())
+        return self.students.has_name(name)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Academy Scheduler")
+    parser.add_argument('--profile', nargs='?', const=True, metavar='FILE',
+                        help="print a per-phase timing report on exit; with FILE, also write cProfile data there")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="open the window, print how long startup took and exit")
+    args, qt_args = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    profiler.configure(args.profile)
+    started = time.perf_counter()
+    app = QApplication(sys.argv[:1] + qt_args)
+    with profiler.span('gui.startup'):
+        window = AcademySchedulerGUI()
+        window.show()
+        app.processEvents()
+    if args.startup_time:
+        shown = time.perf_counter()
+        print(f"Startup: imports {(started - IMPORT_STARTED) * 1000:.0f} ms, window {(shown - started) * 1000:.0f} ms, "
+              f"total {(shown - IMPORT_STARTED) * 1000:.0f} ms")
+        window.close()
+        sys.exit(0)
+    with profiler.profile_thread():
+        status = app.exec()
+    profiler.dump()
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
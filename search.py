@@ -0,0 +1,155 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from engine import DAYS, ScheduleCancelled, ScheduleEngine
+from exact import ExactScheduleEngine
+from profiling import profiler
+
+def propose_move(rng, problem, slot_level, open_slots):
+    # Returns {slot: new level or None}, or None when the drawn move does not apply
+    t = rng.choice(open_slots)
+    current = slot_level[t]
+    kind = rng.random()
+    if kind < 0.5:
+        # Teach another level in this slot, or drop the class so its students merge elsewhere
+        choices = [k for k in problem.candidates[t] if k != current]
+        if current is not None:
+            choices.append(None)
+        return {t: rng.choice(choices)} if choices else None
+
+    other = rng.choice(open_slots)
+    other_level = slot_level[other]
+    if other == t or current is None or (kind < 0.75 and other_level is None):
+        return None
+    if kind < 0.75:
+        # Exchange the levels of two slots
+        if current in problem.candidates[other] and other_level in problem.candidates[t] and current != other_level:
+            return {t: other_level, other: current}
+        return None
+    # Move the class to a free slot, or split it by opening a second class of the same level
+    if other_level is None and current in problem.candidates[other]:
+        return {other: current} if rng.random() < 0.5 else {t: None, other: current}
+    return None
+
+def run_restart(problem, incumbent, seed, time_budget, iterations=None, started=None):
+    # One seeded annealing run over the level taught in each slot; after every move the
+    # per-level max flow re-seats the affected students, which covers moving students between
+    # classes of the same level. Returns (best value, best assignment, improvement history).
+    rng = random.Random(seed)
+    started = time.time() if started is None else started
+    deadline = time.time() + time_budget
+
+    slot_level = [None] * len(problem.candidates)
+    level_slots = [set(class_slots) for class_slots in incumbent]
+    for k, class_slots in enumerate(level_slots):
+        for t in class_slots:
+            slot_level[t] = k
+    values = [problem.solve_level(k, class_slots) for k, class_slots in enumerate(level_slots)]
+    value = best_value = sum(values)
+    best_assignment = [sorted(class_slots) for class_slots in level_slots]
+    history = [(time.time() - started, best_value)]
+
+    open_slots = [t for t, levels in enumerate(problem.candidates) if levels]
+    bound = problem.upper_bound()
+    step = 0
+    while open_slots and best_value < bound and (iterations is None or step < iterations):
+        if time.time() > deadline:
+            break
+        temperature = 1.0 / (1 + step / 200)
+        step += 1
+        move = propose_move(rng, problem, slot_level, open_slots)
+        if move is None:
+            continue
+
+        changed = {}
+        for t, k in move.items():
+            for level in (slot_level[t], k):
+                if level is not None and level not in changed:
+                    changed[level] = set(level_slots[level])
+        for t, k in move.items():
+            if slot_level[t] is not None:
+                changed[slot_level[t]].discard(t)
+            if k is not None:
+                changed[k].add(t)
+        new_values = {k: problem.solve_level(k, class_slots) for k, class_slots in changed.items()}
+        if None in new_values.values():
+            continue
+        delta = sum(new_values[k] - values[k] for k in changed)
+        if delta < 0 and rng.random() >= math.exp(delta / temperature):
+            continue
+
+        for t, k in move.items():
+            slot_level[t] = k
+        for k, class_slots in changed.items():
+            level_slots[k] = class_slots
+            values[k] = new_values[k]
+        value += delta
+        if value > best_value:
+            best_value = value
+            best_assignment = [sorted(class_slots) for class_slots in level_slots]
+            history.append((time.time() - started, best_value))
+    return best_value, best_assignment, history
+
+class LocalSearchScheduleEngine(ExactScheduleEngine):
+    def __init__(self, teacher_availability, students, days=DAYS, time_limit=10.0, restarts=4, seed=0,
+                 iterations=None, jobs=None, teachers=None):
+        if teachers:
+            raise ValueError("The local search engine schedules a single teacher")
+        ScheduleEngine.__init__(self, teacher_availability, students, days)
+        self.time_limit = time_limit
+        self.restarts = max(1, restarts)
+        self.seed = seed
+        # With an iteration cap the result depends only on the seed, as long as the deadline is not hit
+        self.iterations = iterations
+        self.jobs = jobs
+        self.optimal = False
+        self.placed_sessions = 0
+        self.history = []
+
+    def create_optimal_schedule(self):
+        slots = self.get_class_slots()
+        # Every restart starts from the greedy schedule, so the result is never worse than greedy
+        greedy_schedule = ScheduleEngine(self.teacher_availability, self.students, self.days).create_optimal_schedule()
+        students_by_level = self.group_students_by_level()
+        self.prepare_problem(students_by_level, slots)
+        incumbent = self.assignment_from_schedule(greedy_schedule, slots)
+
+        started = time.time()
+        workers = 1 if self.jobs == 1 else min(self.restarts, self.jobs or os.cpu_count() or 1)
+        # Restarts that do not get a worker of their own share the time limit with the ones before them
+        time_budget = self.time_limit / math.ceil(self.restarts / workers)
+        seeds = [f"{self.seed}-{r}" for r in range(self.restarts)]
+        with profiler.span('engine.search'):
+            results = self.run_restarts(incumbent, seeds, workers, time_budget, started)
+
+        # Ties go to the lowest restart so the choice does not depend on which worker finished first
+        self.best_value, self.best_assignment, _ = max(results, key=lambda result: result[0])
+        self.history = []
+        for elapsed, value in sorted(entry for _, _, history in results for entry in history):
+            if not self.history or value > self.history[-1][1]:
+                self.history.append((elapsed, value))
+        self.optimal = self.best_value >= self.problem.upper_bound()
+        self.placed_sessions = self.best_value
+        return self.build_schedule(slots)
+
+    def run_restarts(self, incumbent, seeds, workers, time_budget, started):
+        if workers == 1:
+            results = []
+            for r, seed in enumerate(seeds):
+                self.checkpoint(r, self.restarts)
+                results.append(run_restart(self.problem, incumbent, seed, time_budget, self.iterations, started))
+            return results
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_restart, self.problem, incumbent, seed, time_budget,
+                                       self.iterations, started) for seed in seeds]
+            try:
+                for done, _ in enumerate(as_completed(futures), start=1):
+                    self.checkpoint(done, self.restarts)
+            except ScheduleCancelled:
+                # Restarts already running finish within their time budget
+                for future in futures:
+                    future.cancel()
+                raise
+            return [future.result() for future in futures]
@@ -0,0 +1,127 @@
+import os
+import json
+import shutil
+import tempfile
+from availability import Availability, as_availability
+from engine import DAYS, Student, Teacher
+from profiling import profiler
+from roster import Roster
+
+def student_to_data(student):
+    return {
+        'name': student.name,
+        'level': student.level,
+        'availability': student.availability.to_data(),
+        'twice_weekly': student.twice_weekly
+    }
+
+def student_from_data(data):
+    # Availability is stored as one slot bitmask per day; older files list "HH:MM" strings
+    return Student(data['name'], data['level'], Availability(data['availability']), data['twice_weekly'])
+
+def teacher_availability_from_data(data, days=DAYS):
+    return Availability({day: data.get(day, 0) for day in days})
+
+def teacher_to_data(teacher):
+    return {
+        'name': teacher.name,
+        'availability': teacher.availability.to_data(),
+        'levels': sorted(teacher.levels) if teacher.levels is not None else None
+    }
+
+def teacher_from_data(data):
+    return Teacher(data['name'], Availability(data['availability']), data.get('levels'))
+
+def class_to_data(class_info):
+    data = {
+        'time': class_info['time'],
+        'level': class_info['level'],
+        'students': [s.name for s in class_info['students']]
+    }
+    if 'teacher' in class_info:
+        data['teacher'] = class_info['teacher']
+    return data
+
+def schedule_to_data(schedule):
+    return {day: [class_to_data(class_info) for class_info in classes] for day, classes in schedule.items()}
+
+def schedule_from_data(data, students, days=DAYS):
+    # Saved schedules refer to students by name; names that no longer exist are dropped
+    by_name = {s.name: s for s in students}
+    for student in students:
+        student.scheduled_days = 0
+    schedule = {day: [] for day in days}
+    for day, classes in data.items():
+        if day not in schedule:
+            continue
+        for class_info in classes:
+            members = [by_name[name] for name in class_info['students'] if name in by_name]
+            for student in members:
+                student.scheduled_days += 1
+            loaded = {'time': class_info['time'], 'level': class_info['level'], 'students': members}
+            if 'teacher' in class_info:
+                loaded['teacher'] = class_info['teacher']
+            schedule[day].append(loaded)
+    return schedule
+
+def build_data(teacher_availability, students, generated_schedule, teachers=()):
+    data = {
+        'teacher_availability': as_availability(teacher_availability).to_data(),
+        'students': [student_to_data(s) for s in students],
+        'generated_schedule': generated_schedule
+    }
+    # Files with a single teacher keep the original layout
+    if teachers:
+        data['teachers'] = [teacher_to_data(t) for t in teachers]
+    return data
+
+def load_file(file_path, days=DAYS):
+    with profiler.span('storage.load'):
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+        teacher_availability = teacher_availability_from_data(data['teacher_availability'], days)
+        students = Roster(student_from_data(s) for s in data['students'])
+        teachers = [teacher_from_data(t) for t in data.get('teachers', [])]
+    return teacher_availability, students, data.get('generated_schedule'), teachers
+
+def save_file(file_path, data):
+    # Written to a temporary file next to the target and renamed over it, so a crash or a full
+    # disk never leaves a half-written file behind
+    with profiler.span('storage.save'):
+        write_file(file_path, data)
+
+def write_file(file_path, data):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix='.tmp', dir=directory)
+    try:
+        f = open(fd, 'w')
+    except BaseException:
+        os.close(fd)
+        os.remove(temp_path)
+        raise
+    try:
+        with f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def snapshot_path(file_path, number):
+    return f"{file_path}.{number}"
+
+def rotate_snapshots(file_path, count):
+    # Keeps the previous `count` versions as file.json.1 (newest) .. file.json.<count> (oldest)
+    if count <= 0 or not os.path.exists(file_path):
+        return
+    for number in range(count - 1, 0, -1):
+        if os.path.exists(snapshot_path(file_path, number)):
+            os.replace(snapshot_path(file_path, number), snapshot_path(file_path, number + 1))
+    shutil.copy2(file_path, snapshot_path(file_path, 1))
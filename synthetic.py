@@ -0,0 +1,74 @@
+import sys
+import random
+import argparse
+from availability import SLOT_COUNT, SLOT_INDEX, Availability
+from engine import DAYS, LEVELS, Student, Teacher
+from roster import Roster
+from storage import build_data, save_file
+
+# Students pick their availability from 12:00 onwards, like the GUI's student grid
+STUDENT_FIRST_SLOT = SLOT_INDEX["12:00"]
+
+def block_mask(rng, first_slot, min_slots, max_slots):
+    # One contiguous run of slots, the way people usually give their free time
+    length = rng.randint(min_slots, max_slots)
+    start = rng.randint(first_slot, SLOT_COUNT - length)
+    return ((1 << length) - 1) << start
+
+def random_availability(rng, days, density, first_slot=0, min_slots=2, max_slots=6):
+    # Each day is free with probability density, as one block of min_slots..max_slots slots
+    return Availability({day: block_mask(rng, first_slot, min_slots, max_slots) if rng.random() < density else 0
+                         for day in days})
+
+def generate_roster(count, seed=0, days=DAYS, levels=LEVELS, level_weights=None, twice_weekly_ratio=0.3,
+                    density=0.5, teacher_density=1.0, teachers=0):
+    # A reproducible (teacher_availability, students, teachers) set: the same arguments always
+    # give the same roster. level_weights lines up with levels; None means an even mix.
+    rng = random.Random(seed)
+    days = list(days)
+    teacher_availability = random_availability(rng, days, teacher_density, min_slots=SLOT_COUNT // 2,
+                                               max_slots=SLOT_COUNT)
+    teacher_list = [Teacher(f"Teacher {i}", random_availability(rng, days, teacher_density, min_slots=SLOT_COUNT // 2,
+                                                                max_slots=SLOT_COUNT))
+                    for i in range(teachers)]
+    student_levels = rng.choices(levels, weights=level_weights, k=count)
+    students = Roster()
+    for i, level in enumerate(student_levels):
+        availability = random_availability(rng, days, density, STUDENT_FIRST_SLOT)
+        students.append(Student(f"Student {i}", level, availability, rng.random() < twice_weekly_ratio))
+    return teacher_availability, students, teacher_list
+
+def parse_level_weights(text):
+    # "Kids I=3,Teens I=1" -> (levels, weights)
+    levels, weights = [], []
+    for part in text.split(','):
+        level, _, weight = part.partition('=')
+        levels.append(level.strip())
+        weights.append(float(weight) if weight else 1.0)
+    return levels, weights
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Write a reproducible synthetic Academy Scheduler data file.")
+    parser.add_argument('output', help="JSON file to write")
+    parser.add_argument('-n', '--students', type=int, default=500, help="number of students")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--levels', type=parse_level_weights, default=None,
+                        help="level mix as 'Level=weight,...' (default: every level, evenly)")
+    parser.add_argument('--twice-weekly', type=float, default=0.3, help="share of twice-weekly students")
+    parser.add_argument('--density', type=float, default=0.5, help="chance a student is free on a given day")
+    parser.add_argument('--teacher-density', type=float, default=1.0, help="chance the academy is open on a given day")
+    parser.add_argument('--teachers', type=int, default=0, help="named teachers to generate (default: one academy-wide)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    levels, weights = args.levels or (LEVELS, None)
+    teacher_availability, students, teachers = generate_roster(
+        args.students, args.seed, levels=levels, level_weights=weights, twice_weekly_ratio=args.twice_weekly,
+        density=args.density, teacher_density=args.teacher_density, teachers=args.teachers)
+    save_file(args.output, build_data(teacher_availability, students, None, teachers))
+    print(f"wrote {len(students)} students to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
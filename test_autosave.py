@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import storage
+from autosave import AutoSaver
+from storage import save_file, snapshot_path
+
+
+class TestAtomicSave(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "branch.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_failed_write_keeps_previous_file(self):
+        save_file(self.file_path, {'version': 1})
+        with patch.object(storage.json, 'dump', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                save_file(self.file_path, {'version': 2})
+        with open(self.file_path) as f:
+            self.assertEqual(json.load(f), {'version': 1})
+        self.assertEqual(os.listdir(self.tmp_dir), ["branch.json"])
+
+    def test_autosaver_rotates_snapshots(self):
+        saver = AutoSaver(snapshots=2)
+        for version in range(1, 5):
+            saver.submit(self.file_path, {'version': version})
+            self.assertTrue(saver.flush(5))
+        saver.close(5)
+
+        versions = {}
+        for path in (self.file_path, snapshot_path(self.file_path, 1), snapshot_path(self.file_path, 2)):
+            with open(path) as f:
+                versions[os.path.basename(path)] = json.load(f)['version']
+        self.assertEqual(versions, {"branch.json": 4, "branch.json.1": 3, "branch.json.2": 2})
+        self.assertFalse(os.path.exists(snapshot_path(self.file_path, 3)))
+
+    def test_autosaver_coalesces_pending_snapshots(self):
+        saver = AutoSaver(snapshots=0)
+        release = threading.Event()
+        original = storage.rotate_snapshots
+
+        def slow_rotate(*args):
+            release.wait(5)
+            original(*args)
+
+        with patch('storage.rotate_snapshots', slow_rotate):
+            saver.submit(self.file_path, {'version': 1})
+            for version in range(2, 6):
+                saver.submit(self.file_path, {'version': version})
+            release.set()
+            self.assertTrue(saver.flush(5))
+        saver.close(5)
+
+        self.assertLessEqual(saver.saved_count, 2)
+        with open(self.file_path) as f:
+            self.assertEqual(json.load(f), {'version': 5})
+
+    def test_autosaver_reports_errors(self):
+        saver = AutoSaver()
+        saver.submit(os.path.join(self.tmp_dir, "missing", "branch.json"), {})
+        saver.flush(5)
+        saver.close(5)
+        self.assertIsInstance(saver.last_error, OSError)
+        with self.assertRaises(RuntimeError):
+            saver.submit(self.file_path, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import pickle
+import unittest
+
+from availability import (END_TIMES, SLOT_TIMES, STUDENT_SLOT_TIMES, Availability, class_start_slots, class_window,
+                          mask_to_times, slot_index, time_bit, times_to_mask)
+
+
+class TestAvailability(unittest.TestCase):
+
+    def test_times_round_trip_through_mask(self):
+        times = ["09:00", "10:00", "21:30"]
+        mask = times_to_mask(times)
+        self.assertEqual(mask, time_bit("09:00") | time_bit("10:00") | time_bit("21:30"))
+        self.assertEqual(mask_to_times(mask), times)
+
+    def test_unknown_time_is_rejected(self):
+        with self.assertRaises(ValueError):
+            time_bit("07:15")
+
+    def test_class_window(self):
+        self.assertEqual(class_window("09:00"), time_bit("09:00") | time_bit("10:00"))
+        # The last hour of the grid has no slot one hour later
+        self.assertEqual(class_window(SLOT_TIMES[-1]), 0)
+        self.assertEqual(class_window(SLOT_TIMES[-2]), 0)
+
+    def test_slot_table(self):
+        self.assertEqual(SLOT_TIMES[0], "08:00")
+        self.assertEqual(SLOT_TIMES[-1], "21:30")
+        self.assertEqual(STUDENT_SLOT_TIMES[0], "12:00")
+        self.assertEqual(slot_index("12:30"), 9)
+        self.assertEqual(END_TIMES["09:30"], "10:30")
+        self.assertEqual(END_TIMES["21:30"], "22:30")
+
+    def test_class_start_slots(self):
+        mask = times_to_mask(["09:00", "09:30", "10:00", "10:30", "15:00", "16:00"])
+        self.assertEqual([SLOT_TIMES[i] for i in class_start_slots(mask)], ["09:00", "09:30", "15:00"])
+        self.assertEqual(class_start_slots(0), ())
+
+    def test_day_view_behaves_like_a_set(self):
+        availability = Availability({"Monday": {"09:00"}})
+        availability["Monday"].add("09:30")
+        availability["Tuesday"].add("14:00")
+        self.assertIn("09:30", availability["Monday"])
+        self.assertEqual(list(availability["Monday"]), ["09:00", "09:30"])
+        self.assertEqual(len(availability["Monday"]), 2)
+
+        availability["Monday"].remove("09:00")
+        self.assertNotIn("09:00", availability["Monday"])
+        with self.assertRaises(KeyError):
+            availability["Monday"].remove("09:00")
+
+        self.assertEqual(availability, {"Monday": {"09:30"}, "Tuesday": {"14:00"}})
+        self.assertFalse(Availability({"Monday": []})["Monday"])
+
+    def test_has_window(self):
+        availability = Availability({"Monday": ["09:00", "10:00"]})
+        self.assertTrue(availability.has_window("Monday", class_window("09:00")))
+        self.assertFalse(availability.has_window("Monday", class_window("09:30")))
+        self.assertFalse(availability.has_window("Tuesday", class_window("09:00")))
+        self.assertFalse(availability.has_window("Monday", 0))
+
+    def test_copy_is_independent(self):
+        availability = Availability({"Monday": ["09:00"]})
+        copy = availability.copy()
+        copy["Monday"].add("10:00")
+        self.assertNotIn("10:00", availability["Monday"])
+
+    def test_loads_masks_and_time_lists(self):
+        mask = times_to_mask(["12:00", "12:30"])
+        self.assertEqual(Availability({"Friday": mask}), Availability({"Friday": ["12:30", "12:00"]}))
+        self.assertEqual(Availability({"Friday": mask}).to_data(), {"Friday": mask})
+
+    def test_days_are_packed_without_overlap(self):
+        full = times_to_mask(SLOT_TIMES)
+        availability = Availability({"Monday": full, "Tuesday": 0})
+        availability["Wednesday"].add("21:30")
+        availability["Tuesday"].update(["08:00"])
+        availability["Monday"].discard("08:00")
+
+        self.assertEqual(availability.to_data(), {"Monday": full & ~time_bit("08:00"), "Tuesday": time_bit("08:00"),
+                                                  "Wednesday": time_bit("21:30")})
+        self.assertEqual(list(availability), ["Monday", "Tuesday", "Wednesday"])
+        self.assertEqual(availability.mask("Friday"), 0)
+        self.assertIs(Availability({"Monday": 1, "Tuesday": 2}).layout, Availability({"Monday": 4, "Tuesday": 0}).layout)
+        self.assertEqual(pickle.loads(pickle.dumps(availability)), availability)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+import cli
+from cache import CACHE_ENV, ScheduleCache, default_cache, schedule_key
+from engine import DAYS, ScheduleEngine, Teacher
+from storage import schedule_from_data, schedule_to_data
+from synthetic import generate_roster
+from test_support import describe
+
+
+class TestScheduleKey(unittest.TestCase):
+
+    def setUp(self):
+        self.teacher_availability, self.students, _ = generate_roster(40, seed=3)
+
+    def key(self, **changes):
+        arguments = dict(teacher_availability=self.teacher_availability, students=self.students, days=DAYS,
+                         engine_name='greedy')
+        arguments.update(changes)
+        return schedule_key(**arguments)
+
+    def test_equal_inputs_give_equal_keys(self):
+        teacher_availability, students, _ = generate_roster(40, seed=3)
+        self.assertEqual(self.key(), self.key(teacher_availability=teacher_availability, students=students))
+        self.assertEqual(self.key(), self.key(students=[s.copy() for s in self.students]))
+
+    def test_any_input_change_gives_a_new_key(self):
+        original = self.key()
+        student = self.students[5]
+        keys = set()
+        for attribute, value in (('name', "Someone Else"), ('level', "First"), ('twice_weekly', not student.twice_weekly)):
+            saved = getattr(student, attribute)
+            setattr(student, attribute, value)
+            keys.add(self.key())
+            setattr(student, attribute, saved)
+        self.assertEqual(self.key(), original)
+
+        availability = student.availability.copy()
+        student.availability.set_mask("Friday", student.availability.mask("Friday") ^ 1)
+        keys.add(self.key())
+        student.availability = availability
+
+        teacher_availability = self.teacher_availability.copy()
+        teacher_availability.set_mask("Monday", teacher_availability.mask("Monday") ^ 1 << 4)
+        keys.add(self.key(teacher_availability=teacher_availability))
+        keys.add(self.key(students=list(reversed(self.students))))
+        keys.add(self.key(students=self.students[:-1]))
+        keys.add(self.key(engine_name='vectorized'))
+        keys.add(self.key(options={'time_limit': 5}))
+        keys.add(self.key(teachers=[Teacher("Ana", self.teacher_availability)]))
+        keys.add(self.key(days=DAYS[:4]))
+        with patch('cache.CACHE_VERSION', 2):
+            keys.add(self.key())
+        self.assertEqual(len(keys), 12)
+        self.assertNotIn(original, keys)
+
+
+class TestScheduleCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = ScheduleCache(os.path.join(self.tmp_dir, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        teacher_availability, students, _ = generate_roster(60, seed=1)
+        schedule = ScheduleEngine(teacher_availability, students).create_optimal_schedule()
+        key = schedule_key(teacher_availability, students, DAYS, 'greedy')
+        self.assertIsNone(self.cache.get(key))
+        self.assertTrue(self.cache.put(key, schedule_to_data(schedule), 'greedy'))
+        restored = schedule_from_data(self.cache.get(key), students)
+        self.assertEqual(describe(restored), describe(schedule))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        data = {"Monday": [{"time": "10:00", "level": "Kids I", "students": ["x" * 100]}]}
+        for key in ("a", "b", "c"):
+            self.cache.put(key, data)
+        entry_size = self.cache.size() // 3
+        for age, key in enumerate(("a", "b", "c")):
+            os.utime(self.cache.path(key), (1000 + age, 1000 + age))
+        self.assertIsNotNone(self.cache.get("a"))  # now the most recently used
+
+        self.cache.max_bytes = entry_size * 3
+        self.cache.put("d", data)
+        self.assertEqual({key: self.cache.get(key) is not None for key in "abcd"},
+                         {"a": True, "b": False, "c": True, "d": True})
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+
+    def test_damaged_entries_are_misses(self):
+        self.cache.put("a", {})
+        with open(self.cache.path("a"), "w") as f:
+            f.write("{not json")
+        self.assertIsNone(self.cache.get("a"))
+        self.assertFalse(os.path.exists(self.cache.path("a")))
+
+        # An entry renamed to another key does not answer for it
+        self.cache.put("b", {})
+        os.rename(self.cache.path("b"), self.cache.path("c"))
+        self.assertIsNone(self.cache.get("c"))
+
+    def test_unwritable_directory_is_not_an_error(self):
+        blocker = os.path.join(self.tmp_dir, "file")
+        open(blocker, "w").close()
+        self.assertFalse(ScheduleCache(os.path.join(blocker, "cache")).put("a", {}))
+
+    def test_environment_chooses_or_disables_the_cache(self):
+        with patch.dict(os.environ, {CACHE_ENV: self.tmp_dir}):
+            self.assertEqual(default_cache().directory, self.tmp_dir)
+        for setting in ("0", "", "false", "No", "off"):
+            with patch.dict(os.environ, {CACHE_ENV: setting}):
+                self.assertIsNone(default_cache(), setting)
+
+    def test_command_line_reuses_cached_schedules(self):
+        file_path = os.path.join(self.tmp_dir, "branch.json")
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules", "with_schedule.json"),
+                    file_path)
+        first = cli.schedule_file(file_path, cache_dir=self.cache.directory)
+        second = cli.schedule_file(file_path, cache_dir=self.cache.directory)
+        self.assertEqual((first['cached'], second['cached']), (False, True))
+        self.assertEqual((first['classes'], first['placed']), (second['classes'], second['placed']))
+
+        with redirect_stdout(StringIO()) as out:
+            self.assertEqual(cli.main([file_path, "--cache", self.cache.directory]), 0)
+        self.assertIn("1 of 1 schedules reused from the cache", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from database import SQLiteStore, is_database_path
+from engine import DAYS, ScheduleEngine, Student, Teacher
+from storage import load_file
+from test_support import describe
+
+
+class TestSQLiteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "academy.db")
+        schedules_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules")
+        self.teacher_availability, self.students, _, _ = load_file(os.path.join(schedules_dir, "with_schedule.json"))
+        self.schedule = ScheduleEngine(self.teacher_availability, self.students).create_optimal_schedule()
+        self.store = SQLiteStore(self.file_path)
+        self.store.save_all(self.teacher_availability, self.students, self.schedule)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def reopen(self):
+        self.store.close()
+        self.store = SQLiteStore(self.file_path)
+        teacher_availability, teachers = self.store.load_teachers()
+        students = self.store.load_students()
+        return teacher_availability, students, self.store.load_schedule(students), teachers
+
+    def test_round_trip(self):
+        teacher_availability, students, schedule, teachers = self.reopen()
+
+        self.assertEqual(teacher_availability, self.teacher_availability)
+        self.assertEqual(teachers, [])
+        self.assertEqual([(s.name, s.level, s.twice_weekly) for s in students],
+                         [(s.name, s.level, s.twice_weekly) for s in self.students])
+        self.assertEqual([s.availability for s in students], [s.availability for s in self.students])
+        self.assertEqual(describe(schedule), describe(self.schedule))
+        self.assertEqual([s.scheduled_days for s in students], [s.scheduled_days for s in self.students])
+
+    def test_pages_cover_roster_in_order(self):
+        pages = list(self.store.iter_student_pages(page_size=7))
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 7, 2])
+        self.assertEqual([s.name for page in pages for s in page], [s.name for s in self.students])
+        self.assertEqual(self.store.count_students(), 30)
+
+    def test_students_saved_while_paging_are_not_read_back(self):
+        pages = self.store.iter_student_pages(page_size=7)
+        loaded = list(next(pages))
+        added = Student("New", "Kids I", {"Monday": {"12:00"}}, False)
+        self.store.save_student(added)
+        loaded.extend(student for page in pages for student in page)
+        self.assertEqual([s.name for s in loaded], [s.name for s in self.students])
+        self.assertEqual(self.store.count_students(), 31)
+
+    def test_student_edits_write_only_their_rows(self):
+        student = self.students[0]
+        student.level = "Teens III"
+        student.availability["Friday"].add("15:00")
+        before = self.store.connection.total_changes
+        self.store.save_student(student)
+        # One student row, then its availability rows replaced
+        self.assertEqual(self.store.connection.total_changes - before, 1 + 2 * len(student.availability))
+
+        added = Student("New", "Kids I", {"Monday": {"12:00"}}, False)
+        self.store.save_student(added)
+        removed = self.students[1]
+        self.store.delete_student(removed)
+
+        _, students, schedule, _ = self.reopen()
+        self.assertEqual(students[0].level, "Teens III")
+        self.assertIn("15:00", students[0].availability["Friday"])
+        self.assertEqual(students[-1].name, "New")
+        self.assertNotIn(removed.name, [s.name for s in students])
+        self.assertNotIn(removed.name, [s.name for classes in schedule.values() for c in classes for s in c['students']])
+
+    def test_schedule_is_replaced_per_day(self):
+        monday = self.schedule["Monday"]
+        self.schedule["Monday"] = monday[1:]
+        self.store.save_schedule(self.schedule, ["Monday"])
+        _, _, schedule, _ = self.reopen()
+        self.assertEqual(describe(schedule)["Monday"], describe(self.schedule)["Monday"])
+        self.assertEqual(describe(schedule)["Tuesday"], describe(self.schedule)["Tuesday"])
+
+        self.store.save_schedule(None)
+        self.assertIsNone(self.reopen()[2])
+
+    def test_teachers_and_teacher_days(self):
+        teachers = [Teacher("Ana", {"Monday": {"09:00"}}), Teacher("Raj", {"Tuesday": {"10:00"}}, ["Teens I"])]
+        self.store.save_all(self.teacher_availability, self.students, None, teachers)
+        self.store.save_teacher_day("Monday", 0)
+
+        teacher_availability, _, schedule, loaded = self.reopen()
+        self.assertIsNone(schedule)
+        self.assertEqual(teacher_availability.mask("Monday"), 0)
+        self.assertEqual(set(teacher_availability), set(DAYS))
+        self.assertEqual([(t.name, t.levels) for t in loaded], [("Ana", None), ("Raj", {"Teens I"})])
+        self.assertIn("10:00", loaded[1].availability["Tuesday"])
+
+    def test_is_database_path(self):
+        self.assertTrue(is_database_path("branch.db"))
+        self.assertTrue(is_database_path("branch.SQLITE"))
+        self.assertFalse(is_database_path("branch.json"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,251 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+
+from engine import DAYS, Student, Teacher, ScheduleCancelled, ScheduleEngine, create_engine
+from repair import ScheduleRepair
+from roster import Roster
+from storage import build_data, load_file, save_file, schedule_to_data
+import cli
+
+
+def make_students(level, count, day="Monday", times=("09:00", "10:00"), twice_weekly=False, prefix="S"):
+    return [Student(f"{prefix}{i}", level, {day: set(times)}, twice_weekly) for i in range(count)]
+
+
+class TestScheduleEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.teacher_availability = {day: set() for day in DAYS}
+        self.teacher_availability["Monday"].update(["09:00", "10:00", "11:00"])
+
+    def test_engine_does_not_import_qt(self):
+        code = "import sys, engine, storage, cli; sys.exit('PyQt6' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__))).returncode, 0)
+
+    def test_create_optimal_schedule(self):
+        students = make_students("Kids I", 4)
+        engine = ScheduleEngine(self.teacher_availability, students)
+        schedule = engine.create_optimal_schedule()
+
+        self.assertEqual(set(schedule.keys()), set(DAYS))
+        self.assertEqual(len(schedule["Monday"]), 1)
+        self.assertEqual(schedule["Monday"][0]["time"], "09:00")
+        self.assertEqual(schedule["Monday"][0]["level"], "Kids I")
+        self.assertEqual(len(schedule["Monday"][0]["students"]), 4)
+        self.assertEqual(engine.get_unscheduled_students(schedule), {})
+
+    def test_class_size_is_capped(self):
+        students = make_students("Kids I", 9)
+        engine = ScheduleEngine(self.teacher_availability, students)
+        schedule = engine.create_optimal_schedule()
+
+        self.assertEqual(len(schedule["Monday"][0]["students"]), 7)
+        unscheduled = engine.get_unscheduled_students(schedule)
+        self.assertEqual(len(unscheduled["Kids I"]), 2)
+        for student, reason in unscheduled["Kids I"]:
+            self.assertEqual(reason, "Class was full")
+
+    def test_twice_weekly_students_need_matching_availability(self):
+        students = make_students("Kids I", 3, twice_weekly=True)
+        students.append(Student("Late", "Kids I", {"Monday": {"15:00", "16:00"}}, True))
+        engine = ScheduleEngine(self.teacher_availability, students)
+
+        available = engine.get_available_students(students, "Monday", "09:00", "10:00")
+        self.assertEqual(available, students[:3])
+
+    def test_too_few_students(self):
+        students = make_students("Kids I", 2)
+        engine = ScheduleEngine(self.teacher_availability, students)
+        schedule = engine.create_optimal_schedule()
+
+        self.assertEqual(sum(len(classes) for classes in schedule.values()), 0)
+        unscheduled = engine.get_unscheduled_students(schedule)
+        self.assertEqual([reason for _, reason in unscheduled["Kids I"]], ["No matching class times"] * 2)
+
+    def test_student_records_are_compact(self):
+        # Levels read from a file are separate string objects until interned
+        first, second = (Student(name, "".join(["Kids", " I"]), {}, False) for name in ("A", "B"))
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.level, second.level)
+        with self.assertRaises(AttributeError):
+            first.nickname = "K"
+
+    def test_scheduling_report(self):
+        students = make_students("Kids I", 9)
+        students.insert(0, Student("Twice", "Kids I", {"Monday": {"09:00", "10:00"}, "Tuesday": {"09:00", "10:00"}}, True))
+        students.append(Student("Nowhere", "Kids I", {}, False))
+        engine = ScheduleEngine(self.teacher_availability, students)
+        schedule = engine.create_optimal_schedule()
+
+        report = {entry["name"]: entry for entry in engine.get_scheduling_report(schedule)}
+        self.assertEqual(len(report), 11)
+        self.assertEqual(report["S0"], {"name": "S0", "level": "Kids I", "status": "scheduled", "sessions": 1,
+                                        "required": 1, "days": ["Monday"], "reason": None, "message": None})
+        self.assertEqual([report[f"S{i}"]["reason"] for i in (6, 7, 8)], ["class-full"] * 3)
+        self.assertEqual(report["Nowhere"]["reason"], "no-availability")
+        self.assertEqual((report["Twice"]["status"], report["Twice"]["reason"]), ("partial", "no-second-time"))
+        self.assertEqual(engine.get_student_scheduling_status(students[0], schedule), "No matching time for second class")
+        json.dumps(report)
+
+    def test_progress_and_cancellation(self):
+        engine = ScheduleEngine(self.teacher_availability, make_students("Kids I", 4))
+        progress = []
+        engine.progress = lambda done, total: progress.append((done, total))
+        engine.create_optimal_schedule()
+        self.assertEqual(progress, [(0, 2), (1, 2)])
+
+        for name, options in (('greedy', {}), ('local', {'jobs': 1})):
+            engine = create_engine(self.teacher_availability, make_students("Kids I", 4), name=name, **options)
+            engine.cancel_event = threading.Event()
+            engine.cancel_event.set()
+            with self.assertRaises(ScheduleCancelled):
+                engine.create_optimal_schedule()
+
+    def test_copies_do_not_share_availability(self):
+        student = Student("A", "Kids I", {"Monday": {"09:00"}}, True)
+        copy = student.copy()
+        copy.availability["Monday"].add("10:00")
+        self.assertEqual(student.availability["Monday"], {"09:00"})
+        self.assertEqual((copy.name, copy.level, copy.twice_weekly), ("A", "Kids I", True))
+
+
+class TestMultipleTeachers(unittest.TestCase):
+
+    def setUp(self):
+        self.teachers = [
+            Teacher("Ana", {"Monday": {"09:00", "10:00"}}),
+            Teacher("Raj", {"Monday": {"09:00", "10:00"}}, levels=["Teens I"]),
+        ]
+        self.students = make_students("Kids I", 3, prefix="K") + make_students("Teens I", 3, prefix="T")
+
+    def test_parallel_classes_in_one_slot(self):
+        engine = ScheduleEngine({}, self.students, teachers=self.teachers)
+        schedule = engine.create_optimal_schedule()
+
+        classes = {(c["time"], c["level"], c["teacher"]) for c in schedule["Monday"]}
+        self.assertEqual(classes, {("09:00", "Kids I", "Ana"), ("09:00", "Teens I", "Raj")})
+        self.assertEqual(engine.get_unscheduled_students(schedule), {})
+
+    def test_teacher_levels_are_respected(self):
+        students = make_students("Kids I", 6, prefix="K")
+        engine = ScheduleEngine({}, students, teachers=self.teachers)
+        schedule = engine.create_optimal_schedule()
+
+        self.assertEqual([c["teacher"] for c in schedule["Monday"]], ["Ana"])
+        self.assertEqual(len(schedule["Monday"][0]["students"]), 6)
+
+    def test_single_teacher_schedule_has_no_teacher_key(self):
+        teacher_availability = {day: set() for day in DAYS}
+        teacher_availability["Monday"].update(["09:00", "10:00"])
+        schedule = ScheduleEngine(teacher_availability, self.students).create_optimal_schedule()
+        self.assertEqual(len(schedule["Monday"]), 1)
+        self.assertNotIn("teacher", schedule["Monday"][0])
+
+    def test_repair_opens_class_with_free_teacher(self):
+        students = Roster(self.students[:3])
+        engine = ScheduleEngine({}, students, teachers=self.teachers)
+        schedule = engine.create_optimal_schedule()
+        for student in self.students[3:]:
+            students.append(student)
+            ScheduleRepair(engine, schedule).add_student(student)
+
+        self.assertEqual({(c["level"], c["teacher"]) for c in schedule["Monday"]},
+                         {("Kids I", "Ana"), ("Teens I", "Raj")})
+
+    def test_teachers_round_trip_through_file(self):
+        schedule = ScheduleEngine({}, self.students, teachers=self.teachers).create_optimal_schedule()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "teachers.json")
+            save_file(file_path, build_data({}, self.students, schedule_to_data(schedule), self.teachers))
+            _, _, generated_schedule, teachers = load_file(file_path)
+
+        self.assertEqual([(t.name, t.levels) for t in teachers], [("Ana", None), ("Raj", {"Teens I"})])
+        self.assertEqual(sorted(c["teacher"] for c in generated_schedule["Monday"]), ["Ana", "Raj"])
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "branch.json")
+        shutil.copy(os.path.join(os.path.dirname(__file__), "schedules", "with_schedule.json"), self.file_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_schedule_file_writes_result_next_to_input(self):
+        result = cli.schedule_file(self.file_path)
+
+        self.assertEqual(result["output"], os.path.join(self.tmp_dir, "branch.scheduled.json"))
+        self.assertEqual(result["students"], 30)
+        with open(result["output"]) as f:
+            data = json.load(f)
+        self.assertEqual(set(data["generated_schedule"].keys()), set(DAYS))
+        self.assertEqual(sum(len(c) for c in data["generated_schedule"].values()), result["classes"])
+
+        teacher_availability, students, _, _ = load_file(result["output"])
+        self.assertEqual(len(students), 30)
+
+    def test_rerun_with_report_skips_earlier_outputs(self):
+        for _ in range(2):
+            with redirect_stdout(StringIO()):
+                self.assertEqual(cli.main([self.tmp_dir, "--report", "-j", "1"]), 0)
+        self.assertEqual([os.path.basename(f) for f in cli.collect_files([self.tmp_dir])], ["branch.json"])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, "branch.report.json")))
+
+    def test_main_reports_missing_file(self):
+        missing = os.path.join(self.tmp_dir, "missing.json")
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()) as err:
+            self.assertEqual(cli.main([missing, self.file_path]), 1)
+        self.assertIn("missing.json", err.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, "branch.scheduled.json")))
+
+    def test_main_reports_malformed_file_and_continues(self):
+        with open(self.file_path) as f:
+            data = json.load(f)
+        data["students"][0]["availability"] = ["Monday"]
+        malformed = os.path.join(self.tmp_dir, "malformed.json")
+        with open(malformed, "w") as f:
+            json.dump(data, f)
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()) as err:
+            self.assertEqual(cli.main([malformed, self.file_path, "-j", "2"]), 1)
+        self.assertIn("malformed.json: error:", err.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, "branch.scheduled.json")))
+
+    def test_local_engine_with_iterations_is_reproducible(self):
+        outputs = []
+        for _ in range(2):
+            with redirect_stdout(StringIO()):
+                self.assertEqual(cli.main([self.file_path, "--engine", "local", "--seed", "3", "--restarts", "2",
+                                           "--iterations", "50", "--time-limit", "60", "-j", "1"]), 0)
+            with open(os.path.join(self.tmp_dir, "branch.scheduled.json")) as f:
+                outputs.append(json.load(f)["generated_schedule"])
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_batch_schedules_directory_in_worker_processes(self):
+        shutil.copy(self.file_path, os.path.join(self.tmp_dir, "second.json"))
+        cli.schedule_file(self.file_path)
+
+        files = cli.collect_files([self.tmp_dir])
+        self.assertEqual([os.path.basename(f) for f in files], ["branch.json", "second.json"])
+        results = cli.schedule_files(files, jobs=2)
+
+        self.assertEqual([r["file"] for r in results], files)
+        for result in results:
+            self.assertTrue(os.path.exists(result["output"]))
+            self.assertEqual(result["students"], 30)
+        summary = cli.format_summary(results)
+        self.assertIn("second.json", summary)
+        self.assertIn("Total (2/2 files)", summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import time
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from availability import class_window
+from engine import DAYS, MIN_CLASS_SIZE, MAX_CLASS_SIZE, Student, ScheduleEngine, create_engine
+from storage import load_file
+from exact import milp
+from test_support import random_roster
+
+
+def placed(schedule):
+    return sum(len(c['students']) for classes in schedule.values() for c in classes)
+
+
+class TestExactScheduleEngine(unittest.TestCase):
+
+    def assert_valid(self, teacher_availability, students, schedule):
+        sessions = Counter()
+        for day, classes in schedule.items():
+            times = [c['time'] for c in classes]
+            self.assertEqual(len(times), len(set(times)))
+            for c in classes:
+                self.assertTrue(MIN_CLASS_SIZE <= len(c['students']) <= MAX_CLASS_SIZE)
+                self.assertTrue(teacher_availability.has_window(day, class_window(c['time'])))
+                for s in c['students']:
+                    self.assertEqual(s.level, c['level'])
+                    self.assertTrue(s.availability.has_window(day, class_window(c['time'])))
+                    sessions[s.name] += 1
+        for s in students:
+            self.assertLessEqual(sessions[s.name], s.max_sessions)
+            self.assertEqual(sessions[s.name], s.scheduled_days)
+
+    def test_places_students_greedy_leaves_out(self):
+        # Greedy fills 09:00 with Kids I, leaving no slot for Kids II
+        teacher_availability = {day: set() for day in DAYS}
+        teacher_availability["Monday"].update(["09:00", "10:00", "11:00"])
+        students = [Student(f"A{i}", "Kids I", {"Monday": {"09:00", "10:00", "11:00"}}, False) for i in range(3)]
+        students += [Student(f"B{i}", "Kids II", {"Monday": {"09:00", "10:00"}}, False) for i in range(3)]
+
+        self.assertEqual(placed(ScheduleEngine(teacher_availability, students).create_optimal_schedule()), 3)
+        for backend in ('branch-and-bound', 'milp') if milp else ('branch-and-bound',):
+            with self.subTest(backend=backend):
+                engine = create_engine(teacher_availability, students, name='exact', backend=backend)
+                schedule = engine.create_optimal_schedule()
+                self.assertEqual(placed(schedule), 6)
+                self.assertTrue(engine.optimal)
+                self.assert_valid(engine.teacher_availability, students, schedule)
+
+    def test_backends_agree_on_saved_files(self):
+        if milp is None:
+            self.skipTest("scipy is not installed")
+        schedules_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules")
+        for name in sorted(os.listdir(schedules_dir)):
+            teacher_availability, students, _, _ = load_file(os.path.join(schedules_dir, name))
+            with self.subTest(file=name):
+                results = []
+                for backend in ('branch-and-bound', 'milp'):
+                    engine = create_engine(teacher_availability, students, name='exact', backend=backend)
+                    schedule = engine.create_optimal_schedule()
+                    self.assertTrue(engine.optimal)
+                    self.assert_valid(engine.teacher_availability, students, schedule)
+                    results.append(placed(schedule))
+                self.assertEqual(results[0], results[1])
+
+    def test_time_limit_returns_incumbent(self):
+        teacher_availability, students = random_roster(3, 300)
+        greedy = placed(ScheduleEngine(teacher_availability, students).create_optimal_schedule())
+        engine = create_engine(teacher_availability, students, name='exact', backend='branch-and-bound', time_limit=0.5)
+        start = time.monotonic()
+        schedule = engine.create_optimal_schedule()
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertGreaterEqual(placed(schedule), greedy)
+        self.assertEqual(placed(schedule), engine.placed_sessions)
+        self.assert_valid(engine.teacher_availability, students, schedule)
+
+    def test_time_limit_includes_setup(self):
+        teacher_availability = {"Monday": {"09:00", "10:00", "11:00"}}
+        students = [Student(f"A{i}", "Kids I", {"Monday": {"09:00", "10:00", "11:00"}}, False) for i in range(3)]
+        greedy = ScheduleEngine.create_optimal_schedule
+
+        def slow_greedy(engine):
+            time.sleep(0.3)
+            return greedy(engine)
+
+        engine = create_engine(teacher_availability, students, name='exact', backend='branch-and-bound', time_limit=0.2)
+        with patch.object(ScheduleEngine, 'create_optimal_schedule', slow_greedy):
+            schedule = engine.create_optimal_schedule()
+        self.assertFalse(engine.optimal)
+        self.assertEqual(placed(schedule), engine.placed_sessions)
+        self.assert_valid(engine.teacher_availability, students, schedule)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_engine({}, [], name='exact', backend='simplex')
+
+
+if __name__ == '__main__':
+    unittest.main()
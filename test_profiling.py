@@ -0,0 +1,100 @@
+import os
+import pstats
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+
+import cli
+from engine import ScheduleEngine
+from profiling import Profiler, profiler
+from synthetic import generate_roster
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_disabled_profiler_only_keeps_last_span(self):
+        local = Profiler()
+        with local.span('phase'):
+            local.count('things', 5)
+        self.assertIn('phase', local.last)
+        self.assertEqual((dict(local.totals), dict(local.counters)), ({}, {}))
+
+    def test_enabled_profiler_reports_spans_and_counters(self):
+        local = Profiler()
+        local.configure('1')
+        for _ in range(2):
+            with local.span('phase'):
+                local.count('things', 5)
+        self.assertEqual(local.calls['phase'], 2)
+        self.assertEqual(local.counters['things'], 10)
+        self.assertIsNone(local.cprofile_path)
+        report = local.report()
+        self.assertIn('phase', report)
+        self.assertIn('things', report)
+
+    def test_false_like_settings_leave_profiling_off(self):
+        for setting in ('0', '', 'false', 'OFF', None, False):
+            local = Profiler()
+            local.configure(setting)
+            self.assertEqual((local.enabled, local.cprofile_path), (False, None), setting)
+        local = Profiler()
+        local.configure('yes')
+        self.assertEqual((local.enabled, local.cprofile_path), (True, None))
+
+    def test_cprofile_data_is_merged_across_threads(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local = Profiler()
+            local.configure(os.path.join(tmp_dir, "run.prof"))
+
+            def work():
+                with local.profile_thread():
+                    sorted(range(1000))
+
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+            work()
+            with redirect_stderr(StringIO()):
+                local.dump()
+            stats = pstats.Stats(local.cprofile_path)
+        self.assertEqual(len(local.cprofiles), 2)
+        self.assertTrue(any("sorted" in name for _, _, name in stats.stats))
+
+    def test_engine_counts_its_work(self):
+        teacher_availability, students, _ = generate_roster(200, seed=1)
+        profiler.reset()
+        profiler.enabled = True
+        try:
+            schedule = ScheduleEngine(teacher_availability, students).create_optimal_schedule()
+            engine_counters = dict(profiler.counters)
+        finally:
+            profiler.enabled = False
+            profiler.reset()
+        self.assertEqual(engine_counters['classes placed'], sum(len(classes) for classes in schedule.values()))
+        self.assertGreater(engine_counters['slots evaluated'], 0)
+        self.assertGreater(engine_counters['candidates scanned'], 0)
+
+    def test_command_line_profile_switch(self):
+        schedules_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "branch.json")
+            with open(os.path.join(schedules_dir, "with_schedule.json")) as src, open(file_path, 'w') as dst:
+                dst.write(src.read())
+            stderr = StringIO()
+            try:
+                with redirect_stdout(StringIO()), redirect_stderr(stderr):
+                    self.assertEqual(cli.main([file_path, "--profile", os.path.join(tmp_dir, "cli.prof")]), 0)
+                self.assertTrue(os.path.exists(os.path.join(tmp_dir, "cli.prof")))
+            finally:
+                profiler.enabled = False
+                profiler.cprofile_path = None
+                profiler.cprofiles.clear()
+                profiler.reset()
+        self.assertIn('engine.slots', stderr.getvalue())
+        self.assertIn('classes placed', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
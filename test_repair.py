@@ -0,0 +1,119 @@
+import unittest
+
+from engine import DAYS, Student, ScheduleEngine, Teacher
+from repair import ScheduleRepair
+from roster import Roster
+
+
+class TestScheduleRepair(unittest.TestCase):
+
+    def setUp(self):
+        self.teacher_availability = {day: set() for day in DAYS}
+        self.teacher_availability["Monday"].update(["09:00", "10:00", "11:00", "12:00"])
+        self.teacher_availability["Tuesday"].update(["09:00", "10:00"])
+        self.students = Roster(Student(f"K{i}", "Kids I", {"Monday": {"09:00", "10:00"}}, False) for i in range(4))
+        self.students += [Student(f"T{i}", "Teens I", {"Monday": {"11:00", "12:00"}}, False) for i in range(3)]
+        self.engine = ScheduleEngine(self.teacher_availability, self.students)
+        self.schedule = self.engine.create_optimal_schedule()
+        self.kids_class, self.teens_class = self.schedule["Monday"]
+
+    def repair(self):
+        return ScheduleRepair(self.engine, self.schedule)
+
+    def test_add_student_joins_existing_class(self):
+        student = Student("K4", "Kids I", {"Monday": {"09:00", "10:00"}}, False)
+        self.students.append(student)
+        changes = self.repair().add_student(student)
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['action'], 'updated')
+        self.assertEqual(changes[0]['joined'], [student])
+        self.assertIn(student, self.kids_class['students'])
+        self.assertEqual(student.scheduled_days, 1)
+        self.assertEqual(len(self.teens_class['students']), 3)
+
+    def test_add_students_opens_new_class(self):
+        newcomers = [Student(f"P{i}", "Pre-Teens I", {"Tuesday": {"09:00", "10:00"}}, False) for i in range(3)]
+        changes = []
+        for student in newcomers:
+            self.students.append(student)
+            changes += self.repair().add_student(student)
+
+        self.assertEqual([c['action'] for c in changes], ['added'])
+        self.assertEqual(changes[0]['day'], "Tuesday")
+        self.assertCountEqual(changes[0]['joined'], newcomers)
+        self.assertCountEqual(self.schedule["Tuesday"][0]['students'], newcomers)
+        self.assertTrue(all(s.scheduled_days == 1 for s in newcomers))
+
+    def test_remove_student_dissolves_undersized_class(self):
+        student = self.teens_class['students'][0]
+        self.students.remove(student)
+        changes = self.repair().remove_student(student)
+
+        self.assertEqual([c['action'] for c in changes], ['removed'])
+        self.assertNotIn(self.teens_class, self.schedule["Monday"])
+        self.assertTrue(all(s.scheduled_days == 0 for s in self.students if s.level == "Teens I"))
+        self.assertEqual(len(self.kids_class['students']), 4)
+
+    def test_remove_student_keeps_class_that_stays_large_enough(self):
+        student = self.kids_class['students'][0]
+        self.students.remove(student)
+        changes = self.repair().remove_student(student)
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['left'], [student])
+        self.assertEqual(len(self.kids_class['students']), 3)
+
+    def test_update_student_moves_to_matching_class(self):
+        student = self.kids_class['students'][0]
+        student.level = "Teens I"
+        student.availability = {"Monday": {"11:00", "12:00"}}
+        self.students.update(student)
+        changes = self.repair().update_student(student)
+
+        self.assertEqual([(c['level'], c['joined'], c['left']) for c in changes],
+                         [("Kids I", [], [student]), ("Teens I", [student], [])])
+        self.assertIn(student, self.teens_class['students'])
+        self.assertEqual(student.scheduled_days, 1)
+
+    def test_changes_to_parallel_classes_are_reported_separately(self):
+        monday = {"Monday": {"09:00", "10:00"}}
+        teachers = [Teacher("Ana", monday), Teacher("Raj", monday)]
+        students = Roster(Student(f"K{i}", "Kids I", monday, False) for i in range(3))
+        students += [Student(f"T{i}", "Teens I", monday, False) for i in range(3)]
+        engine = ScheduleEngine(monday, students, teachers=teachers)
+        schedule = engine.create_optimal_schedule()
+        self.assertEqual({(c['time'], c['level']) for c in schedule["Monday"]}, {("09:00", "Kids I"), ("09:00", "Teens I")})
+
+        student = students[0]
+        student.level = "Teens I"
+        students.update(student)
+        changes = ScheduleRepair(engine, schedule).update_student(student)
+
+        self.assertEqual([(c['level'], c['action'], [s.name for s in c['joined']], [s.name for s in c['left']])
+                          for c in changes],
+                         [("Kids I", 'removed', [], ["K0", "K1", "K2"]), ("Teens I", 'updated', ["K0"], [])])
+        self.assertEqual({c['teacher'] for c in changes}, {"Ana", "Raj"})
+
+    def test_parallel_class_does_not_take_students_already_in_class(self):
+        monday = {"Monday": {"09:00", "10:00"}}
+        teachers = [Teacher("Ana", monday), Teacher("Raj", monday)]
+        students = Roster(Student(f"K{i}", "Kids I", monday, True) for i in range(7))
+        engine = ScheduleEngine(monday, students, teachers=teachers)
+        schedule = engine.create_optimal_schedule()
+        self.assertEqual([c['teacher'] for c in schedule["Monday"]], ["Ana"])
+
+        student = Student("K7", "Kids I", monday, True)
+        students.append(student)
+        self.assertEqual(ScheduleRepair(engine, schedule).add_student(student), [])
+        self.assertEqual([c['teacher'] for c in schedule["Monday"]], ["Ana"])
+        self.assertEqual([s.scheduled_days for s in students], [1] * 7 + [0])
+
+    def test_update_student_without_change_is_a_no_op(self):
+        student = self.kids_class['students'][0]
+        self.assertEqual(self.repair().update_student(student), [])
+        self.assertEqual(student.scheduled_days, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import pickle
+import unittest
+
+from availability import SLOT_INDEX
+from engine import Student
+from roster import EligibilityIndex, NameIndex, Roster
+
+
+def slot(time_str):
+    return SLOT_INDEX[time_str]
+
+
+class TestRoster(unittest.TestCase):
+
+    def setUp(self):
+        self.amy = Student("Amy", "Kids I", {"Monday": {"09:00", "10:00", "10:30"}}, False)
+        self.ben = Student("Ben", "Kids I", {"Monday": {"09:00", "10:00"}}, True)
+        self.cal = Student("Cal", "Teens I", {"Monday": {"09:00", "10:00"}}, False)
+        self.roster = Roster([self.amy, self.ben, self.cal])
+
+    def test_index_lists_students_who_cover_the_class_window(self):
+        index = self.roster.eligibility
+        self.assertEqual(index.students_for("Kids I", "Monday", slot("09:00")), [self.amy, self.ben])
+        self.assertEqual(index.students_for("Kids I", "Monday", slot("09:30")), [])
+        self.assertEqual(index.students_for("Teens I", "Monday", slot("09:00")), [self.cal])
+        self.assertEqual(index.students_for("Teens I", "Tuesday", slot("09:00")), [])
+
+    def test_mutations_keep_index_in_sync(self):
+        dan = Student("Dan", "Kids I", {"Monday": {"09:00", "10:00"}}, False)
+        self.roster.append(dan)
+        self.roster.remove(self.amy)
+        self.assertEqual(self.roster.eligibility.students_for("Kids I", "Monday", slot("09:00")), [self.ben, dan])
+
+        self.roster.pop()
+        self.assertEqual(self.roster.eligibility.students_for("Kids I", "Monday", slot("09:00")), [self.ben])
+
+        self.roster.clear()
+        self.assertEqual(self.roster.eligibility.students_for("Teens I", "Monday", slot("09:00")), [])
+
+    def test_indexes_are_built_on_first_use_then_kept_in_sync(self):
+        self.assertIsNone(self.roster._eligibility)
+        self.assertIsNone(self.roster._names)
+        index = self.roster.eligibility
+        names = self.roster.names
+        dan = Student("Dan", "Kids I", {"Monday": {"09:00", "10:00"}}, False)
+        self.roster.append(dan)
+        self.roster.remove(self.amy)
+        self.assertIs(self.roster.eligibility, index)
+        self.assertEqual(index.students_for("Kids I", "Monday", slot("09:00")), [self.ben, dan])
+        self.assertEqual(names.search("dan"), {dan})
+        self.assertFalse(names.contains("Amy"))
+
+    def test_update_moves_student_but_keeps_roster_order(self):
+        self.amy.level = "Teens I"
+        self.roster.update(self.amy)
+        index = self.roster.eligibility
+        self.assertEqual(index.students_for("Kids I", "Monday", slot("09:00")), [self.ben])
+        self.assertEqual(index.students_for("Teens I", "Monday", slot("09:00")), [self.amy, self.cal])
+
+    def test_item_assignment_rebuilds_index(self):
+        dan = Student("Dan", "Teens I", {"Monday": {"09:00", "10:00"}}, False)
+        self.roster[0] = dan
+        self.assertEqual(self.roster.eligibility.students_for("Teens I", "Monday", slot("09:00")), [dan, self.cal])
+        del self.roster[0]
+        self.assertEqual(self.roster.eligibility.students_for("Teens I", "Monday", slot("09:00")), [self.cal])
+
+    def test_pickle_round_trip(self):
+        roster = pickle.loads(pickle.dumps(self.roster))
+        self.assertIsInstance(roster, Roster)
+        self.assertEqual([s.name for s in roster.eligibility.students_for("Kids I", "Monday", slot("09:00"))], ["Amy", "Ben"])
+
+    def test_index_of_plain_list(self):
+        index = EligibilityIndex([self.cal, self.amy])
+        self.assertEqual(index.students_for("Kids I", "Monday", slot("09:00")), [self.amy])
+
+
+class TestNameIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.amy = Student("Amy Lee", "Kids I", {}, False)
+        self.ben = Student("Ben Leeds", "Kids I", {}, False)
+        self.cal = Student("Cal", "Teens I", {}, False)
+        self.roster = Roster([self.amy, self.ben, self.cal])
+
+    def test_exact_lookup_ignores_case(self):
+        self.assertTrue(self.roster.has_name("AMY LEE"))
+        self.assertFalse(self.roster.has_name("amy lee", exclude=self.amy))
+        self.assertFalse(self.roster.has_name("Amy"))
+        self.assertEqual(self.roster.find("cal"), [self.cal])
+
+    def test_search_matches_substrings(self):
+        names = self.roster.names
+        self.assertEqual(names.search("lee"), {self.amy, self.ben})
+        self.assertEqual(names.search("LEEDS"), {self.ben})
+        self.assertEqual(names.search("e"), {self.amy, self.ben})
+        self.assertEqual(names.search("xyz"), set())
+        self.assertEqual(names.search(""), {self.amy, self.ben, self.cal})
+
+    def test_mutations_and_renames_keep_names_in_sync(self):
+        self.roster.remove(self.ben)
+        self.assertFalse(self.roster.has_name("Ben Leeds"))
+        self.assertEqual(self.roster.names.search("lee"), {self.amy})
+
+        self.amy.name = "Amelia Park"
+        self.roster.update(self.amy)
+        self.assertTrue(self.roster.has_name("amelia park"))
+        self.assertFalse(self.roster.has_name("Amy Lee"))
+        self.assertEqual(self.roster.names.search("park"), {self.amy})
+        self.assertEqual(self.roster.names.search("lee"), set())
+
+        self.roster[0] = self.ben
+        self.assertEqual(self.roster.find("ben leeds"), [self.ben])
+        self.assertFalse(self.roster.has_name("Amelia Park"))
+
+    def test_duplicate_names_are_all_kept(self):
+        twin = Student("amy lee", "Kids II", {}, False)
+        self.roster.append(twin)
+        self.assertEqual(self.roster.find("Amy Lee"), [self.amy, twin])
+        self.assertTrue(self.roster.has_name("Amy Lee", exclude=self.amy))
+        self.roster.remove(twin)
+        self.assertEqual(self.roster.find("Amy Lee"), [self.amy])
+
+    def test_index_of_plain_list(self):
+        self.assertEqual(NameIndex([self.cal]).search("ca"), {self.cal})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,14 @@
 import os
+import shutil
 
 os.environ['QT_LOGGING_RULES'] = '*.debug=false;qt.qpa.*=false'
 
 from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import QMessageBox  # Add this import statement
 
+import subprocess
+import sys
+import threading
 import unittest
 import warnings
 import logging
@@ -24,7 +28,13 @@ from PyQt6.QtWidgets import QApplication, QWidget, QTabWidget, QPushButton, QLis
 from PyQt6.QtCore import Qt, QPoint, QSize, QEvent, QPointF
 from PyQt6.QtGui import QMouseEvent, QShortcut
 from PyQt6.QtTest import QTest
-from scheduling import Student, AvailabilityButton, AcademySchedulerGUI
+from scheduling import Student, AcademySchedulerGUI, SCHEDULE_TAB, SEARCH_HIGHLIGHT_COLOR, STUDENT_TAB, TEACHER_TAB
+from engine import ScheduleEngine
+from availability import SLOT_TIMES, STUDENT_SLOT_TIMES, Availability
+from widgets import AvailabilityGrid
+from storage import load_file
+from cache import ScheduleCache
+from test_support import describe
 
 
 class TestStudent(unittest.TestCase):
@@ -67,54 +77,51 @@ class TestStudent(unittest.TestCase):
         self.assertNotIn('14:00', student.availability['Tuesday'])
 
 
-class MockMainWindow(QWidget):
-
-    def __init__(self):
-        super().__init__()
-        self.drag_started = False
-        self.drag_continued = False
-        self.drag_ended = False
-
-    def start_drag(self, button):
-        self.drag_started = True
-
-    def continue_drag(self, button, pos):
-        self.drag_continued = True
-
-    def end_drag(self):
-        self.drag_ended = True
-
-
-class TestAvailabilityButton(unittest.TestCase):
+class TestAvailabilityGrid(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
         cls.app = QApplication([])
 
     def setUp(self):
-        self.parent = MockMainWindow()
-        self.button = AvailabilityButton("Monday", "09:00", self.parent)
-
-    def test_button_initialization(self):
-        self.assertEqual(self.button.day, "Monday")
-        self.assertEqual(self.button.time, "09:00")
-        self.assertTrue(self.button.is_teacher)
-        self.assertEqual(self.button.parent_window, self.parent)
-        self.assertTrue(self.button.isCheckable())
-
-    def test_mouse_press_event(self):
-        QTest.mousePress(self.button, Qt.MouseButton.LeftButton)
-        self.assertTrue(self.parent.drag_started)
-
-    def test_mouse_move_event(self):
-        QTest.mousePress(self.button, Qt.MouseButton.LeftButton)
-        QTest.mouseMove(self.button, QPoint(10, 10))
-        self.assertTrue(self.parent.drag_continued)
-
-    def test_mouse_release_event(self):
-        QTest.mousePress(self.button, Qt.MouseButton.LeftButton)
-        QTest.mouseRelease(self.button, Qt.MouseButton.LeftButton)
-        self.assertTrue(self.parent.drag_ended)
+        self.availability = Availability({"Monday": {"10:00"}, "Tuesday": set()})
+        self.grid = AvailabilityGrid(["Monday", "Tuesday"], SLOT_TIMES, self.availability)
+        self.changes = []
+        self.grid.availability_changed.connect(self.changes.append)
+
+    def center(self, day, time_str):
+        return self.grid.cell_rect(self.grid.days.index(day), self.grid.times.index(time_str)).center()
+
+    def test_hit_testing(self):
+        self.assertEqual(self.grid.cell_at(self.center("Tuesday", "09:30")), (1, 3))
+        self.assertIsNone(self.grid.cell_at(QPoint(1, 1)))
+        self.assertTrue(self.grid.is_checked(0, 4))
+
+    def test_click_toggles_one_cell(self):
+        QTest.mouseClick(self.grid, Qt.MouseButton.LeftButton, pos=self.center("Monday", "09:00"))
+        self.assertEqual(self.availability["Monday"], {"09:00", "10:00"})
+        self.assertEqual(self.changes, [["Monday"]])
+
+    def test_rubber_band_sets_rectangle(self):
+        QTest.mousePress(self.grid, Qt.MouseButton.LeftButton, pos=self.center("Monday", "09:00"))
+        QTest.mouseMove(self.grid, self.center("Tuesday", "10:30"))
+        self.assertEqual(self.grid.selection(), (0, 1, 2, 5))
+        QTest.mouseRelease(self.grid, Qt.MouseButton.LeftButton, pos=self.center("Tuesday", "10:30"))
+        expected = {"09:00", "09:30", "10:00", "10:30"}
+        self.assertEqual(self.availability["Monday"], expected)
+        self.assertEqual(self.availability["Tuesday"], expected)
+        self.assertEqual(self.changes, [["Monday", "Tuesday"]])
+
+        # Starting on a checked cell clears the rectangle
+        QTest.mousePress(self.grid, Qt.MouseButton.LeftButton, pos=self.center("Tuesday", "10:00"))
+        QTest.mouseMove(self.grid, self.center("Tuesday", "10:30"))
+        QTest.mouseRelease(self.grid, Qt.MouseButton.LeftButton, pos=self.center("Tuesday", "10:30"))
+        self.assertEqual(self.availability["Tuesday"], {"09:00", "09:30"})
+        self.assertIsNone(self.grid.selection())
+
+    def test_toggle_by_day_and_time(self):
+        self.assertFalse(self.grid.toggle("Monday", "10:00"))
+        self.assertEqual(self.availability.mask("Monday"), 0)
 
     @classmethod
     def tearDownClass(cls):
@@ -129,6 +136,20 @@ class TestAcademySchedulerGUI(unittest.TestCase):
 
     def setUp(self):
         self.gui = AcademySchedulerGUI()
+        # Most tests drive widgets on every tab, so build them all up front
+        for index in range(self.gui.tabs.count()):
+            self.gui.ensure_tab(index)
+        # Generation tests need the engine to run; cache tests give the window their own cache
+        self.gui.schedule_cache = None
+
+    def generate(self):
+        # Runs generation on its worker thread and delivers the result to the window
+        self.gui.generate_schedule()
+        worker = self.gui.generation_worker
+        if worker is not None:
+            worker.wait()
+        QApplication.processEvents()
+        self.assertIsNone(self.gui.generation_worker)
 
     def add_test_data(self):
         # Add some students
@@ -167,8 +188,7 @@ class TestAcademySchedulerGUI(unittest.TestCase):
         self.test_add_student()
 
         # Select the student
-        self.gui.student_listbox.setCurrentRow(0)
-        self.gui.select_student(self.gui.student_listbox.item(0))
+        self.gui.select_student(self.gui.student_proxy.index(0, 0))
 
         # Now, modify the student
         self.gui.name_entry.setText("Jane Doe")
@@ -192,8 +212,7 @@ class TestAcademySchedulerGUI(unittest.TestCase):
             self.gui.add_student()
         
         # Select the student
-        self.gui.student_listbox.setCurrentRow(0)
-        self.gui.select_student(self.gui.student_listbox.item(0))
+        self.gui.select_student(self.gui.student_proxy.index(0, 0))
         
         # Store the name before deletion
         student_name = self.gui.selected_student.name
@@ -210,10 +229,310 @@ class TestAcademySchedulerGUI(unittest.TestCase):
     def test_generate_schedule(self):
         # Add some students and generate a schedule
         self.add_test_data()
-        self.gui.generate_schedule()
+        self.generate()
         
         # Check if schedule is not empty
         self.assertNotEqual(self.gui.schedule_text.toPlainText(), "")
+        # The status bar breaks the run down by phase
+        message = self.gui.statusBar().currentMessage()
+        self.assertTrue(message.startswith("Schedule generated: engine "))
+        self.assertIn("display", message)
+
+    def test_unchanged_data_is_scheduled_from_the_cache(self):
+        import tempfile
+        tmp_dir = tempfile.mkdtemp()
+        self.gui.schedule_cache = ScheduleCache(os.path.join(tmp_dir, "cache"))
+        fixture = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules", "with_schedule.json")
+        first, second = os.path.join(tmp_dir, "first.json"), os.path.join(tmp_dir, "second.json")
+        shutil.copy(fixture, first)
+        shutil.copy(fixture, second)
+
+        def load(file_path):
+            with patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=(file_path, '')):
+                self.gui.load_data()
+
+        try:
+            load(first)
+            self.generate()
+            scheduled = describe(self.gui.schedule)
+            self.assertTrue(any(scheduled.values()))
+
+            self.gui.generate_schedule()
+            self.assertIsNone(self.gui.generation_worker)
+            self.assertTrue(self.gui.statusBar().currentMessage().startswith("Schedule loaded from cache"))
+            self.assertEqual(describe(self.gui.schedule), scheduled)
+
+            # Another file holding the same data gets the schedule back when it is opened
+            load(second)
+            self.assertEqual(self.gui.statusBar().currentMessage(),
+                             f"Data loaded from {second}, schedule restored from cache")
+            self.assertEqual(describe(self.gui.schedule), scheduled)
+            live = set(self.gui.students)
+            self.assertTrue(all(student in live for classes in self.gui.schedule.values()
+                                for class_info in classes for student in class_info['students']))
+
+            # Any edit means a new key, so the engine runs again
+            self.gui.select_student(self.gui.student_proxy.index(0, 0))
+            self.gui.twice_weekly_checkbox.setChecked(not self.gui.twice_weekly_checkbox.isChecked())
+            self.gui.modify_student()
+            self.gui.generate_schedule()
+            self.assertIsNotNone(self.gui.generation_worker)
+            self.gui.generation_worker.wait()
+            QApplication.processEvents()
+            self.assertEqual(len(self.gui.schedule_cache.entries()), 2)
+        finally:
+            self.gui.close()
+            shutil.rmtree(tmp_dir)
+
+    def test_generation_can_be_cancelled_while_the_window_keeps_working(self):
+        self.add_test_data()
+        started = threading.Event()
+        create_optimal_schedule = ScheduleEngine.create_optimal_schedule
+
+        def slow(engine):
+            started.set()
+            engine.cancel_event.wait(5)
+            engine.checkpoint(0, 1)
+            return create_optimal_schedule(engine)
+
+        with patch.object(ScheduleEngine, 'create_optimal_schedule', slow):
+            self.gui.generate_schedule()
+            worker = self.gui.generation_worker
+            self.assertTrue(started.wait(5))
+            self.assertFalse(self.gui.generate_button.isEnabled())
+            self.gui.name_entry.setText("Zed")
+            self.gui.add_student()
+            self.assertEqual(self.gui.students[-1].name, "Zed")
+            self.gui.cancel_generation()
+            self.assertTrue(worker.wait(5000))
+        QApplication.processEvents()
+
+        self.assertIsNone(self.gui.generation_worker)
+        self.assertIsNone(self.gui.schedule)
+        self.assertTrue(self.gui.generate_button.isEnabled())
+        self.assertEqual(self.gui.statusBar().currentMessage(), "Schedule generation cancelled")
+
+    def test_unexpected_engine_error_is_reported(self):
+        self.add_test_data()
+
+        def broken(engine):
+            raise TypeError("unsupported operand")
+
+        with patch.object(ScheduleEngine, 'create_optimal_schedule', broken):
+            self.generate()
+        self.assertIsNone(self.gui.schedule)
+        self.assertTrue(self.gui.generate_button.isEnabled())
+        self.assertEqual(self.gui.statusBar().currentMessage(), "Error generating schedule: unsupported operand")
+
+    def test_generated_schedule_uses_roster_students(self):
+        for name in ("Amy", "Ben", "Cal", "Dan"):
+            self.gui.students.append(Student(name, "Kids I", {"Monday": {"09:00", "10:00"}}, False))
+        self.gui.teacher_availability["Monday"].update(["09:00", "10:00"])
+        self.gui.update_student_listbox()
+        gate = threading.Event()
+        create_optimal_schedule = ScheduleEngine.create_optimal_schedule
+
+        def gated(engine):
+            gate.wait(5)
+            return create_optimal_schedule(engine)
+
+        with patch.object(ScheduleEngine, 'create_optimal_schedule', gated):
+            self.gui.generate_schedule()
+            worker = self.gui.generation_worker
+            # Deleted while the engine is still working on its copy of the roster
+            self.gui.select_student(self.gui.student_proxy.index(3, 0))
+            self.gui.delete_student()
+            gate.set()
+            self.assertTrue(worker.wait(5000))
+        QApplication.processEvents()
+
+        members = self.gui.schedule["Monday"][0]['students']
+        self.assertEqual([s.name for s in members], ["Amy", "Ben", "Cal"])
+        self.assertTrue(all(any(s is student for student in self.gui.students) for s in members))
+        self.assertEqual([s.scheduled_days for s in self.gui.students], [1, 1, 1])
+        self.assertIn("changed meanwhile", self.gui.statusBar().currentMessage())
+
+    def test_add_student_repairs_generated_schedule(self):
+        for name in ("Amy", "Ben", "Cal"):
+            self.gui.students.append(Student(name, "Kids I", {day: {"09:00", "10:00"} for day in self.gui.days}, False))
+        for day in self.gui.days:
+            self.gui.teacher_availability[day].update(["09:00", "10:00"])
+        self.generate()
+        kids_class = self.gui.schedule["Monday"][0]
+
+        self.gui.name_entry.setText("Dan")
+        self.gui.level_dropdown.setCurrentText("Kids I")
+        self.gui.student_availability["Monday"].update(["09:00", "10:00"])
+        with patch.object(self.gui, 'create_optimal_schedule') as mock_generate:
+            self.gui.add_student()
+            mock_generate.assert_not_called()
+
+        self.assertIs(self.gui.schedule["Monday"][0], kids_class)
+        self.assertEqual([s.name for s in kids_class['students']], ["Amy", "Ben", "Cal", "Dan"])
+        self.assertIn("1 class changed", self.gui.statusBar().currentMessage())
+        self.assertIn("Dan", self.gui.schedule_model.index(0, 0).data(Qt.ItemDataRole.ToolTipRole))
+
+    def test_save_writes_schedule_model(self):
+        names = ["Ann: Lee", "Bo - Chen", "Cy, Jr"]
+        for name in names:
+            self.gui.students.append(Student(name, "Kids I", {"Monday": {"09:00", "10:00"}}, False))
+        self.gui.teacher_availability["Monday"].update(["09:00", "10:00"])
+        self.generate()
+
+        file_path = "model_save.json"
+        with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(file_path, '')):
+            with patch.object(self.gui.schedule_text, 'toPlainText') as mock_text:
+                self.gui.save_data()
+                mock_text.assert_not_called()
+        with open(file_path) as f:
+            data = json.load(f)
+        os.remove(file_path)
+        self.assertEqual(data['generated_schedule']['Monday'], [{'time': '09:00', 'level': 'Kids I', 'students': names}])
+
+    def test_database_save_load_and_write_through(self):
+        import tempfile
+        from database import SQLiteStore
+        self.add_test_data()
+        self.generate()
+        tmp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(tmp_dir, "academy.db")
+        try:
+            with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(file_path, '')):
+                self.gui.save_data()
+            names = [s.name for s in self.gui.students]
+
+            self.gui.close_store()
+            self.gui.students.clear()
+            with patch('scheduling.STUDENT_PAGE_SIZE', 1):
+                with patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=(file_path, '')):
+                    self.gui.load_data()
+                while self.gui.student_pages is not None:
+                    QApplication.processEvents()
+            self.assertEqual([s.name for s in self.gui.students], names)
+            self.assertEqual(self.gui.student_proxy.rowCount(), len(names))
+            self.assertIsNotNone(self.gui.schedule)
+
+            self.gui.select_student(self.gui.student_proxy.index(0, 0))
+            self.gui.name_entry.setText("Renamed")
+            self.gui.modify_student()
+            self.gui.close_store()
+
+            store = SQLiteStore(file_path)
+            self.assertEqual(store.load_students()[0].name, "Renamed")
+            store.close()
+        finally:
+            self.gui.close_store()
+            shutil.rmtree(tmp_dir)
+
+    def test_save_waits_for_database_to_finish_loading(self):
+        import tempfile
+        from database import SQLiteStore
+        self.add_test_data()
+        tmp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(tmp_dir, "academy.db")
+        try:
+            with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(file_path, '')):
+                self.gui.save_data()
+            total = len(self.gui.students)
+            self.gui.close_store()
+            with patch('scheduling.STUDENT_PAGE_SIZE', 1):
+                with patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=(file_path, '')):
+                    self.gui.load_data()
+                self.assertIsNotNone(self.gui.student_pages)
+                with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(file_path, '')) as dialog:
+                    self.gui.save_data()
+                    dialog.assert_not_called()
+                self.assertEqual(self.gui.statusBar().currentMessage(), "Students are still loading")
+                while self.gui.student_pages is not None:
+                    QApplication.processEvents()
+            self.gui.close_store()
+
+            store = SQLiteStore(file_path)
+            self.assertEqual(store.count_students(), total)
+            store.close()
+        finally:
+            self.gui.close_store()
+            shutil.rmtree(tmp_dir)
+
+    def test_tabs_are_built_on_first_activation(self):
+        import tempfile
+        gui = AcademySchedulerGUI()
+        gui.schedule_cache = None
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            self.assertEqual(gui.built_tabs, {TEACHER_TAB})
+            self.assertFalse(hasattr(gui, 'schedule_table'))
+            file_path = os.path.join(tmp_dir, "branch.json")
+            shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules", "with_schedule.json"),
+                        file_path)
+            with patch('PyQt6.QtWidgets.QFileDialog.getOpenFileName', return_value=(file_path, '')):
+                gui.load_data()
+            gui.generate_schedule()
+            gui.generation_worker.wait()
+            QApplication.processEvents()
+            self.assertIsNotNone(gui.schedule)
+            self.assertEqual(gui.built_tabs, {TEACHER_TAB})
+
+            # Data loaded before a tab existed shows up when it is opened
+            gui.show_tab(SCHEDULE_TAB)
+            self.assertEqual(gui.built_tabs, {TEACHER_TAB, SCHEDULE_TAB})
+            self.assertIs(gui.schedule_table.model(), gui.schedule_model)
+            self.assertGreater(gui.schedule_model.rowCount(), 0)
+            self.assertTrue(gui.schedule_text.toPlainText().startswith("Weekly Schedule:"))
+            self.assertTrue(gui.generate_button.isEnabled())
+            self.assertFalse(gui.cancel_button.isEnabled())
+
+            gui.show_tab(STUDENT_TAB)
+            self.assertEqual(gui.student_listbox.model().rowCount(), len(gui.students))
+            gui.show_tab(TEACHER_TAB)
+            self.assertEqual(len(gui.built_tabs), 3)
+        finally:
+            gui.close()
+            shutil.rmtree(tmp_dir)
+
+    def test_shortcuts_build_the_student_tab(self):
+        gui = AcademySchedulerGUI()
+        try:
+            gui.student_shortcut(gui.delete_student)
+            self.assertEqual(gui.tabs.currentIndex(), STUDENT_TAB)
+            self.assertIn(STUDENT_TAB, gui.built_tabs)
+            self.assertEqual(gui.statusBar().currentMessage(), "No student selected for deletion")
+        finally:
+            gui.close()
+
+    def test_startup_time_is_reported(self):
+        result = subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scheduling.py"),
+                                 "--startup-time"], env=dict(os.environ, QT_QPA_PLATFORM='offscreen'),
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0)
+        self.assertRegex(result.stdout, r"^Startup: imports \d+ ms, window \d+ ms, total \d+ ms")
+
+    def test_edits_are_autosaved_after_a_pause(self):
+        import tempfile
+        tmp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(tmp_dir, "branch.json")
+        try:
+            with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(file_path, '')):
+                self.gui.save_data()
+            self.assertFalse(self.gui.autosave_timer.isActive())
+
+            for time_str in ("09:00", "09:30", "10:00"):
+                self.gui.teacher_grid.toggle("Monday", time_str)
+            self.assertTrue(self.gui.dirty)
+            self.assertTrue(self.gui.autosave_timer.isActive())
+
+            with patch.object(self.gui.autosaver, 'submit', wraps=self.gui.autosaver.submit) as mock_submit:
+                self.gui.autosave_timer.timeout.emit()
+                self.gui.autosave()
+                mock_submit.assert_called_once()
+            self.assertTrue(self.gui.autosaver.flush(5))
+            teacher_availability, _, _, _ = load_file(file_path)
+            self.assertEqual(teacher_availability["Monday"], {"09:00", "09:30", "10:00"})
+            self.assertFalse(self.gui.dirty)
+            self.assertTrue(os.path.exists(file_path + ".1"))
+        finally:
+            self.gui.close()
+            shutil.rmtree(tmp_dir)
 
     def test_save_and_load_data(self):
         # Add some students and set teacher availability
@@ -243,19 +562,26 @@ class TestAcademySchedulerGUI(unittest.TestCase):
 
     def test_toggle_availability(self):
         # Test teacher availability toggle
-        teacher_button = AvailabilityButton("Monday", "09:00", self.gui, is_teacher=True)
-        self.gui.toggle_availability(teacher_button)
+        self.gui.teacher_grid.toggle("Monday", "09:00")
         self.assertIn("09:00", self.gui.teacher_availability["Monday"])
-        self.gui.toggle_availability(teacher_button)
+        self.assertTrue(self.gui.dirty)
+        self.gui.teacher_grid.toggle("Monday", "09:00")
         self.assertNotIn("09:00", self.gui.teacher_availability["Monday"])
 
         # Test student availability toggle
-        student_button = AvailabilityButton("Monday", "14:00", self.gui, is_teacher=False)
-        self.gui.toggle_availability(student_button)
+        self.gui.student_grid.toggle("Monday", "14:00")
         self.assertIn("14:00", self.gui.student_availability["Monday"])
-        self.gui.toggle_availability(student_button)
+        self.gui.student_grid.toggle("Monday", "14:00")
         self.assertNotIn("14:00", self.gui.student_availability["Monday"])
 
+        # Loading a student's availability rebinds the grid to it
+        student = Student("Grid Test", "Kids I", {"Tuesday": {"15:00"}}, False)
+        self.gui.students.append(student)
+        self.gui.update_student_listbox()
+        self.gui.select_student(self.gui.student_proxy.index(len(self.gui.students) - 1, 0))
+        self.assertIs(self.gui.student_grid.availability, self.gui.student_availability)
+        self.assertTrue(self.gui.student_grid.is_checked(1, STUDENT_SLOT_TIMES.index("15:00")))
+
     def test_search_students(self):
         # Add some students
         self.add_test_data()
@@ -263,19 +589,50 @@ class TestAcademySchedulerGUI(unittest.TestCase):
         # Search for existing student
         self.gui.search_entry.setText("John")
         self.gui.search_students()
-        self.assertFalse(self.gui.student_listbox.item(0).isHidden())
-        self.assertTrue(self.gui.student_listbox.item(1).isHidden())
+        self.assertEqual(self.gui.student_proxy.rowCount(), 1)
+        self.assertEqual(self.gui.student_proxy.student_at(0).name, "John Doe")
         
         # Search for non-existing student
         self.gui.search_entry.setText("Bob")
         self.gui.search_students()
-        for i in range(self.gui.student_listbox.count()):
-            self.assertTrue(self.gui.student_listbox.item(i).isHidden())
+        self.assertEqual(self.gui.student_proxy.rowCount(), 0)
+
+        # Students added or renamed while a search is active are filtered as they change
+        self.gui.search_entry.setText("doe")
+        self.assertEqual(self.gui.student_proxy.rowCount(), 2)
+        self.gui.name_entry.setText("Bob Doe")
+        self.gui.add_student()
+        self.assertEqual(self.gui.student_proxy.rowCount(), 3)
+        self.gui.select_student(self.gui.student_proxy.index(0, 0))
+        self.gui.name_entry.setText("Johnny Smith")
+        self.gui.modify_student()
+        self.assertEqual(sorted(self.gui.student_proxy.student_at(row).name for row in range(2)), ["Bob Doe", "Jane Doe"])
+
+    def test_student_list_sorts_and_updates_single_rows(self):
+        self.add_test_data()
+        names = lambda: [self.gui.student_proxy.student_at(row).name for row in range(self.gui.student_proxy.rowCount())]
+        self.assertEqual(names(), ["John Doe", "Jane Doe", "Alice Smith"])
+
+        self.gui.sort_dropdown.setCurrentIndex(self.gui.sort_dropdown.findData('name'))
+        self.assertEqual(names(), ["Alice Smith", "Jane Doe", "John Doe"])
+        self.gui.sort_dropdown.setCurrentIndex(self.gui.sort_dropdown.findData('level'))
+        self.assertEqual(names(), ["John Doe", "Jane Doe", "Alice Smith"])
+
+        changed = []
+        self.gui.student_model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row())))
+        self.gui.select_student(self.gui.student_proxy.index(2, 0))
+        self.gui.level_dropdown.setCurrentText("Kids I")
+        self.gui.modify_student()
+        self.assertEqual(changed, [(2, 2)])
+        self.assertEqual(names(), ["Alice Smith", "John Doe", "Jane Doe"])
+
+        self.gui.sort_dropdown.setCurrentIndex(self.gui.sort_dropdown.findData('roster'))
+        self.assertEqual(names(), ["John Doe", "Jane Doe", "Alice Smith"])
 
     def test_update_schedule_for_date(self):
         # Add some students and generate a schedule
         self.add_test_data()
-        self.gui.generate_schedule()
+        self.generate()
         
         # Create a mock calendar widget
         mock_calendar = MagicMock()
@@ -381,8 +738,7 @@ class TestAcademySchedulerGUI(unittest.TestCase):
 
         # Test modifying a student with duplicate name
         self.test_add_student()  # Add a student first
-        self.gui.student_listbox.setCurrentRow(0)
-        self.gui.select_student(self.gui.student_listbox.item(0))
+        self.gui.select_student(self.gui.student_proxy.index(0, 0))
         self.gui.name_entry.setText("Jane Doe")
         with patch.object(self.gui, 'is_duplicate_name', return_value=True):
             with patch.object(QMessageBox, 'warning') as mock_warning:
@@ -426,25 +782,93 @@ class TestAcademySchedulerGUI(unittest.TestCase):
         
         schedule_text = self.gui.schedule_text.toPlainText()
         self.assertIn("Weekly Schedule:", schedule_text)
-        for day in self.gui.days:
-            self.assertIn(day, schedule_text)
+        model = self.gui.schedule_model
+        self.assertEqual([model.headerData(col, Qt.Orientation.Horizontal) for col in range(model.columnCount())], self.gui.days)
         
         # Check if any students are scheduled or unscheduled
-        self.assertTrue("Students:" in schedule_text or "Unscheduled Students:" in schedule_text)
+        self.assertTrue(model.rowCount() > 0 or "Unscheduled Students:" in schedule_text)
 
     def test_display_scheduled_classes(self):
         self.add_test_data()
         schedule = self.gui.create_optimal_schedule()
         self.gui._display_scheduled_classes(schedule)
         
-        schedule_text = self.gui.schedule_text.toPlainText()
-        for day in self.gui.days:
-            self.assertIn(day, schedule_text)
-        
-        if "No classes scheduled" not in schedule_text:
-            self.assertIn("Students:", schedule_text)
-        else:
-            self.assertIn("No classes scheduled", schedule_text)
+        model = self.gui.schedule_model
+        classes = [c for row in range(model.rowCount()) for col in range(model.columnCount()) for c in model.classes_at(row, col)]
+        self.assertEqual(len(classes), sum(len(day_classes) for day_classes in schedule.values()))
+        for row in range(model.rowCount()):
+            self.assertIn(" - ", model.headerData(row, Qt.Orientation.Vertical))
+
+    def test_schedule_view_filters_expands_and_exports(self):
+        import csv
+        import tempfile
+        for name in ("Amy", "Ben", "Cal"):
+            self.gui.students.append(Student(name, "Kids I", {"Monday": {"09:00", "10:00"}}, False))
+        for name in ("Dee", "Eli", "Fay"):
+            self.gui.students.append(Student(name, "Teens I", {"Tuesday": {"11:00", "12:00"}}, False))
+        self.gui.teacher_availability["Monday"].update(["09:00", "10:00"])
+        self.gui.teacher_availability["Tuesday"].update(["11:00", "12:00"])
+        self.generate()
+        model = self.gui.schedule_model
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.index(0, 0).data(), "Kids I: 3 students")
+        self.assertIsNone(model.index(0, 1).data())
+
+        self.gui.show_class_roster(model.index(0, 0))
+        self.assertEqual(self.gui.schedule_text.toPlainText().splitlines()[-3:], ["    Amy", "    Ben", "    Cal"])
+
+        self.gui.schedule_level_dropdown.setCurrentText("Teens I")
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.index(0, 1).data(), "Teens I: 3 students")
+
+        file_path = os.path.join(tempfile.mkdtemp(), "schedule.csv")
+        try:
+            with patch('PyQt6.QtWidgets.QFileDialog.getSaveFileName', return_value=(file_path, '')):
+                self.gui.export_schedule()
+            with open(file_path, newline='') as f:
+                rows = list(csv.reader(f))
+        finally:
+            shutil.rmtree(os.path.dirname(file_path))
+        self.assertEqual(rows, [list(model.EXPORT_HEADER), ["Tuesday", "11:00", "12:00", "Teens I", "", "Dee, Eli, Fay"]])
+
+    def test_calendar_shows_a_day_and_highlights_searched_students(self):
+        self.gui.display_schedule_for_day("Monday")
+        self.assertEqual(self.gui.schedule_text.toPlainText(), "No schedule generated yet.")
+        for name in ("Amy", "Ben", "Cal"):
+            self.gui.students.append(Student(name, "Kids I", {"Monday": {"11:00", "12:00"}}, False))
+        for name in ("Dee", "Eli", "Fay"):
+            self.gui.students.append(Student(name, "Teens I", {"Monday": {"09:00", "10:00"}}, False))
+        self.gui.teacher_availability["Monday"].update(["09:00", "10:00", "11:00", "12:00"])
+        self.generate()
+
+        self.gui.display_schedule_for_day("Monday")
+        lines = self.gui.schedule_text.toPlainText().splitlines()
+        self.assertEqual(lines[0], "Monday: 2 classes")
+        class_lines = [line for line in lines if line.startswith("  ") and not line.startswith("    ")]
+        self.assertEqual(len(class_lines), 2)
+        self.assertIn("Teens I", class_lines[0])
+        self.assertIn("Kids I", class_lines[1])
+        self.assertIn("    Amy", lines)
+        self.gui.display_schedule_for_day("Tuesday")
+        self.assertEqual(self.gui.schedule_text.toPlainText(), "No classes scheduled on Tuesday.")
+        self.gui.schedule_level_dropdown.setCurrentText("Kids I")
+        self.gui.display_schedule_for_day("Monday")
+        self.assertEqual(self.gui.schedule_text.toPlainText().splitlines()[0], "Monday: 1 class")
+
+        calendar = self.gui.schedule_calendar
+        calendar.setCurrentPage(2026, 10)
+        self.gui.search_entry.setText("amy")
+        self.assertEqual(self.gui.highlighted_days, {"Monday"})
+
+        def highlighted(year, month, day):
+            return calendar.dateTextFormat(QDate(year, month, day)).background().color() == SEARCH_HIGHLIGHT_COLOR
+
+        self.assertTrue(highlighted(2026, 10, 5))
+        self.assertFalse(highlighted(2026, 10, 6))
+        calendar.setCurrentPage(2026, 11)
+        self.assertTrue(highlighted(2026, 11, 2))
+        self.gui.search_entry.setText("")
+        self.assertFalse(highlighted(2026, 11, 2))
 
     def test_display_unscheduled_students(self):
         self.add_test_data()
@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from engine import DAYS, Student, ScheduleEngine, create_engine
+import test_exact
+from test_exact import placed
+from test_support import describe, random_roster
+
+
+class TestLocalSearchScheduleEngine(unittest.TestCase):
+
+    assert_valid = test_exact.TestExactScheduleEngine.assert_valid
+
+    def test_finds_schedule_greedy_misses(self):
+        teacher_availability = {day: set() for day in DAYS}
+        teacher_availability["Monday"].update(["09:00", "10:00", "11:00"])
+        students = [Student(f"A{i}", "Kids I", {"Monday": {"09:00", "10:00", "11:00"}}, False) for i in range(3)]
+        students += [Student(f"B{i}", "Kids II", {"Monday": {"09:00", "10:00"}}, False) for i in range(3)]
+
+        engine = create_engine(teacher_availability, students, name='local', jobs=1)
+        schedule = engine.create_optimal_schedule()
+        self.assertEqual(placed(schedule), 6)
+        self.assertTrue(engine.optimal)
+        self.assert_valid(engine.teacher_availability, students, schedule)
+
+    def test_same_seed_gives_same_schedule(self):
+        teacher_availability, students = random_roster(3, 300)
+        greedy = placed(ScheduleEngine(teacher_availability, students).create_optimal_schedule())
+        runs = []
+        for _ in range(2):
+            engine = create_engine(teacher_availability, students, name='local', seed=7, restarts=2,
+                                   iterations=300, time_limit=60, jobs=1)
+            runs.append(describe(engine.create_optimal_schedule()))
+            self.assertGreaterEqual(engine.placed_sessions, greedy)
+        self.assertEqual(runs[0], runs[1])
+
+    def test_parallel_restarts_stop_at_deadline(self):
+        teacher_availability, students = random_roster(1, 1000)
+        greedy = placed(ScheduleEngine(teacher_availability, students).create_optimal_schedule())
+        engine = create_engine(teacher_availability, students, name='local', restarts=2, jobs=2, time_limit=0.5)
+        start = time.monotonic()
+        schedule = engine.create_optimal_schedule()
+        self.assertLess(time.monotonic() - start, 5)
+
+        self.assertGreaterEqual(placed(schedule), greedy)
+        self.assertEqual(placed(schedule), engine.placed_sessions)
+        self.assertEqual(engine.history[-1][1], engine.placed_sessions)
+        self.assertEqual([value for _, value in engine.history], sorted({value for _, value in engine.history}))
+        self.assert_valid(engine.teacher_availability, students, schedule)
+
+    def test_rejects_teachers(self):
+        with self.assertRaises(ValueError):
+            create_engine({}, [], name='local', teachers=[object()])
+
+
+if __name__ == '__main__':
+    unittest.main()
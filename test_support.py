@@ -0,0 +1,20 @@
+# Helpers shared by the test modules; no tests of its own
+import random
+
+from availability import SLOT_TIMES
+from engine import DAYS, LEVELS, Student
+
+
+def random_roster(seed, count):
+    rng = random.Random(seed)
+    teacher_availability = {day: set(rng.sample(SLOT_TIMES, 20)) for day in DAYS}
+    students = []
+    for i in range(count):
+        availability = {day: set(rng.sample(SLOT_TIMES[8:], rng.randint(0, 8))) for day in DAYS}
+        students.append(Student(f"Student {i}", rng.choice(LEVELS), availability, rng.random() < 0.3))
+    return teacher_availability, students
+
+
+def describe(schedule):
+    return {day: [(c['time'], c['level'], [s.name for s in c['students']]) for c in classes]
+            for day, classes in schedule.items()}
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+import benchmark
+import synthetic
+from availability import SLOT_INDEX
+from engine import DAYS, ScheduleEngine
+from roster import Roster
+from storage import load_file
+from synthetic import generate_roster
+from test_support import describe
+
+
+class TestSyntheticRoster(unittest.TestCase):
+
+    def test_same_seed_gives_same_roster(self):
+        first = generate_roster(200, seed=5)
+        second = generate_roster(200, seed=5)
+        self.assertEqual(first[0], second[0])
+        self.assertEqual([(s.name, s.level, s.twice_weekly, s.availability) for s in first[1]],
+                         [(s.name, s.level, s.twice_weekly, s.availability) for s in second[1]])
+        self.assertNotEqual([s.availability for s in first[1]], [s.availability for s in generate_roster(200, seed=6)[1]])
+
+    def test_parameters_shape_the_roster(self):
+        _, students, teachers = generate_roster(1000, seed=1, levels=["Kids I", "Teens I"], level_weights=[3, 1],
+                                                twice_weekly_ratio=0.5, density=0.2, teachers=2)
+        self.assertIsInstance(students, Roster)
+        self.assertEqual(len(students), 1000)
+        self.assertEqual(len(teachers), 2)
+        kids = sum(s.level == "Kids I" for s in students)
+        self.assertTrue(650 < kids < 850)
+        self.assertTrue(400 < sum(s.twice_weekly for s in students) < 600)
+        free_days = sum(bool(s.availability.mask(day)) for s in students for day in DAYS) / (1000 * len(DAYS))
+        self.assertAlmostEqual(free_days, 0.2, delta=0.05)
+        # Student availability starts at noon, like the GUI's student grid
+        noon = (1 << SLOT_INDEX["12:00"]) - 1
+        self.assertFalse(any(s.availability.mask(day) & noon for s in students for day in DAYS))
+
+    def test_generated_roster_can_be_scheduled(self):
+        teacher_availability, students, _ = generate_roster(300, seed=2)
+        schedule = ScheduleEngine(teacher_availability, students).create_optimal_schedule()
+        self.assertGreater(sum(len(classes) for classes in schedule.values()), 0)
+
+    def test_command_line_writes_data_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "synthetic.json")
+            with redirect_stdout(StringIO()):
+                self.assertEqual(synthetic.main([file_path, "-n", "40", "--levels", "Kids I=2,First", "--seed", "3"]), 0)
+            _, students, generated_schedule, _ = load_file(file_path)
+        self.assertEqual(len(students), 40)
+        self.assertEqual({s.level for s in students}, {"Kids I", "First"})
+        self.assertIsNone(generated_schedule)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_run_records_every_task(self):
+        results = benchmark.run(sizes=[30], engines=['greedy'], repeat=1, gui=False)
+        self.assertEqual(results['version'], benchmark.BASELINE_VERSION)
+        self.assertEqual([r['task'] for r in results['results']],
+                         ['schedule:greedy', 'diagnostics', 'save:json', 'load:json', 'save:sqlite', 'load:sqlite'])
+        for r in results['results']:
+            self.assertEqual(r['size'], 30)
+            self.assertGreater(r['seconds'], 0)
+            self.assertGreaterEqual(r['peak_kb'], 0)
+
+        rows = benchmark.compare(results, results)
+        self.assertEqual([ratio for *_, ratio in rows], [1.0] * len(rows))
+
+    def test_schedule_result_matches_engine(self):
+        results = benchmark.run(sizes=[60], engines=['greedy'], repeat=1, gui=False)
+        teacher_availability, students, _ = generate_roster(60)
+        schedule = ScheduleEngine(teacher_availability, students).create_optimal_schedule()
+        entry = results['results'][0]
+        self.assertEqual(entry['classes'], sum(len(classes) for classes in describe(schedule).values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
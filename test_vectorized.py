@@ -0,0 +1,43 @@
+import os
+import unittest
+
+from engine import DAYS, ScheduleEngine, create_engine
+from storage import load_file
+from test_support import describe, random_roster
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestVectorizedScheduleEngine(unittest.TestCase):
+
+    def assert_same_as_greedy(self, teacher_availability, students):
+        greedy = describe(ScheduleEngine(teacher_availability, students).create_optimal_schedule())
+        greedy_days = [s.scheduled_days for s in students]
+        vectorized = describe(create_engine(teacher_availability, students, name='vectorized').create_optimal_schedule())
+        self.assertEqual(vectorized, greedy)
+        self.assertEqual([s.scheduled_days for s in students], greedy_days)
+
+    def test_matches_greedy_on_saved_files(self):
+        schedules_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules")
+        for name in sorted(os.listdir(schedules_dir)):
+            teacher_availability, students, _, _ = load_file(os.path.join(schedules_dir, name))
+            with self.subTest(file=name):
+                self.assert_same_as_greedy(teacher_availability, students)
+
+    def test_matches_greedy_on_random_rosters(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.assert_same_as_greedy(*random_roster(seed, 400))
+
+    def test_empty_roster(self):
+        teacher_availability, _ = random_roster(0, 0)
+        schedule = create_engine(teacher_availability, [], name='vectorized').create_optimal_schedule()
+        self.assertEqual(schedule, {day: [] for day in DAYS})
+
+
+if __name__ == '__main__':
+    unittest.main()
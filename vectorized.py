@@ -0,0 +1,65 @@
+from engine import DAYS, MIN_CLASS_SIZE, MAX_CLASS_SIZE, ScheduleEngine
+from profiling import profiler
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only this engine needs it
+    np = None
+
+class VectorizedScheduleEngine(ScheduleEngine):
+    def __init__(self, teacher_availability, students, days=DAYS, teachers=None):
+        if np is None:
+            raise RuntimeError("The vectorized engine requires numpy")
+        if teachers:
+            raise ValueError("The vectorized engine schedules a single teacher")
+        super().__init__(teacher_availability, students, days)
+
+    def build_matrices(self, students_by_level, slots):
+        levels = list(students_by_level)
+        students = [s for level in levels for s in students_by_level[level]]
+        level_ids = np.array([i for i, level in enumerate(levels) for _ in students_by_level[level]], dtype=np.intp)
+
+        # students x slots: can the student attend the whole class window of that slot
+        day_index = {day: i for i, day in enumerate(self.days)}
+        masks = np.array([[s.availability.mask(day) for day in self.days] for s in students], dtype=np.int64).reshape(len(students), len(self.days))
+        slot_days = np.array([day_index[day] for day, _, _ in slots], dtype=np.intp)
+        windows = np.array([window for _, _, window in slots], dtype=np.int64)
+        eligible = (masks[:, slot_days] & windows) == windows
+
+        one_hot = np.zeros((len(students), len(levels)), dtype=np.int32)
+        one_hot[np.arange(len(students)), level_ids] = 1
+        capacity = np.array([s.max_sessions for s in students], dtype=np.int32)
+        return levels, students, level_ids, eligible, one_hot, capacity
+
+    def create_optimal_schedule(self):
+        schedule = {day: [] for day in self.days}
+        with profiler.span('engine.group_students'):
+            students_by_level = self.group_students_by_level()
+        slots = self.get_class_slots()
+        if not slots or not self.students:
+            return schedule
+
+        with profiler.span('engine.matrices'):
+            levels, students, level_ids, eligible, one_hot, capacity = self.build_matrices(students_by_level, slots)
+        # levels x slots eligible-student counts, kept in sync as students use up their sessions
+        counts = one_hot.T @ eligible.astype(np.int32)
+        level_rows = [np.flatnonzero(level_ids == k) for k in range(len(levels))]
+
+        profiler.count('slots evaluated', len(slots))
+        for col, (day, start_time, _) in enumerate(slots):
+            self.checkpoint(col, len(slots))
+            candidates = np.flatnonzero(counts[:, col] >= MIN_CLASS_SIZE)
+            if not len(candidates):
+                continue
+            level = candidates[0]
+            rows = level_rows[level]
+            placed = rows[eligible[rows, col]][:MAX_CLASS_SIZE]
+            self.add_class_to_schedule(schedule, day, start_time, levels[level], [students[i] for i in placed])
+
+            capacity[placed] -= 1
+            exhausted = placed[capacity[placed] == 0]
+            if len(exhausted):
+                counts[level] -= eligible[exhausted].sum(axis=0, dtype=np.int32)
+                eligible[exhausted] = False
+
+        return schedule
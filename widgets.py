@@ -0,0 +1,188 @@
+import os
+from functools import lru_cache
+from PyQt6.QtCore import QEvent, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QPainter, QPen
+from PyQt6.QtWidgets import QToolTip, QWidget
+from availability import SLOT_INDEX
+
+CELL_SIZE = 25
+CELL_SPACING = 1
+TIME_LABEL_WIDTH = 44
+HEADER_HEIGHT = 24
+
+EMPTY_COLOR = QColor("#ECF0F1")
+CHECKED_COLOR = QColor("#2ECC71")
+HOVER_COLOR = QColor("#3498DB")
+BORDER_COLOR = QColor("#BDC3C7")
+TEXT_COLOR = QColor("#2C3E50")
+
+# Icons ship next to the code, so they are found whatever directory the app is started from
+ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
+
+@lru_cache(maxsize=None)
+def load_icon(name):
+    # Each icon file is read once, however many buttons and tabs show it
+    return QIcon(os.path.join(ICON_DIR, name))
+
+class AvailabilityGrid(QWidget):
+    # Day columns by time slot rows, painted in one pass straight from an Availability's day
+    # masks. Pressing and dragging selects a rectangle of cells; on release they are all set to
+    # the opposite of the cell the drag started on, and availability_changed lists the days edited.
+    availability_changed = pyqtSignal(list)
+
+    def __init__(self, days, times, availability=None, parent=None):
+        super().__init__(parent)
+        self.days = list(days)
+        self.times = list(times)
+        # Row r is bit first_slot + r of a day mask
+        self.first_slot = SLOT_INDEX[self.times[0]]
+        self.availability = availability
+        self.column_width = max(CELL_SIZE, max(self.fontMetrics().horizontalAdvance(day) for day in self.days) + 6)
+        self.hover = None
+        # Cell the current drag started on and the cell under the pointer; None when not dragging
+        self.anchor = None
+        self.cursor_cell = None
+        self.drag_state = None
+        self.setMouseTracking(True)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setFixedSize(self.sizeHint())
+
+    def sizeHint(self):
+        return QSize(TIME_LABEL_WIDTH + len(self.days) * (self.column_width + CELL_SPACING),
+                     HEADER_HEIGHT + len(self.times) * (CELL_SIZE + CELL_SPACING))
+
+    def set_availability(self, availability):
+        self.availability = availability
+        self.update()
+
+    def cell_at(self, pos):
+        x, y = pos.x() - TIME_LABEL_WIDTH, pos.y() - HEADER_HEIGHT
+        if x < 0 or y < 0:
+            return None
+        col, row = int(x) // (self.column_width + CELL_SPACING), int(y) // (CELL_SIZE + CELL_SPACING)
+        if col >= len(self.days) or row >= len(self.times):
+            return None
+        return col, row
+
+    def cell_rect(self, col, row):
+        return QRect(TIME_LABEL_WIDTH + col * (self.column_width + CELL_SPACING),
+                     HEADER_HEIGHT + row * (CELL_SIZE + CELL_SPACING), self.column_width, CELL_SIZE)
+
+    def is_checked(self, col, row):
+        if self.availability is None:
+            return False
+        return bool(self.availability.mask(self.days[col]) >> (self.first_slot + row) & 1)
+
+    def selection(self):
+        # (first col, last col, first row, last row) of the rubber band, or None
+        if self.anchor is None:
+            return None
+        (col0, row0), (col1, row1) = self.anchor, self.cursor_cell
+        return min(col0, col1), max(col0, col1), min(row0, row1), max(row0, row1)
+
+    def set_cells(self, col0, col1, row0, row1, checked):
+        bits = ((1 << (row1 - row0 + 1)) - 1) << (self.first_slot + row0)
+        changed = []
+        for day in self.days[col0:col1 + 1]:
+            mask = self.availability.mask(day)
+            new_mask = mask | bits if checked else mask & ~bits
+            if new_mask != mask:
+                self.availability.set_mask(day, new_mask)
+                changed.append(day)
+        self.update()
+        if changed:
+            self.availability_changed.emit(changed)
+        return changed
+
+    def toggle(self, day, time):
+        col, row = self.days.index(day), self.times.index(time)
+        checked = not self.is_checked(col, row)
+        self.set_cells(col, col, row, row, checked)
+        return checked
+
+    def mousePressEvent(self, event):
+        cell = self.cell_at(event.position())
+        if event.button() != Qt.MouseButton.LeftButton or cell is None or self.availability is None:
+            super().mousePressEvent(event)
+            return
+        self.anchor = self.cursor_cell = cell
+        self.drag_state = not self.is_checked(*cell)
+        self.update()
+
+    def mouseMoveEvent(self, event):
+        cell = self.cell_at(event.position())
+        if self.anchor is not None:
+            if cell is not None and cell != self.cursor_cell:
+                self.cursor_cell = cell
+                self.update()
+        elif cell != self.hover:
+            for old in (self.hover, cell):
+                if old is not None:
+                    self.update(self.cell_rect(*old))
+            self.hover = cell
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton or self.anchor is None:
+            super().mouseReleaseEvent(event)
+            return
+        selection = self.selection()
+        self.anchor = self.cursor_cell = None
+        self.set_cells(*selection, self.drag_state)
+
+    def leaveEvent(self, event):
+        if self.hover is not None:
+            self.update(self.cell_rect(*self.hover))
+            self.hover = None
+        super().leaveEvent(event)
+
+    def event(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            cell = self.cell_at(event.pos())
+            if cell is None:
+                QToolTip.hideText()
+            else:
+                col, row = cell
+                QToolTip.showText(event.globalPos(),
+                                  f"Click or drag to toggle availability for {self.days[col]} at {self.times[row]}", self)
+            return True
+        return super().event(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(TEXT_COLOR)
+        for col, day in enumerate(self.days):
+            rect = self.cell_rect(col, 0)
+            painter.drawText(QRect(rect.left(), 0, rect.width(), HEADER_HEIGHT), Qt.AlignmentFlag.AlignCenter, day)
+        for row, time in enumerate(self.times):
+            painter.drawText(QRect(0, self.cell_rect(0, row).top(), TIME_LABEL_WIDTH - 4, CELL_SIZE),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, time)
+
+        # Only the cells inside the damaged area, found by arithmetic rather than hit-testing
+        area = event.rect()
+        pitch_x, pitch_y = self.column_width + CELL_SPACING, CELL_SIZE + CELL_SPACING
+        col0 = max(0, (area.left() - TIME_LABEL_WIDTH) // pitch_x)
+        col1 = min(len(self.days) - 1, (area.right() - TIME_LABEL_WIDTH) // pitch_x)
+        row0 = max(0, (area.top() - HEADER_HEIGHT) // pitch_y)
+        row1 = min(len(self.times) - 1, (area.bottom() - HEADER_HEIGHT) // pitch_y)
+        selection = self.selection()
+        painter.setPen(BORDER_COLOR)
+        for col in range(col0, col1 + 1):
+            mask = self.availability.mask(self.days[col]) >> self.first_slot if self.availability is not None else 0
+            for row in range(row0, row1 + 1):
+                if selection and selection[0] <= col <= selection[1] and selection[2] <= row <= selection[3]:
+                    checked = self.drag_state
+                else:
+                    checked = mask >> row & 1
+                if selection is None and (col, row) == self.hover:
+                    color = HOVER_COLOR
+                else:
+                    color = CHECKED_COLOR if checked else EMPTY_COLOR
+                rect = self.cell_rect(col, row)
+                painter.fillRect(rect, color)
+                painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        if selection:
+            col0, col1, row0, row1 = selection
+            painter.setPen(QPen(HOVER_COLOR, 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(self.cell_rect(col0, row0).united(self.cell_rect(col1, row1)).adjusted(1, 1, -1, -1))
@@ -0,0 +1,41 @@
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+from engine import ScheduleCancelled
+from profiling import profiler
+
+class ScheduleWorker(QThread):
+    # Runs one engine's create_optimal_schedule off the GUI thread. The engine must only see data
+    # the GUI will not touch meanwhile; signals are delivered on the GUI thread.
+    progress = pyqtSignal(int, int)
+    generated = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, engine, parent=None, cache=None, key=None, engine_name=None):
+        super().__init__(parent)
+        self.engine = engine
+        # Finished schedules are stored under key before they are handed to the GUI thread
+        self.cache = cache
+        self.key = key
+        self.engine_name = engine_name
+        self.cancel_event = threading.Event()
+        engine.cancel_event = self.cancel_event
+        engine.progress = self.progress.emit
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            with profiler.profile_thread(), profiler.span('engine'):
+                schedule = self.engine.create_optimal_schedule()
+        except ScheduleCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            # Whatever the engine raises, the GUI hears about it and leaves its busy state
+            self.failed.emit(str(e))
+        else:
+            if self.cache is not None:
+                from storage import schedule_to_data
+                self.cache.put(self.key, schedule_to_data(schedule), self.engine_name)
+            self.generated.emit(schedule)